@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+
+"""
+Micro-benchmark for :func:`config_patterns.patterns.merge_key_value.api.merge_key_value`
+on deep and wide synthetic trees.
+
+Usage::
+
+    python benchmark/bench_merge_key_value.py
+"""
+
+import timeit
+
+from config_patterns.patterns.merge_key_value.api import merge_key_value
+
+
+def make_deep_data(depth: int, key: str) -> dict:
+    """
+    Make a ``{"node": {"node": ... {key: value}}}`` like tree.
+    """
+    data = {key: f"{key}-value"}
+    for _ in range(depth):
+        data = {"node": data, f"{key}-{len(data)}": "value"}
+    return data
+
+
+def make_wide_data(width: int, key: str) -> dict:
+    """
+    Make a two level tree, each level has ``width`` keys, plus a list of dict
+    that has to be merged item by item.
+    """
+    data = dict()
+    for i in range(width):
+        node = {f"{key}{j}": "value" for j in range(width)}
+        node["databases"] = [{key: "value"} for _ in range(width)]
+        data[f"env{i}"] = node
+    return data
+
+
+def run(name: str, data1: dict, data2: dict, number: int):
+    elapsed = timeit.timeit(lambda: merge_key_value(data1, data2), number=number)
+    print(f"{name:<32} {elapsed / number * 1000:10.3f} ms per merge")
+
+
+if __name__ == "__main__":
+    run(
+        "deep tree, depth = 500",
+        make_deep_data(500, "username"),
+        make_deep_data(500, "password"),
+        number=200,
+    )
+    run(
+        "deep tree, depth = 5000",
+        make_deep_data(5000, "username"),
+        make_deep_data(5000, "password"),
+        number=20,
+    )
+    run(
+        "wide tree, width = 100",
+        make_wide_data(100, "username"),
+        make_wide_data(100, "password"),
+        number=20,
+    )
+    run(
+        "wide tree, width = 300",
+        make_wide_data(300, "username"),
+        make_wide_data(300, "password"),
+        number=5,
+    )
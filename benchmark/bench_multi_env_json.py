@@ -0,0 +1,402 @@
+# -*- coding: utf-8 -*-
+
+"""
+Micro-benchmark for :class:`config_patterns.patterns.multi_env_json.api.BaseConfig`
+on synthetic configs with many environments.
+
+Usage::
+
+    python benchmark/bench_multi_env_json.py
+"""
+
+import typing as T
+import copy
+import timeit
+import tracemalloc
+import dataclasses
+
+import moto
+from boto_session_manager import BotoSesManager
+from s3pathlib import context
+
+from config_patterns.frozen import freeze
+from config_patterns.patterns.multi_env_json.api import (
+    BaseEnvEnum,
+    BaseEnv,
+    BaseSlotsEnv,
+    BaseConfig,
+)
+from config_patterns.dataclass_utils import add_slots
+
+
+@dataclasses.dataclass
+class Env(BaseEnv):
+    username: T.Optional[str] = dataclasses.field(default=None)
+    password: T.Optional[str] = dataclasses.field(default=None)
+    tags: T.Dict[str, str] = dataclasses.field(default_factory=dict)
+    servers: T.Dict[str, dict] = dataclasses.field(default_factory=dict)
+    databases: T.List[dict] = dataclasses.field(default_factory=list)
+
+    @classmethod
+    def from_dict(cls, data: dict):
+        return cls(**data)
+
+
+@dataclasses.dataclass
+class EagerConfig(BaseConfig[Env]):
+    pass
+
+
+@dataclasses.dataclass
+class LazyConfig(BaseConfig[Env]):
+    lazy_merge = True
+
+
+@dataclasses.dataclass
+class LeanConfig(BaseConfig[Env]):
+    lean_memory = True
+
+
+def make_env_name(ith: int) -> str:
+    return f"env{ith}"
+
+
+def make_env_enum(n_env: int) -> T.Type[BaseEnvEnum]:
+    return BaseEnvEnum(
+        "EnvEnum",
+        {make_env_name(ith): make_env_name(ith) for ith in range(n_env)},
+    )
+
+
+def make_data(n_env: int) -> T.Tuple[dict, dict]:
+    """
+    Make the ``data`` and ``secret_data`` that has ``n_env`` environments.
+    """
+    data = {
+        "_shared": {
+            "*.project_name": "my_project",
+            "*.tags.project_name": "my_project",
+            "*.servers.*.cpu": 2,
+            "*.servers.*.memory": 4,
+        },
+    }
+    secret_data = {"_shared": {}}
+    for ith in range(n_env):
+        env_name = make_env_name(ith)
+        data["_shared"][f"{env_name}.tags.env_name"] = env_name
+        data[env_name] = {
+            "username": f"{env_name}.user",
+            "tags": {"owner": "alice"},
+            "servers": {
+                f"server{i}": {"ip": f"10.0.0.{i}", "domain": f"www.server{i}.com"}
+                for i in range(10)
+            },
+            "databases": [{"host": f"db{i}.com", "port": 5432} for i in range(5)],
+        }
+        secret_data[env_name] = {
+            "password": f"{env_name}.password",
+            "databases": [{"password": f"db{i}.pwd"} for i in range(5)],
+        }
+    return data, secret_data
+
+
+def new_config(
+    config_class: T.Type[BaseConfig],
+    data: dict,
+    secret_data: dict,
+    env_enum: T.Type[BaseEnvEnum],
+):
+    return config_class(
+        data=data,
+        secret_data=secret_data,
+        Env=Env,
+        EnvEnum=env_enum,
+        version="local",
+    )
+
+
+def run(name: str, func: T.Callable, number: int):
+    elapsed = timeit.timeit(func, number=number)
+    print(f"{name:<48} {elapsed / number * 1000:10.3f} ms")
+
+
+def bench_lazy_merge(n_env: int):
+    data, secret_data = make_data(n_env)
+    env_enum = make_env_enum(n_env)
+    number = 10
+    run(
+        f"eager init + get one env, {n_env} envs",
+        lambda: new_config(EagerConfig, data, secret_data, env_enum).get_env("env0"),
+        number=number,
+    )
+    run(
+        f"lazy init + get one env, {n_env} envs",
+        lambda: new_config(LazyConfig, data, secret_data, env_enum).get_env("env0"),
+        number=number,
+    )
+
+
+def bench_get_all_envs(n_env: int):
+    data, secret_data = make_data(n_env)
+    config = new_config(EagerConfig, data, secret_data, make_env_enum(n_env))
+    number = 10
+    run(
+        f"get_env in a loop, {n_env} envs",
+        lambda: [
+            config.get_env(env_name, private=True) for env_name in config.EnvEnum
+        ],
+        number=number,
+    )
+    run(
+        f"get_all_envs, {n_env} envs",
+        lambda: config.get_all_envs(private=True),
+        number=number,
+    )
+
+
+def prepare_deploy_per_env_scan(config: BaseConfig) -> T.List[dict]:
+    """
+    The previous implementation of the per env part of ``prepare_deploy``,
+    it scans the whole ``_shared`` section and builds an env object for every env.
+    """
+    parameter_data_list = list()
+    for env_name in config.EnvEnum:
+        env_name = config.EnvEnum.ensure_str(env_name)
+        env = config.get_env(env_name, private=True)
+        _ = env.parameter_name
+        parameter_data = {
+            "data": {
+                "_shared": {
+                    k: v
+                    for k, v in config.data.get("_shared", {}).items()
+                    if k.startswith("*") or k.startswith(f"{env.env_name}.")
+                },
+                env.env_name: config.data[env.env_name],
+            },
+            "secret_data": {
+                "_shared": {
+                    k: v
+                    for k, v in config.secret_data.get("_shared", {}).items()
+                    if k.startswith("*") or k.startswith(f"{env.env_name}.")
+                },
+                env.env_name: config.secret_data[env.env_name],
+            },
+        }
+        parameter_data_list.append(parameter_data)
+    return parameter_data_list
+
+
+def bench_prepare_deploy(n_env: int, n_shared_key: int):
+    data, secret_data = make_data(n_env)
+    # add n_shared_key shared keys evenly distributed to all envs
+    for ith in range(n_shared_key - n_env):
+        data["_shared"][f"{make_env_name(ith % n_env)}.tags.key{ith}"] = "value"
+    config = new_config(EagerConfig, data, secret_data, make_env_enum(n_env))
+    run(
+        f"scan _shared per env, {n_env} envs, {n_shared_key} keys",
+        lambda: prepare_deploy_per_env_scan(config),
+        number=1,
+    )
+    run(
+        f"prepare_deploy, {n_env} envs, {n_shared_key} keys",
+        lambda: config.prepare_deploy(),
+        number=1,
+    )
+
+    with moto.mock_s3(), moto.mock_sts():
+        bsm = BotoSesManager(region_name="us-east-1")
+        bsm.s3_client.create_bucket(Bucket="my-bucket")
+        context.attach_boto_session(bsm.boto_ses)
+        # the deployed objects are kept by moto in both cases
+        size = measure_peak_memory(
+            lambda: list(
+                config.iter_deploy(
+                    bsm=bsm,
+                    s3folder_config="s3://my-bucket/keep-parameter-data/",
+                    verbose=False,
+                )
+            )
+        )
+        print(f"peak memory of deploy, keep parameter_data: {size / 1000:10.1f} KB")
+        size = measure_peak_memory(
+            lambda: config.deploy(
+                bsm=bsm,
+                s3folder_config="s3://my-bucket/deploy/",
+                verbose=False,
+            )
+        )
+        print(f"peak memory of deploy():                    {size / 1000:10.1f} KB")
+
+
+def measure_memory(func: T.Callable) -> int:
+    """
+    Return the size of memory in bytes that is still allocated after
+    calling the function, while the return value is alive.
+    """
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    value = func()
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del value
+    return after - before
+
+
+def measure_peak_memory(func: T.Callable) -> int:
+    """
+    Return the peak size of memory in bytes allocated while calling the
+    function, including the return value.
+    """
+    tracemalloc.start()
+    value = func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del value
+    return peak
+
+
+def bench_frozen(n_consumer: int):
+    data, secret_data = make_data(1)
+    env_data = new_config(EagerConfig, data, secret_data, make_env_enum(1))._merged[
+        "env0"
+    ]
+    frozen_env_data = freeze(env_data)
+    frozen_env_data.thaw()  # warm up the thaw cache
+    number = 1000
+    run(
+        "hand out env data, copy.deepcopy",
+        lambda: copy.deepcopy(env_data),
+        number=number,
+    )
+    run(
+        "hand out env data, frozen (shared)",
+        lambda: frozen_env_data,
+        number=number,
+    )
+    run(
+        "hand out env data, frozen thaw()",
+        lambda: frozen_env_data.thaw(),
+        number=number,
+    )
+    size = measure_memory(lambda: [copy.deepcopy(env_data) for _ in range(n_consumer)])
+    print(f"memory of {n_consumer} consumers, copy.deepcopy: {size / 1000:10.1f} KB")
+    size = measure_memory(lambda: [frozen_env_data for _ in range(n_consumer)])
+    print(f"memory of {n_consumer} consumers, frozen:        {size / 1000:10.1f} KB")
+
+
+@dataclasses.dataclass
+class Database:
+    host: T.Optional[str] = dataclasses.field(default=None)
+    port: T.Optional[int] = dataclasses.field(default=None)
+    password: T.Optional[str] = dataclasses.field(default=None)
+
+
+@dataclasses.dataclass
+class HandWrittenEnv(BaseEnv):
+    username: T.Optional[str] = dataclasses.field(default=None)
+    password: T.Optional[str] = dataclasses.field(default=None)
+    tags: T.Dict[str, str] = dataclasses.field(default_factory=dict)
+    servers: T.Dict[str, dict] = dataclasses.field(default_factory=dict)
+    databases: T.List[Database] = dataclasses.field(default_factory=list)
+
+    @classmethod
+    def from_dict(cls, data: dict):
+        data = dict(data)
+        field_names = {field.name for field in dataclasses.fields(cls)}
+        for key in data:
+            if key not in field_names:
+                raise TypeError(f"unexpected keyword argument {key!r}")
+        data["databases"] = [Database(**dct) for dct in data.get("databases", [])]
+        return cls(**data)
+
+
+@dataclasses.dataclass
+class CompiledEnv(BaseEnv):
+    username: T.Optional[str] = dataclasses.field(default=None)
+    password: T.Optional[str] = dataclasses.field(default=None)
+    tags: T.Dict[str, str] = dataclasses.field(default_factory=dict)
+    servers: T.Dict[str, dict] = dataclasses.field(default_factory=dict)
+    databases: T.List[Database] = dataclasses.field(default_factory=list)
+
+
+@add_slots
+@dataclasses.dataclass
+class SlotsEnv(BaseSlotsEnv):
+    username: T.Optional[str] = dataclasses.field(default=None)
+    password: T.Optional[str] = dataclasses.field(default=None)
+    tags: T.Dict[str, str] = dataclasses.field(default_factory=dict)
+    servers: T.Dict[str, dict] = dataclasses.field(default_factory=dict)
+    databases: T.List[Database] = dataclasses.field(default_factory=list)
+
+
+def bench_from_dict(n_env: int):
+    data, secret_data = make_data(1)
+    env_data = new_config(EagerConfig, data, secret_data, make_env_enum(1))._merged[
+        "env0"
+    ]
+    number = 10
+    for env_class in [HandWrittenEnv, CompiledEnv, SlotsEnv]:
+        run(
+            f"{env_class.__name__}.from_dict x {n_env}",
+            lambda: [env_class.from_dict(env_data) for _ in range(n_env)],
+            number=number,
+        )
+        size = measure_memory(
+            lambda: [env_class.from_dict(env_data) for _ in range(n_env)]
+        )
+        print(f"memory of {n_env} {env_class.__name__}: {size / 1000:10.1f} KB")
+
+
+def bench_get_value(n_env: int):
+    data, secret_data = make_data(n_env)
+    config = new_config(EagerConfig, data, secret_data, make_env_enum(n_env))
+    config.get_value("env0", "username")  # warm up the key path index
+    number = 1000
+    run(
+        "get_env(private=True).databases[0]",
+        lambda: config.get_env("env0", private=True).databases[0]["host"],
+        number=number,
+    )
+    run(
+        "get_value('databases.0.host')",
+        lambda: config.get_value("env0", "databases.0.host"),
+        number=number,
+    )
+
+
+def bench_dedup(n_env: int):
+    data, secret_data = make_data(n_env)
+    config = new_config(EagerConfig, data, secret_data, make_env_enum(n_env))
+    run(f"dedup, {n_env} envs", lambda: config.dedup(), number=1)
+    stats = new_config(EagerConfig, data, secret_data, make_env_enum(n_env)).dedup()
+    print(
+        f"dedup, {n_env} envs: {stats.bytes_before / 1000:.1f} KB -> "
+        f"{stats.bytes_after / 1000:.1f} KB, saved {stats.bytes_saved / 1000:.1f} KB"
+    )
+
+
+def bench_lean_memory(n_env: int):
+    env_enum = make_env_enum(n_env)
+    for config_class in [EagerConfig, LeanConfig]:
+        # the input data is only held by the config object
+        size = measure_memory(
+            lambda: new_config(config_class, *make_data(n_env), env_enum)
+        )
+        print(
+            f"memory of config, {config_class.__name__}, {n_env} envs: "
+            f"{size / 1000:10.1f} KB"
+        )
+
+
+if __name__ == "__main__":
+    bench_lazy_merge(n_env=10)
+    bench_lazy_merge(n_env=100)
+    bench_lazy_merge(n_env=500)
+    bench_frozen(n_consumer=1000)
+    bench_get_all_envs(n_env=100)
+    bench_get_all_envs(n_env=500)
+    bench_prepare_deploy(n_env=500, n_shared_key=5000)
+    bench_from_dict(n_env=10000)
+    bench_get_value(n_env=10)
+    bench_dedup(n_env=500)
+    bench_lean_memory(n_env=500)
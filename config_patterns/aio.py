@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+
+"""
+Asyncio utilities.
+
+The AWS SDK (boto3), pysecret and s3pathlib are synchronous, so the async API
+of this library runs the blocking call in a thread pool executor, the event
+loop is never blocked.
+"""
+
+import typing as T
+import asyncio
+import functools
+import threading
+from concurrent.futures import Executor
+
+_client_lock = threading.Lock()
+
+
+def get_client(bsm: "boto_session_manager.BotoSesManager", service_name: str):
+    """
+    Get the boto3 client from the boto session manager. The client is created
+    and cached by the first caller, creating clients from the same boto3
+    session in multiple threads at the same time is not thread-safe.
+    """
+    with _client_lock:
+        return bsm.get_client(service_name)
+
+
+async def run_in_executor(
+    func: T.Callable,
+    *args,
+    executor: T.Optional[Executor] = None,
+    **kwargs,
+) -> T.Any:
+    """
+    Run the blocking function in the executor, and wait for the result.
+
+    :param executor: the ``concurrent.futures.Executor`` to run the function,
+        if None, use the default executor of the event loop.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        executor,
+        functools.partial(func, *args, **kwargs),
+    )
+
+
+async def gather_with_concurrency(
+    aws: T.Iterable[T.Awaitable],
+    max_concurrency: int,
+) -> list:
+    """
+    Similar to ``asyncio.gather``, but at most ``max_concurrency`` awaitables
+    are running at the same time. The results are in the same order as ``aws``.
+    """
+    if max_concurrency < 1:
+        raise ValueError("max_concurrency must be at least 1!")
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def run(aw: T.Awaitable):
+        async with semaphore:
+            return await aw
+
+    return await asyncio.gather(*[run(aw) for aw in aws])
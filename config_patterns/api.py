@@ -10,11 +10,21 @@ Usage example::
     config_pattern.hierarchy.apply_shared_value
     config_pattern.merge_key_value.merge_key_value
     config_pattern.multi_env_json.ALL
+    config_pattern.multi_env_json.apply_merge_memo
+    config_pattern.multi_env_json.remote_read_cache
+    config_pattern.multi_env_json.pinned_read_cache
+    config_pattern.multi_env_json.replica_latency
     config_pattern.multi_env_json.BaseEnvEnum
+    config_pattern.multi_env_json.EnvRegistry
+    config_pattern.multi_env_json.BaseEnvMixin
     config_pattern.multi_env_json.BaseEnv
+    config_pattern.multi_env_json.BaseSlotsEnv
     config_pattern.multi_env_json.BaseConfig
     config_pattern.multi_env_json.normalize_parameter_name
     config_pattern.multi_env_json.ConfigDeployment
+    config_pattern.multi_env_json.ConfigSnapshot
+    config_pattern.multi_env_json.ConfigHandle
+    config_pattern.multi_env_json.DiskConfigCache
 """
 
 from .patterns.hierarchy import api as hierarchy
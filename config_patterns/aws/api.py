@@ -9,6 +9,8 @@ try: # pragma: no cover
         S3Object,
         S3Parameter,
         read_config,
+        aread_config,
+        read_config_version,
         deploy_config,
         delete_config,
     )
@@ -14,7 +14,9 @@ Variable naming convention:
 
 import typing as T
 import json
+import marshal
 import dataclasses
+from concurrent.futures import Executor
 
 from botocore.exceptions import ClientError
 from boto_session_manager import BotoSesManager
@@ -24,6 +26,8 @@ from s3pathlib import S3Path
 from .. import exc
 from ..logger import logger
 from ..jsonutils import json_loads
+from ..cache import LRUCache, TTLCache
+from ..aio import get_client, run_in_executor
 from ..utils import sha256_of_config_data
 from ..vendor.better_enum import BetterStrEnum
 
@@ -33,6 +37,79 @@ KEY_CONFIG_VERSION = "config_version"
 KEY_CONFIG_SHA256 = "config_sha256"
 
 
+@dataclasses.dataclass
+class LatestConfig:
+    """
+    The latest config file of a :class:`S3Parameter`, everything comes from
+    one ``GetObject`` response.
+
+    :param config_data: the parsed config data.
+    :param config_version: the config version, see :meth:`S3Parameter.read_latest`.
+    :param config_sha256: the sha256 of the config data in the object metadata.
+    :param etag: the ETag of the S3 object.
+    """
+
+    config_data: dict = dataclasses.field()
+    config_version: str = dataclasses.field()
+    config_sha256: T.Optional[str] = dataclasses.field()
+    etag: str = dataclasses.field()
+
+
+@dataclasses.dataclass
+class _LatestReadCacheEntry:
+    """
+    The last read result of a ``s3path_latest``.
+
+    :param etag: the ETag of the S3 object.
+    :param config_version: the config version of the S3 object.
+    :param config_sha256: the sha256 of the config data in the object metadata.
+    :param packed_config_data: the marshal bytes of the parsed config data,
+        each cache hit gets a new copy of it.
+    """
+
+    etag: str = dataclasses.field()
+    config_version: str = dataclasses.field()
+    config_sha256: T.Optional[str] = dataclasses.field()
+    packed_config_data: bytes = dataclasses.field()
+
+    def to_latest_config(self) -> LatestConfig:
+        return LatestConfig(
+            config_data=marshal.loads(self.packed_config_data),
+            config_version=self.config_version,
+            config_sha256=self.config_sha256,
+            etag=self.etag,
+        )
+
+
+def _put_latest_read_cache(
+    uri: str,
+    etag: str,
+    config_version: str,
+    config_sha256: T.Optional[str],
+    config_data: dict,
+):
+    try:
+        packed_config_data = marshal.dumps(config_data)
+    except ValueError:  # pragma: no cover
+        return
+    latest_read_cache.put(
+        uri,
+        _LatestReadCacheEntry(
+            etag=etag,
+            config_version=config_version,
+            config_sha256=config_sha256,
+            packed_config_data=packed_config_data,
+        ),
+    )
+
+
+#: Process-wide cache of the last :meth:`S3Parameter.read_latest` result,
+#: keyed by the S3 URI of ``s3path_latest``. It is used to revalidate the
+#: object with a conditional GET, the body is only transferred and parsed when
+#: the object has changed.
+latest_read_cache = LRUCache(maxsize=128)
+
+
 # ------------------------------------------------------------------------------
 # S3 bucket version status
 # ------------------------------------------------------------------------------
@@ -76,6 +153,51 @@ def get_bucket_version_status(
     return S3BucketVersionStatus.get_by_value(status)
 
 
+#: The default time-to-live in seconds of the cached bucket version status,
+#: see :func:`get_cached_bucket_version_status`.
+BUCKET_VERSION_STATUS_TTL = 300
+
+#: Process-wide cache of the bucket version status, keyed by the bucket name.
+bucket_version_status_cache = TTLCache()
+
+
+def get_cached_bucket_version_status(
+    bsm: BotoSesManager,
+    bucket: str,
+    ttl: T.Optional[float] = None,
+) -> S3BucketVersionStatus:
+    """
+    The cached version of :func:`get_bucket_version_status`. The status of
+    one bucket is only requested once per ``ttl`` seconds in this process.
+    If you change the bucket versioning, call
+    :func:`invalidate_bucket_version_status`.
+
+    :param bsm: the ``boto_session_manager.BotoSesManager`` object.
+    :param bucket: the bucket name.
+    :param ttl: the time-to-live in seconds, if None, use
+        :data:`BUCKET_VERSION_STATUS_TTL`.
+    """
+    if ttl is None:
+        ttl = BUCKET_VERSION_STATUS_TTL
+    return bucket_version_status_cache.get(
+        bucket,
+        lambda: get_bucket_version_status(bsm=bsm, bucket=bucket),
+        ttl=ttl,
+    )
+
+
+def invalidate_bucket_version_status(bucket: T.Optional[str] = None):
+    """
+    Invalidate the cached bucket version status.
+
+    :param bucket: only invalidate this bucket, if None, invalidate all buckets.
+    """
+    if bucket is None:
+        bucket_version_status_cache.clear()
+    else:
+        bucket_version_status_cache.invalidate(bucket)
+
+
 def _ensure_bucket_versioning_is_not_suspended(
     bucket: str,
     status: S3BucketVersionStatus,
@@ -182,7 +304,7 @@ class S3Parameter:
         parameter_name: str,
     ) -> "S3Parameter":
         s3dir_config = S3Path(s3folder_config).to_dir()
-        s3_bucket_version_status = get_bucket_version_status(
+        s3_bucket_version_status = get_cached_bucket_version_status(
             bsm=bsm,
             bucket=s3dir_config.bucket,
         )
@@ -205,48 +327,149 @@ class S3Parameter:
             s3path_latest=s3path_latest,
         )
 
+    def get_latest(self, bsm: BotoSesManager) -> T.Optional[LatestConfig]:
+        """
+        Get the latest config file with one ``GetObject`` request, the body,
+        the config version and the sha256 all come from the same response.
+
+        The last result is kept in :data:`latest_read_cache`. If the S3 object
+        has been read (or deployed) before, it sends a conditional GET with
+        ``If-None-Match``, if the object is not modified, S3 returns a cheap
+        304 response without body and the cached result is returned.
+
+        :return: the :class:`LatestConfig`, or None if the object doesn't exist.
+        """
+        uri = self.s3path_latest.uri
+        entry: T.Optional[_LatestReadCacheEntry] = latest_read_cache.get(uri)
+        kwargs = dict(
+            Bucket=self.s3path_latest.bucket,
+            Key=self.s3path_latest.key,
+        )
+        if entry is not None:
+            kwargs["IfNoneMatch"] = entry.etag
+        try:
+            response = bsm.s3_client.get_object(**kwargs)
+        except ClientError as e:
+            code = e.response.get("Error", {}).get("Code")
+            if (entry is not None) and (code in ("304", "NotModified")):
+                return entry.to_latest_config()
+            if code == "NoSuchKey":
+                latest_read_cache.pop(uri)
+                return None
+            else:  # pragma: no cover
+                raise e
+        config_data = json_loads(response["Body"].read().decode("utf-8"))
+        metadata = response.get("Metadata", {})
+        if self.version_enabled:
+            config_version = response["VersionId"]
+        else:
+            config_version = metadata[KEY_CONFIG_VERSION]
+        config_sha256 = metadata.get(KEY_CONFIG_SHA256)
+        _put_latest_read_cache(
+            uri=uri,
+            etag=response["ETag"],
+            config_version=config_version,
+            config_sha256=config_sha256,
+            config_data=config_data,
+        )
+        return LatestConfig(
+            config_data=config_data,
+            config_version=config_version,
+            config_sha256=config_sha256,
+            etag=response["ETag"],
+        )
+
     def read_latest(self, bsm: BotoSesManager) -> T.Tuple[dict, str]:
         """
         Read the latest config data and config version from S3.
 
         For versioning disabled bucket, the version is 1, 2, 3, ...
         For versioning enabled bucket, the version is the version id of the S3 object.
+
+        It sends only one request, see :meth:`get_latest`.
+        """
+        latest_config = self.get_latest(bsm=bsm)
+        if latest_config is None:
+            raise exc.S3ObjectNotExist(
+                f"S3 object {self.s3path_latest.uri} not exist."
+            )
+        return latest_config.config_data, latest_config.config_version
+
+    def get_s3path_version(self, config_version: str) -> S3Path:
         """
+        Get the S3 path of the config file of the given version. For versioning
+        enabled bucket, it is the same as :attr:`s3path_latest`, the version is
+        the S3 object version id.
+        """
+        if self.version_enabled:
+            return self.s3path_latest
+        basename = f"{self.parameter_name}-{config_version.zfill(ZFILL)}.json"
+        return self.s3path_latest.change(new_basename=basename)
+
+    def read_version(self, bsm: BotoSesManager, config_version: str) -> dict:
+        """
+        Read the config data of the given version from S3. The version never
+        changes once it is written, so the result can be cached forever.
+
+        :param config_version: for versioning disabled bucket, it is 1, 2, 3, ...
+            For versioning enabled bucket, it is the version id of the S3 object.
+        """
+        s3path = self.get_s3path_version(config_version)
+        kwargs = dict(Bucket=s3path.bucket, Key=s3path.key)
+        if self.version_enabled:
+            kwargs["VersionId"] = config_version
         try:
-            config_data = json_loads(self.s3path_latest.read_text(bsm=bsm))
+            response = bsm.s3_client.get_object(**kwargs)
         except ClientError as e:
-            if "NoSuchKey" in str(e):
+            code = e.response.get("Error", {}).get("Code")
+            if code in ("NoSuchKey", "NoSuchVersion"):
                 raise exc.S3ObjectNotExist(
-                    f"S3 object {self.s3path_latest.uri} not exist."
+                    f"S3 object {s3path.uri} version {config_version!r} not exist."
                 )
             else:  # pragma: no cover
                 raise e
-        if self.version_enabled:
-            config_version = self.s3path_latest.version_id
+        return json_loads(response["Body"].read().decode("utf-8"))
+
+    def _get_max_historical_config_version(
+        self,
+        bsm: BotoSesManager,
+    ) -> T.Optional[int]:
+        """
+        Find the max config version from the historical config files
+        ``${parameter_name}-${version}.json`` when the latest one is deleted.
+        """
+        versions: T.List[int] = list()
+        for s3path in self.s3path_latest.parent.iter_objects(bsm=bsm):
+            try:
+                versions.append(int(s3path.fname.split("-")[-1]))
+            except:  # pragma: no cover
+                pass
+        if len(versions):
+            return max(versions)
         else:
-            config_version = self.s3path_latest.metadata[KEY_CONFIG_VERSION]
-        return config_data, config_version
+            return None
 
     def get_latest_config_version_when_version_not_enabled(
         self,
         bsm: BotoSesManager,
+        latest_config: T.Optional[LatestConfig] = NOTHING,
     ) -> T.Optional[int]:
         """
-        Todo: add docstring
+        Get the latest config version for versioning disabled bucket. It reads
+        the version from the latest config file, if it is deleted, find the
+        max version from the historical config files.
+
+        :param latest_config: the :meth:`get_latest` result, if you already
+            have it, pass it in to save a request.
+
+        :return: the latest config version, or None if never deployed.
         """
-        if self.s3path_latest.exists(bsm=bsm):
-            return int(self.s3path_latest.metadata[KEY_CONFIG_VERSION])
+        if latest_config is NOTHING:
+            latest_config = self.get_latest(bsm=bsm)
+        if latest_config is not None:
+            return int(latest_config.config_version)
         else:
-            versions: T.List[int] = list()
-            for s3path in self.s3path_latest.parent.iter_objects(bsm=bsm):
-                try:
-                    versions.append(int(s3path.fname.split("-")[-1]))
-                except:  # pragma: no cover
-                    pass
-            if len(versions):
-                return max(versions)
-            else:
-                return None
+            return self._get_max_historical_config_version(bsm=bsm)
 
     def get_latest_config_version_when_version_is_enabled(
         self,
@@ -290,7 +513,21 @@ class S3Parameter:
         )
         s3object = S3Object.from_put_object_response(s3path_res._meta)
 
-        s3path_versioned.copy_to(self.s3path_latest, overwrite=True, bsm=bsm)
+        response = bsm.s3_client.copy_object(
+            Bucket=self.s3path_latest.bucket,
+            Key=self.s3path_latest.key,
+            CopySource={
+                "Bucket": s3path_versioned.bucket,
+                "Key": s3path_versioned.key,
+            },
+        )
+        _put_latest_read_cache(
+            uri=self.s3path_latest.uri,
+            etag=response["CopyObjectResult"]["ETag"],
+            config_version=config_version,
+            config_sha256=config_sha256,
+            config_data=config_data,
+        )
         return s3object
 
     def deploy_latest_when_version_is_enabled(
@@ -314,6 +551,13 @@ class S3Parameter:
             bsm=bsm,
         )
         s3object = S3Object.from_put_object_response(s3path_res._meta)
+        _put_latest_read_cache(
+            uri=self.s3path_latest.uri,
+            etag=s3object.etag,
+            config_version=s3object.version_id,
+            config_sha256=config_sha256,
+            config_data=config_data,
+        )
         return s3object
 
 
@@ -340,6 +584,49 @@ def read_config(
     return s3parameter.read_latest(bsm=bsm)
 
 
+def read_config_version(
+    bsm: BotoSesManager,
+    s3folder_config: str,
+    parameter_name: str,
+    config_version: str,
+) -> dict:
+    """
+    Read config data of the given version from S3.
+
+    :return: config data
+    """
+    s3parameter = S3Parameter.new(
+        bsm=bsm,
+        s3folder_config=s3folder_config,
+        parameter_name=parameter_name,
+    )
+    return s3parameter.read_version(bsm=bsm, config_version=config_version)
+
+
+async def aread_config(
+    bsm: BotoSesManager,
+    s3folder_config: str,
+    parameter_name: str,
+    executor: T.Optional[Executor] = None,
+) -> T.Tuple[dict, str]:
+    """
+    The async version of :func:`read_config`, it doesn't block the event loop.
+
+    :param executor: the ``concurrent.futures.Executor`` to run the blocking
+        API calls, if None, use the default executor of the event loop.
+    """
+
+    def read() -> T.Tuple[dict, str]:
+        get_client(bsm, "s3")
+        return read_config(
+            bsm=bsm,
+            s3folder_config=s3folder_config,
+            parameter_name=parameter_name,
+        )
+
+    return await run_in_executor(read, executor=executor)
+
+
 @logger.start_and_end(
     msg="deploy config file to S3",
 )
@@ -371,16 +658,17 @@ def deploy_config(
     s3path_latest = s3parameter.s3path_latest
     _show_deploy_info(s3path=s3path_latest)
 
-    already_exists = s3path_latest.exists(bsm=bsm)
-    if already_exists:
-        existing_config_data, _ = s3parameter.read_latest(bsm=bsm)
-        if existing_config_data == config_data:
+    # one GetObject request for existence, content and version
+    latest_config = s3parameter.get_latest(bsm=bsm)
+    if latest_config is not None:
+        if latest_config.config_data == config_data:
             logger.info("config data is the same as existing one, do nothing.")
             return None
 
     if s3parameter.version_enabled is False:
         latest_version = s3parameter.get_latest_config_version_when_version_not_enabled(
             bsm=bsm,
+            latest_config=latest_config,
         )
         if latest_version is None:
             new_version = 1
@@ -466,5 +754,6 @@ def delete_config(
     else:
         _show_delete_info(s3path_latest)
         s3path_latest.delete(bsm=bsm, is_hard_delete=include_history)
+    latest_read_cache.pop(s3path_latest.uri)
     logger.info("done!")
     return True
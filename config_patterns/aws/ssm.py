@@ -5,16 +5,23 @@ AWS System Manager utility functions
 """
 
 import typing as T
+from concurrent.futures import Executor
 
 try:
     import boto3
     import boto_session_manager
+    from botocore.exceptions import ClientError
     import pysecret
     import aws_console_url.api as aws_console_url
 except ImportError:  # pragma: no cover
     pass
 
+from .. import exc
 from ..logger import logger
+from ..aio import get_client, run_in_executor
+
+#: The max number of names in one ``GetParameters`` API call.
+GET_PARAMETERS_BATCH_SIZE = 10
 
 
 @logger.start_and_end(
@@ -99,3 +106,135 @@ def delete_parameter(
 
     logger.info("done!")
     return delete_happened
+
+
+def read_parameter(
+    bsm: "boto_session_manager.BotoSesManager",
+    parameter_name: str,
+    parameter_with_encryption: bool,
+    version: T.Optional[T.Union[int, str]] = None,
+) -> T.Tuple[dict, str]:
+    """
+    Read config data and parameter version from AWS SSM parameter store.
+
+    :param version: if given, read this parameter version instead of the latest.
+
+    :return: config data and version
+    """
+    try:
+        parameter = pysecret.Parameter.load(
+            ssm_client=get_client(bsm, "ssm"),
+            name=parameter_name,
+            version=None if version is None else int(version),
+            with_decryption=parameter_with_encryption,
+        )
+    except ClientError as e:
+        if e.response.get("Error", {}).get("Code") == "ParameterVersionNotFound":
+            parameter = None
+        else:  # pragma: no cover
+            raise e
+    if parameter is None:
+        if version is None:
+            raise exc.ParameterNotExists(
+                f"SSM Parameter {parameter_name!r} not exist!"
+            )
+        raise exc.ParameterNotExists(
+            f"SSM Parameter {parameter_name!r} version {version!r} not exist!"
+        )
+    return parameter.json_dict, str(parameter.Version)
+
+
+async def aread_parameter(
+    bsm: "boto_session_manager.BotoSesManager",
+    parameter_name: str,
+    parameter_with_encryption: bool,
+    executor: T.Optional[Executor] = None,
+) -> T.Tuple[dict, str]:
+    """
+    The async version of :func:`read_parameter`, it doesn't block the event loop.
+
+    :param executor: the ``concurrent.futures.Executor`` to run the blocking
+        API call, if None, use the default executor of the event loop.
+    """
+    return await run_in_executor(
+        read_parameter,
+        bsm=bsm,
+        parameter_name=parameter_name,
+        parameter_with_encryption=parameter_with_encryption,
+        executor=executor,
+    )
+
+
+def _to_parameter(parameter: dict) -> "pysecret.Parameter":
+    return pysecret.Parameter(
+        Name=parameter["Name"],
+        Type=parameter["Type"],
+        Value=parameter["Value"],
+        Version=parameter["Version"],
+        LastModifiedDate=parameter.get("LastModifiedDate"),
+        DataType=parameter.get("DataType"),
+        ARN=parameter.get("ARN"),
+        Selector=parameter.get("Selector"),
+        SourceResult=parameter.get("SourceResult"),
+    )
+
+
+def read_parameters(
+    bsm: "boto_session_manager.BotoSesManager",
+    parameter_names: T.Iterable[str],
+    parameter_with_encryption: bool,
+) -> T.Dict[str, T.Tuple[dict, str]]:
+    """
+    Read config data and parameter version of many parameters from AWS SSM
+    parameter store, with one ``GetParameters`` API call per 10 names.
+
+    Ref:
+
+    - get_parameters: https://boto3.amazonaws.com/v1/documentation/api/latest/reference/services/ssm.html#SSM.Client.get_parameters
+
+    :return: a dict mapping parameter name to config data and version,
+        the parameters that don't exist are not included.
+    """
+    ssm_client = get_client(bsm, "ssm")
+    names = list(dict.fromkeys(parameter_names))
+    results = dict()
+    for i in range(0, len(names), GET_PARAMETERS_BATCH_SIZE):
+        response = ssm_client.get_parameters(
+            Names=names[i : i + GET_PARAMETERS_BATCH_SIZE],
+            WithDecryption=parameter_with_encryption,
+        )
+        for dct in response.get("Parameters", []):
+            parameter = _to_parameter(dct)
+            results[parameter.Name] = (parameter.json_dict, str(parameter.Version))
+    return {name: results[name] for name in names if name in results}
+
+
+def read_parameters_by_path(
+    bsm: "boto_session_manager.BotoSesManager",
+    path: str,
+    parameter_with_encryption: bool,
+    recursive: bool = True,
+) -> T.Dict[str, T.Tuple[dict, str]]:
+    """
+    Read config data and parameter version of all parameters under the
+    hierarchy path from AWS SSM parameter store, for example, ``/my-company/``
+    for ``/my-company/project1``, ``/my-company/project2``. It uses paginated
+    ``GetParametersByPath`` API calls.
+
+    Ref:
+
+    - get_parameters_by_path: https://boto3.amazonaws.com/v1/documentation/api/latest/reference/services/ssm.html#SSM.Client.get_parameters_by_path
+
+    :return: a dict mapping parameter name to config data and version.
+    """
+    paginator = get_client(bsm, "ssm").get_paginator("get_parameters_by_path")
+    results = dict()
+    for response in paginator.paginate(
+        Path=path,
+        Recursive=recursive,
+        WithDecryption=parameter_with_encryption,
+    ):
+        for dct in response.get("Parameters", []):
+            parameter = _to_parameter(dct)
+            results[parameter.Name] = (parameter.json_dict, str(parameter.Version))
+    return results
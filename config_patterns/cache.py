@@ -0,0 +1,443 @@
+# -*- coding: utf-8 -*-
+
+"""
+Thread-safe in-memory cache utilities.
+"""
+
+import typing as T
+import time
+import threading
+import dataclasses
+from collections import OrderedDict
+
+
+@dataclasses.dataclass
+class CacheStats:
+    """
+    Snapshot of the cache statistics.
+
+    :param hits: number of lookups that found the value in the cache.
+    :param misses: number of lookups that didn't find the value in the cache.
+    :param maxsize: the maximum number of items the cache can hold.
+    :param currsize: the current number of items in the cache.
+    """
+
+    hits: int = dataclasses.field()
+    misses: int = dataclasses.field()
+    maxsize: int = dataclasses.field()
+    currsize: int = dataclasses.field()
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        if total == 0:
+            return 0.0
+        return self.hits / total
+
+
+class LRUCache:
+    """
+    A bounded, thread-safe, least recently used cache with hit and miss
+    statistics.
+
+    Example::
+
+        >>> cache = LRUCache(maxsize=2)
+        >>> cache.put("a", 1)
+        >>> cache.get("a")
+        1
+        >>> cache.get("b") is None
+        True
+        >>> cache.stats()
+        CacheStats(hits=1, misses=1, maxsize=2, currsize=1)
+
+    :param maxsize: the maximum number of items to keep, the least recently
+        used item will be evicted when the cache is full.
+    """
+
+    def __init__(self, maxsize: int = 128):
+        if maxsize < 1:
+            raise ValueError("maxsize has to be a positive integer!")
+        self.maxsize = maxsize
+        self._data: T.OrderedDict[T.Hashable, T.Any] = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def get(self, key: T.Hashable, default: T.Any = None) -> T.Any:
+        with self._lock:
+            try:
+                value = self._data[key]
+            except KeyError:
+                self._misses += 1
+                return default
+            self._data.move_to_end(key)
+            self._hits += 1
+            return value
+
+    def put(self, key: T.Hashable, value: T.Any):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def pop(self, key: T.Hashable, default: T.Any = None) -> T.Any:
+        """
+        Remove the item and return its value, or ``default`` if not found.
+        """
+        with self._lock:
+            return self._data.pop(key, default)
+
+    def resize(self, maxsize: int):
+        """
+        Change the maximum size of the cache, evict the least recently used
+        items if needed.
+        """
+        if maxsize < 1:
+            raise ValueError("maxsize has to be a positive integer!")
+        with self._lock:
+            self.maxsize = maxsize
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        """
+        Remove all items and reset the statistics.
+        """
+        with self._lock:
+            self._data.clear()
+            self._hits = 0
+            self._misses = 0
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return CacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                maxsize=self.maxsize,
+                currsize=len(self._data),
+            )
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: T.Hashable) -> bool:
+        return key in self._data
+
+
+@dataclasses.dataclass
+class TTLCacheStats:
+    """
+    Snapshot of the :class:`TTLCache` statistics.
+
+    :param hits: number of lookups served by a fresh value.
+    :param stale_hits: number of lookups served by a stale value while it
+        is being refreshed in background.
+    :param misses: number of lookups that had to wait for the loader.
+    :param refresh_errors: number of failed background refreshes.
+    :param maxsize: the maximum number of items the cache can hold.
+    :param currsize: the current number of items in the cache.
+    """
+
+    hits: int = dataclasses.field()
+    stale_hits: int = dataclasses.field()
+    misses: int = dataclasses.field()
+    refresh_errors: int = dataclasses.field()
+    maxsize: int = dataclasses.field()
+    currsize: int = dataclasses.field()
+
+
+@dataclasses.dataclass
+class _TTLEntry:
+    value: T.Any = dataclasses.field()
+    loaded_at: float = dataclasses.field()
+
+
+class _Flight:
+    """
+    One in-flight loader call, other callers of the same key wait for it.
+    """
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.value: T.Any = None
+        self.error: T.Optional[BaseException] = None
+
+
+class TTLCache:
+    """
+    A thread-safe cache with time-to-live and stale-while-revalidate.
+
+    For a lookup of ``key`` with ``ttl`` and ``max_staleness`` (in seconds):
+
+    - if the value is younger than ``ttl``, it is returned from memory.
+    - if the value is older than ``ttl`` but younger than ``max_staleness``,
+        the stale value is returned immediately, and a background thread
+        calls the loader to refresh it. If the refresh fails, the stale value
+        is kept and retried by the next lookup.
+    - otherwise (missing, or too stale), the caller calls the loader and waits.
+        Concurrent callers of the same key share one loader call.
+
+    The least recently used item is evicted when the cache is full.
+
+    Example::
+
+        >>> cache = TTLCache()
+        >>> cache.get("key", loader=lambda: "value", ttl=60, max_staleness=3600)
+        'value'
+
+    Only the freshness check of a lookup is lock-free, the recency order,
+    the items and the statistics are changed under the lock.
+
+    :param maxsize: the maximum number of items to keep.
+    :param clock: the function that returns the current time in seconds,
+        it is for testing.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 128,
+        clock: T.Callable[[], float] = time.monotonic,
+    ):
+        if maxsize < 1:
+            raise ValueError("maxsize has to be a positive integer!")
+        self.maxsize = maxsize
+        self._clock = clock
+        self._entries: T.OrderedDict[T.Hashable, _TTLEntry] = OrderedDict()
+        self._flights: T.Dict[T.Hashable, _Flight] = dict()
+        self._refreshing: T.Set[T.Hashable] = set()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._stale_hits = 0
+        self._misses = 0
+        self._refresh_errors = 0
+
+    def get(
+        self,
+        key: T.Hashable,
+        loader: T.Callable[[], T.Any],
+        ttl: float,
+        max_staleness: T.Optional[float] = None,
+    ) -> T.Any:
+        """
+        Get the value of the key, call the loader if needed.
+
+        :param key: the cache key.
+        :param loader: a function that takes no argument and returns the value.
+        :param ttl: the value younger than this is served without refresh.
+        :param max_staleness: the value older than this is never served.
+            If None, it is the same as ``ttl``, which means no stale value
+            is served.
+        """
+        if max_staleness is None:
+            max_staleness = ttl
+        elif max_staleness < ttl:
+            raise ValueError("max_staleness cannot be smaller than ttl!")
+        entry = self._entries.get(key)
+        if entry is not None:
+            age = self._clock() - entry.loaded_at
+            if age < ttl:
+                with self._lock:
+                    self._touch(key)
+                    self._hits += 1
+                return entry.value
+            if age < max_staleness:
+                with self._lock:
+                    self._touch(key)
+                    self._stale_hits += 1
+                self._refresh_in_background(key, loader)
+                return entry.value
+        with self._lock:
+            self._misses += 1
+        return self._load(key, loader)
+
+    def _load(self, key: T.Hashable, loader: T.Callable[[], T.Any]) -> T.Any:
+        with self._lock:
+            flight = self._flights.get(key)
+            is_owner = flight is None
+            if is_owner:
+                flight = _Flight()
+                self._flights[key] = flight
+        if is_owner is False:
+            flight.event.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.value
+        try:
+            value = loader()
+            self._set(key, _TTLEntry(value=value, loaded_at=self._clock()))
+            flight.value = value
+            return value
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.event.set()
+
+    def _touch(self, key: T.Hashable):
+        # the caller must hold the lock
+        try:
+            self._entries.move_to_end(key)
+        except KeyError:  # evicted by another thread
+            pass
+
+    def _set(self, key: T.Hashable, entry: _TTLEntry):
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def _refresh_in_background(self, key: T.Hashable, loader: T.Callable[[], T.Any]):
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+
+        def refresh():
+            try:
+                self._load(key, loader)
+            except Exception:
+                with self._lock:
+                    self._refresh_errors += 1
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+
+        thread = threading.Thread(target=refresh, daemon=True)
+        thread.start()
+
+    def put(self, key: T.Hashable, value: T.Any, age: float = 0.0):
+        """
+        Set the value of the key, as if it was loaded ``age`` seconds ago.
+        It is used to seed the cache with a value loaded from somewhere else,
+        for example, a copy saved on the local disk.
+        """
+        self._set(key, _TTLEntry(value=value, loaded_at=self._clock() - age))
+
+    def resize(self, maxsize: int):
+        """
+        Change the maximum size of the cache, evict the least recently used
+        items if needed.
+        """
+        if maxsize < 1:
+            raise ValueError("maxsize has to be a positive integer!")
+        with self._lock:
+            self.maxsize = maxsize
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, key: T.Hashable):
+        """
+        Remove one key, the next lookup calls the loader.
+        """
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        """
+        Remove all items and reset the statistics.
+        """
+        with self._lock:
+            self._entries.clear()
+            self._hits = 0
+            self._stale_hits = 0
+            self._misses = 0
+            self._refresh_errors = 0
+
+    def stats(self) -> TTLCacheStats:
+        with self._lock:
+            return TTLCacheStats(
+                hits=self._hits,
+                stale_hits=self._stale_hits,
+                misses=self._misses,
+                refresh_errors=self._refresh_errors,
+                maxsize=self.maxsize,
+                currsize=len(self._entries),
+            )
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: T.Hashable) -> bool:
+        return key in self._entries
+
+
+class cached_property:
+    """
+    A thread-safe version of ``functools.cached_property``.
+
+    The value is computed only once per instance even if many threads access
+    it at the same time (double-checked locking with a per-instance lock,
+    so different instances don't block each other). After that, the value
+    is stored in the instance ``__dict__``, the descriptor is not involved
+    anymore, so reading it is as fast as a regular attribute.
+
+    Example::
+
+        class Config:
+            @cached_property
+            def project_name(self) -> str:
+                return expensive_computation()
+    """
+
+    def __init__(self, func: T.Callable[[T.Any], T.Any]):
+        self.func = func
+        self.attrname: T.Optional[str] = None
+        self.__doc__ = func.__doc__
+        self.__module__ = func.__module__
+        self._lock = threading.Lock()
+        # instance id -> the lock of computing the value for this instance
+        self._instance_locks: T.Dict[int, threading.RLock] = dict()
+
+    def __set_name__(self, owner: T.Type, name: str):
+        if self.attrname is None:
+            self.attrname = name
+        elif name != self.attrname:
+            raise TypeError(
+                "Cannot assign the same cached_property to two different names "
+                f"({self.attrname!r} and {name!r})."
+            )
+
+    def __get__(self, instance: T.Any, owner: T.Optional[T.Type] = None) -> T.Any:
+        if instance is None:
+            return self
+        if self.attrname is None:
+            raise TypeError(
+                "Cannot use cached_property instance without calling __set_name__ on it."
+            )
+        try:
+            cache = instance.__dict__
+        except AttributeError:  # objects with __slots__ have no __dict__
+            raise TypeError(
+                f"No '__dict__' attribute on {type(instance).__name__!r} "
+                f"instance to cache {self.attrname!r} property."
+            ) from None
+        # this method is only called when the value is not in the cache,
+        # but another thread may have just computed it
+        try:
+            return cache[self.attrname]
+        except KeyError:
+            pass
+        key = id(instance)
+        with self._lock:
+            lock = self._instance_locks.get(key)
+            if lock is None:
+                lock = threading.RLock()
+                self._instance_locks[key] = lock
+        try:
+            with lock:
+                try:
+                    return cache[self.attrname]
+                except KeyError:
+                    pass
+                value = self.func(instance)
+                cache[self.attrname] = value
+                return value
+        finally:
+            with self._lock:
+                if self._instance_locks.get(key) is lock:
+                    del self._instance_locks[key]
@@ -0,0 +1,198 @@
+# -*- coding: utf-8 -*-
+
+"""
+Dataclass utilities.
+
+- :func:`compile_from_dict`: generate a fast ``from_dict`` function for a
+    dataclass. It is code-generated once per class and cached on the class.
+- :func:`add_slots`: make a dataclass use ``__slots__``, it works on Python3.7+,
+    the same as ``@dataclasses.dataclass(slots=True)`` on Python3.10+.
+"""
+
+import typing as T
+import types
+import dataclasses
+
+_COMPILED_FROM_DICT = "_compiled_from_dict"
+
+_NO_CONVERTER = object()
+
+# the ``X | None`` syntax on Python3.10+
+_UnionType = getattr(types, "UnionType", None)
+
+
+def _get_type_hints(klass: T.Type) -> T.Dict[str, T.Any]:
+    try:
+        return T.get_type_hints(klass)
+    except Exception:  # unresolvable forward reference
+        return {field.name: field.type for field in dataclasses.fields(klass)}
+
+
+def _get_dataclass_converter(
+    klass: T.Type,
+) -> T.Callable[[dict], T.Any]:
+    # respect the user defined from_dict method
+    from_dict = getattr(klass, "from_dict", None)
+    if callable(from_dict):
+        return from_dict
+    else:
+        return compile_from_dict(klass)
+
+
+def _make_dataclass_converter(klass: T.Type) -> T.Callable[[T.Any], T.Any]:
+    # resolve the converter lazily on the first call,
+    # so a dataclass can reference itself
+    converter = None
+
+    def convert_dataclass(value):
+        nonlocal converter
+        if isinstance(value, dict):
+            if converter is None:
+                converter = _get_dataclass_converter(klass)
+            return converter(value)
+        return value
+
+    return convert_dataclass
+
+
+def _make_converter(type_hint: T.Any) -> T.Any:
+    """
+    Make a function to convert the raw value to the type in the type hint.
+    Only nested dataclass, and list, tuple or dict of dataclass need conversion.
+    Return ``_NO_CONVERTER`` if the raw value can be used as it is.
+    """
+    if isinstance(type_hint, type) and dataclasses.is_dataclass(type_hint):
+        return _make_dataclass_converter(type_hint)
+
+    origin = getattr(type_hint, "__origin__", None)
+    args = getattr(type_hint, "__args__", None) or ()
+    if (origin is T.Union) or (
+        (_UnionType is not None) and isinstance(type_hint, _UnionType)
+    ):
+        non_none_args = [arg for arg in args if arg is not type(None)]
+        if len(non_none_args) == 1:
+            return _make_converter(non_none_args[0])
+        return _NO_CONVERTER
+    if origin in (list, tuple) and len(args) >= 1:
+        item_converter = _make_converter(args[0])
+        if item_converter is _NO_CONVERTER:
+            return _NO_CONVERTER
+
+        def convert_list(value):
+            if isinstance(value, list):
+                return [item_converter(item) for item in value]
+            return value
+
+        return convert_list
+    if origin is dict and len(args) == 2:
+        value_converter = _make_converter(args[1])
+        if value_converter is _NO_CONVERTER:
+            return _NO_CONVERTER
+
+        def convert_dict(value):
+            if isinstance(value, dict):
+                return {k: value_converter(v) for k, v in value.items()}
+            return value
+
+        return convert_dict
+    return _NO_CONVERTER
+
+
+def _generate_from_dict(klass: T.Type) -> T.Callable[[dict], T.Any]:
+    type_hints = _get_type_hints(klass)
+    converters = dict()
+    for field in dataclasses.fields(klass):
+        if field.init is False:
+            continue
+        converter = _make_converter(type_hints.get(field.name, field.type))
+        if converter is not _NO_CONVERTER:
+            converters[field.name] = converter
+
+    # the unknown key is rejected by the dataclass generated __init__
+    # with a TypeError, there's no need to check it again
+    namespace = {"klass": klass}
+    lines = ["def from_dict(data):"]
+    if converters:
+        lines.append("    kwargs = dict(data)")
+        for ith, (field_name, converter) in enumerate(converters.items()):
+            namespace[f"convert_{ith}"] = converter
+            lines.append(f"    if {field_name!r} in kwargs:")
+            lines.append(
+                f"        kwargs[{field_name!r}] = convert_{ith}(kwargs[{field_name!r}])"
+            )
+        lines.append("    return klass(**kwargs)")
+    else:
+        lines.append("    return klass(**data)")
+    source = "\n".join(lines)
+    exec(compile(source, f"<from_dict of {klass.__qualname__}>", "exec"), namespace)
+    return namespace["from_dict"]
+
+
+def compile_from_dict(klass: T.Type) -> T.Callable[[dict], T.Any]:
+    """
+    Get the ``from_dict(data)`` function of a dataclass. The function is
+    code-generated on the first call and cached on the class.
+
+    The generated function:
+
+    - raises ``TypeError`` if the data has any key that is not an init field,
+        the same as ``klass(**data)``.
+    - converts the nested dataclass, and the list, tuple (as list) or
+        dict values of dataclass, based on the type hint, ``Optional[...]`` is
+        supported. If the nested dataclass has a ``from_dict`` method,
+        it is used.
+    - doesn't modify the input data.
+
+    Example::
+
+        >>> @dataclasses.dataclass
+        ... class Database:
+        ...     host: str
+        >>> @dataclasses.dataclass
+        ... class Env:
+        ...     databases: T.List[Database]
+        >>> compile_from_dict(Env)({"databases": [{"host": "db.com"}]})
+        Env(databases=[Database(host='db.com')])
+    """
+    func = klass.__dict__.get(_COMPILED_FROM_DICT)
+    if func is None:
+        func = _generate_from_dict(klass)
+        setattr(klass, _COMPILED_FROM_DICT, staticmethod(func))
+        return func
+    return func.__func__
+
+
+def add_slots(klass: T.Type) -> T.Type:
+    """
+    A class decorator that recreates a dataclass with ``__slots__``. It has
+    to be applied on top of ``@dataclasses.dataclass``. To drop the instance
+    ``__dict__`` entirely, all the base classes have to use ``__slots__`` too.
+
+    Example::
+
+        >>> @add_slots
+        ... @dataclasses.dataclass
+        ... class Database:
+        ...     host: str
+    """
+    field_names = [field.name for field in dataclasses.fields(klass)]
+    inherited_slots = set()
+    for base in klass.__mro__[1:-1]:
+        slots = base.__dict__.get("__slots__", ())
+        if isinstance(slots, str):
+            slots = (slots,)
+        inherited_slots.update(slots)
+    class_dict = dict(klass.__dict__)
+    class_dict["__slots__"] = tuple(
+        field_name for field_name in field_names if field_name not in inherited_slots
+    )
+    # the class level default values conflict with the slots,
+    # the dataclass generated __init__ already has the default values
+    for field_name in field_names:
+        class_dict.pop(field_name, None)
+    class_dict.pop("__dict__", None)
+    class_dict.pop("__weakref__", None)
+    class_dict.pop(_COMPILED_FROM_DICT, None)
+    new_klass = type(klass)(klass.__name__, klass.__bases__, class_dict)
+    new_klass.__qualname__ = klass.__qualname__
+    return new_klass
@@ -0,0 +1,212 @@
+# -*- coding: utf-8 -*-
+
+"""
+Local disk cache of the config data read from the remote configuration store,
+a.k.a. the last-known-good copy.
+
+It is used by :meth:`config_patterns.patterns.multi_env_json.impl.BaseConfig.read`
+to start a new process from the disk immediately, and to fall back to the
+last-known-good copy when AWS Parameter Store or S3 is throttled or unreachable.
+"""
+
+import typing as T
+import os
+import json
+import time
+import base64
+import hashlib
+import tempfile
+import threading
+import dataclasses
+from pathlib import Path
+
+from .logger import logger
+from .utils import sha256_of_text, sha256_of_config_data
+
+
+@dataclasses.dataclass
+class DiskCacheEntry:
+    """
+    One config saved on the disk.
+
+    :param data: the config data.
+    :param secret_data: the secret config data. If the secret data is omitted
+        when saving, it only has the top level keys with empty dict values.
+    :param version: the config version.
+    :param sha256: the sha256 of the config data and secret data, it is the
+        same as the ``config_sha256`` of the remote config.
+    :param saved_at: the epoch timestamp when it is saved.
+    :param secret_omitted: True if the config has secret data but it is not
+        saved, because there is no encryptor.
+    """
+
+    data: dict = dataclasses.field()
+    secret_data: dict = dataclasses.field()
+    version: str = dataclasses.field()
+    sha256: str = dataclasses.field()
+    saved_at: float = dataclasses.field()
+    secret_omitted: bool = dataclasses.field()
+
+    @property
+    def age(self) -> float:
+        """
+        How many seconds since it is saved.
+        """
+        return max(0.0, time.time() - self.saved_at)
+
+
+class DiskConfigCache:
+    """
+    Save the config data to the local disk atomically, one file per key.
+
+    The secret data is never saved in plain text. If the ``encryptor`` is
+    given, the secret data is encrypted with it, otherwise the secret data is
+    omitted, only the non-sensitive data is saved.
+
+    Example::
+
+        from cryptography.fernet import Fernet
+
+        disk_cache = DiskConfigCache(
+            dir_cache="/tmp/my_project/config-cache",
+            encryptor=Fernet(key), # anything has encrypt(bytes) and decrypt(bytes)
+        )
+
+    :param dir_cache: the directory to store the cache files, it is created
+        if not exists.
+    :param encryptor: an object with ``encrypt(bytes) -> bytes`` and
+        ``decrypt(bytes) -> bytes`` methods, for example
+        ``cryptography.fernet.Fernet``.
+    :param allow_secret_omitted: if True, the copy whose secret data is
+        omitted can be used as the fallback of the remote read, the secret
+        values are all missing. By default, the remote error is raised.
+    """
+
+    def __init__(
+        self,
+        dir_cache: T.Union[str, Path],
+        encryptor: T.Optional[T.Any] = None,
+        allow_secret_omitted: bool = False,
+    ):
+        self.dir_cache = Path(dir_cache)
+        self.encryptor = encryptor
+        self.allow_secret_omitted = allow_secret_omitted
+        self._lock = threading.Lock()
+        # key -> the sha256 and version of the last saved config,
+        # to skip writing the same config again
+        self._saved: T.Dict[str, T.Tuple[str, str]] = dict()
+
+    def get_path(self, key: str) -> Path:
+        """
+        Get the cache file path of the key.
+        """
+        digest = hashlib.sha256(key.encode("utf-8")).hexdigest()
+        return self.dir_cache.joinpath(f"{digest}.json")
+
+    def save(
+        self,
+        key: str,
+        data: dict,
+        secret_data: dict,
+        version: str,
+    ) -> bool:
+        """
+        Save the config to the disk. The file is written to a temp file first,
+        then renamed, so the reader never sees a partial file.
+
+        :return: True if the file is written, False if the same config has
+            been saved by this object already.
+        """
+        sha256 = sha256_of_config_data({"data": data, "secret_data": secret_data})
+        if self._saved.get(key) == (sha256, version):
+            return False
+        if self.encryptor is None:
+            secret = None
+        else:
+            secret = base64.b64encode(
+                self.encryptor.encrypt(json.dumps(secret_data).encode("utf-8"))
+            ).decode("ascii")
+        body = json.dumps(
+            {
+                "key": key,
+                "version": version,
+                "sha256": sha256,
+                "saved_at": time.time(),
+                "data": data,
+                "secret_keys": list(secret_data),
+                "secret_omitted": (secret is None) and any(secret_data.values()),
+                "secret": secret,
+            }
+        )
+        content = json.dumps({"digest": sha256_of_text(body), "body": body})
+        path = self.get_path(key)
+        with self._lock:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, path_tmp = tempfile.mkstemp(dir=str(path.parent), suffix=".tmp")
+            try:
+                with os.fdopen(fd, "w") as f:
+                    f.write(content)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(path_tmp, str(path))
+            except BaseException:
+                if os.path.exists(path_tmp):
+                    os.remove(path_tmp)
+                raise
+            self._saved[key] = (sha256, version)
+        return True
+
+    def load(self, key: str) -> T.Optional[DiskCacheEntry]:
+        """
+        Load the config from the disk.
+
+        :return: the :class:`DiskCacheEntry`, or None if the file doesn't
+            exist, is corrupted, or the secret data cannot be decrypted.
+        """
+        path = self.get_path(key)
+        try:
+            content = json.loads(path.read_text())
+            body = content["body"]
+            if sha256_of_text(body) != content["digest"]:
+                logger.info(f"disk cache file {path} is corrupted, ignore it.")
+                return None
+            body = json.loads(body)
+        except FileNotFoundError:
+            return None
+        except (ValueError, KeyError, TypeError):
+            logger.info(f"disk cache file {path} is corrupted, ignore it.")
+            return None
+        if body["key"] != key:  # pragma: no cover
+            return None
+        if body["secret"] is not None:
+            if self.encryptor is None:
+                logger.info(f"cannot decrypt disk cache file {path}, ignore it.")
+                return None
+            try:
+                secret_data = json.loads(
+                    self.encryptor.decrypt(base64.b64decode(body["secret"]))
+                )
+            except Exception:
+                logger.info(f"cannot decrypt disk cache file {path}, ignore it.")
+                return None
+        else:
+            secret_data = {k: {} for k in body["secret_keys"]}
+        return DiskCacheEntry(
+            data=body["data"],
+            secret_data=secret_data,
+            version=body["version"],
+            sha256=body["sha256"],
+            saved_at=body["saved_at"],
+            secret_omitted=body["secret_omitted"],
+        )
+
+    def delete(self, key: str):
+        """
+        Delete the cache file of the key.
+        """
+        with self._lock:
+            self._saved.pop(key, None)
+            try:
+                self.get_path(key).unlink()
+            except FileNotFoundError:
+                pass
@@ -0,0 +1,288 @@
+# -*- coding: utf-8 -*-
+
+"""
+Immutable representation of JSON-like config data.
+
+:func:`freeze` converts dict to :class:`FrozenDict` (a read-only mapping) and
+list to tuple, so one tree can be shared by many consumers safely without
+deep-copying it on every access. :func:`thaw` converts it back to
+mutable dict and list for the callers who need mutation.
+
+Example::
+
+    >>> frozen = freeze({"username": "alice", "tags": ["a", "b"]})
+    >>> frozen
+    FrozenDict({'username': 'alice', 'tags': ('a', 'b')})
+    >>> frozen["tags"]
+    ('a', 'b')
+    >>> thaw(frozen)
+    {'username': 'alice', 'tags': ['a', 'b']}
+
+:func:`dedup` hash-conses the identical subtrees and interns the strings of
+a tree into a frozen tree, so the repeated values are stored only once.
+"""
+
+import typing as T
+import sys
+import copy
+import marshal
+import dataclasses
+
+
+class FrozenDict(T.Mapping[str, T.Any]):
+    """
+    A read-only, hashable mapping. The values should be frozen as well,
+    use :func:`freeze` to create it from a regular dict.
+
+    The :meth:`thaw` result is cached in a compact serialized form, so
+    thawing the same tree again only costs one ``marshal.loads`` call,
+    which is much faster than ``copy.deepcopy``.
+    """
+
+    __slots__ = ("_data", "_hash", "_thaw_cache")
+
+    def __init__(self, data: T.Optional[T.Mapping[str, T.Any]] = None):
+        self._data: T.Dict[str, T.Any] = dict() if data is None else dict(data)
+        self._hash: T.Optional[int] = None
+        # either the marshal bytes of the thawed dict, or the thawed dict
+        # itself if it cannot be serialized by marshal
+        self._thaw_cache: T.Optional[T.Union[bytes, dict]] = None
+
+    def __getitem__(self, key: str) -> T.Any:
+        return self._data[key]
+
+    def __iter__(self) -> T.Iterator[str]:
+        return iter(self._data)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._data
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({self._data!r})"
+
+    def __hash__(self) -> int:
+        if self._hash is None:
+            self._hash = hash(frozenset(self._data.items()))
+        return self._hash
+
+    def __copy__(self) -> "FrozenDict":
+        return self
+
+    def __deepcopy__(self, memo: dict) -> "FrozenDict":
+        return self
+
+    def __reduce__(self):
+        return (self.__class__, (self._data,))
+
+    def thaw(self) -> dict:
+        """
+        Return a new mutable deep copy of this tree in regular dict and list.
+        """
+        cache = self._thaw_cache
+        if cache is None:
+            data = _thaw(self)
+            try:
+                cache = marshal.dumps(data)
+            except ValueError:  # not JSON-like value
+                cache = data
+            self._thaw_cache = cache
+        if isinstance(cache, bytes):
+            return marshal.loads(cache)
+        else:
+            return copy.deepcopy(cache)
+
+
+def freeze(data: T.Any) -> T.Any:
+    """
+    Convert dict to :class:`FrozenDict` and list to tuple, recursively.
+    Other values are returned as it is.
+    """
+    if isinstance(data, FrozenDict):
+        return data
+    elif isinstance(data, dict):
+        return FrozenDict({key: freeze(value) for key, value in data.items()})
+    elif isinstance(data, (list, tuple)):
+        return tuple(freeze(item) for item in data)
+    else:
+        return data
+
+
+def _thaw(data: T.Any) -> T.Any:
+    if isinstance(data, FrozenDict):
+        return {key: _thaw(value) for key, value in data._data.items()}
+    elif isinstance(data, tuple):
+        return [_thaw(item) for item in data]
+    else:
+        return data
+
+
+def thaw(data: T.Any) -> T.Any:
+    """
+    Convert :class:`FrozenDict` to dict and tuple to list, recursively.
+    It always returns a new object for container, the input is not shared.
+    """
+    if isinstance(data, FrozenDict):
+        return data.thaw()
+    elif isinstance(data, tuple):
+        return [thaw(item) for item in data]
+    else:
+        return data
+
+
+@dataclasses.dataclass
+class DedupStats:
+    """
+    The memory usage before and after :func:`dedup`.
+
+    :param bytes_before: the deep size of the tree before dedup, in bytes.
+    :param bytes_after: the deep size of the tree after dedup, in bytes.
+    """
+
+    bytes_before: int = dataclasses.field()
+    bytes_after: int = dataclasses.field()
+
+    @property
+    def bytes_saved(self) -> int:
+        return self.bytes_before - self.bytes_after
+
+
+def deep_sizeof(data: T.Any) -> int:
+    """
+    Return the total size in bytes of the tree, each object is counted once
+    no matter how many times it is referenced.
+    """
+    seen: T.Set[int] = set()
+    total = 0
+    stack = [data]
+    while stack:
+        node = stack.pop()
+        if id(node) in seen:
+            continue
+        seen.add(id(node))
+        total += sys.getsizeof(node)
+        if isinstance(node, FrozenDict):
+            total += sys.getsizeof(node._data)
+            stack.extend(node._data.keys())
+            stack.extend(node._data.values())
+        elif isinstance(node, dict):
+            stack.extend(node.keys())
+            stack.extend(node.values())
+        elif isinstance(node, (list, tuple)):
+            stack.extend(node)
+    return total
+
+
+_CONTAINER_TYPES = (dict, FrozenDict, list, tuple)
+
+
+def _dedup_scalar(data: T.Any, memo: dict) -> T.Tuple[T.Any, T.Hashable]:
+    if isinstance(data, str):
+        data = sys.intern(data)
+        return data, data
+    if isinstance(data, float):
+        # ``0.0 == -0.0``, but they are different values
+        memo_key = (type(data), repr(data))
+        return memo.setdefault(memo_key, data), memo_key
+    try:
+        memo_key = (type(data), data)
+        return memo.setdefault(memo_key, data), memo_key
+    except TypeError:  # not hashable, never merged
+        return data, (id(data),)
+
+
+def _new_dedup_frame(data: T.Any) -> list:
+    # [children iterator, is mapping, new items, sub keys, key of the child
+    # being processed]
+    if isinstance(data, FrozenDict):
+        return [iter(data._data.items()), True, list(), list(), None]
+    if isinstance(data, dict):
+        return [iter(data.items()), True, list(), list(), None]
+    return [enumerate(data), False, list(), list(), None]
+
+
+def _dedup(data: T.Any, memo: dict) -> T.Tuple[T.Any, T.Hashable]:
+    """
+    Return the canonical object and its structural key. The key includes
+    the type, so ``1``, ``1.0`` and ``True`` are not merged. The canonical
+    containers are frozen, because they are shared.
+
+    The tree is walked in post order with an explicit stack, like
+    :func:`~config_patterns.patterns.merge_key_value.impl.merge_key_value`,
+    so there is no limit on how deep it can be nested. A child container is
+    keyed by the id of its canonical object, which is kept alive by the memo,
+    so the keys stay flat no matter how deep the tree is.
+    """
+    if not isinstance(data, _CONTAINER_TYPES):
+        return _dedup_scalar(data, memo)
+
+    stack = [_new_dedup_frame(data)]
+    result = None
+    while True:
+        frame = stack[-1]
+        children, is_mapping, new_items, sub_keys, _ = frame
+        if result is not None:  # the pending child container is done
+            value, sub_key = result
+            result = None
+            if is_mapping:
+                new_items.append((frame[4], value))
+                sub_keys.append((frame[4], sub_key))
+            else:
+                new_items.append(value)
+                sub_keys.append(sub_key)
+        for key, value in children:
+            if is_mapping and isinstance(key, str):
+                key = sys.intern(key)
+            if isinstance(value, _CONTAINER_TYPES):
+                frame[4] = key
+                stack.append(_new_dedup_frame(value))
+                break
+            value, sub_key = _dedup_scalar(value, memo)
+            if is_mapping:
+                new_items.append((key, value))
+                sub_keys.append((key, sub_key))
+            else:
+                new_items.append(value)
+                sub_keys.append(sub_key)
+        else:
+            stack.pop()
+            if is_mapping:
+                memo_key = (FrozenDict, tuple(sub_keys))
+                canonical = memo.get(memo_key)
+                if canonical is None:
+                    canonical = FrozenDict(new_items)
+                    memo[memo_key] = canonical
+            else:
+                memo_key = (tuple, tuple(sub_keys))
+                canonical = memo.get(memo_key)
+                if canonical is None:
+                    canonical = tuple(new_items)
+                    memo[memo_key] = canonical
+            if not stack:
+                return canonical, memo_key
+            # the parent only needs the id, the memo keeps the object alive
+            result = (canonical, id(canonical))
+
+
+def dedup(data: T.Any, memo: T.Optional[dict] = None) -> T.Any:
+    """
+    Return a frozen copy of the tree (see :func:`freeze`) where the identical
+    subtrees are the same object, and the strings are interned with
+    ``sys.intern``. The input is not modified. The result is frozen because
+    the shared subtrees must not be modified by anyone, use :func:`thaw` to
+    get a mutable copy.
+
+    Example::
+
+        >>> tree = dedup({"dev": {"tags": {"a": 1}}, "prod": {"tags": {"a": 1}}})
+        >>> tree["dev"]["tags"] is tree["prod"]["tags"]
+        True
+
+    :param memo: the canonical objects are stored in this dict, pass the same
+        dict to dedup multiple trees against each other.
+    """
+    if memo is None:
+        memo = dict()
+    return _dedup(data, memo)[0]
@@ -0,0 +1,200 @@
+# -*- coding: utf-8 -*-
+
+"""
+Hedged requests to replicated remote stores.
+
+The same read is sent to the replicas one by one. If the current replica has
+not answered within its usual latency (a percentile of its recent latency),
+a hedged request is sent to the next replica, the first successful result is
+used. It cuts the tail latency when one replica is slow.
+"""
+
+import typing as T
+import math
+import time
+import threading
+import collections
+from concurrent.futures import Executor, Future, ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+
+class LatencyTracker:
+    """
+    A thread-safe recorder of the recent latency (in seconds) per replica.
+    A failed call is recorded as infinite latency.
+
+    :param window: the number of the recent samples kept per replica.
+    """
+
+    def __init__(self, window: int = 100):
+        if window < 1:
+            raise ValueError("window must be at least 1!")
+        self._window = window
+        self._samples: T.Dict[T.Hashable, T.Deque[float]] = dict()
+        self._lock = threading.Lock()
+
+    def record(self, key: T.Hashable, latency: float):
+        """
+        Record one latency sample of the replica.
+        """
+        with self._lock:
+            samples = self._samples.get(key)
+            if samples is None:
+                samples = collections.deque(maxlen=self._window)
+                self._samples[key] = samples
+            samples.append(latency)
+
+    def record_failure(self, key: T.Hashable):
+        """
+        Record one failed call of the replica.
+        """
+        self.record(key, math.inf)
+
+    def count(self, key: T.Hashable) -> int:
+        """
+        Get the number of samples of the replica.
+        """
+        return len(self._samples.get(key, ()))
+
+    def percentile(self, key: T.Hashable, q: float) -> T.Optional[float]:
+        """
+        Get the ``q`` (0.0 ~ 1.0) percentile latency of the replica, by the
+        nearest rank method.
+
+        :return: the latency, or None if there's no sample.
+        """
+        with self._lock:
+            samples = sorted(self._samples.get(key, ()))
+        if len(samples) == 0:
+            return None
+        index = min(len(samples) - 1, max(0, math.ceil(q * len(samples)) - 1))
+        return samples[index]
+
+    def order(self, keys: T.Sequence[T.Hashable]) -> T.List[int]:
+        """
+        Sort the replicas by the median latency, the replicas without
+        any sample keep the given order after the measured ones.
+
+        :return: the indexes of ``keys`` in the new order.
+        """
+
+        def sort_key(i: int) -> T.Tuple[float, int]:
+            median = self.percentile(keys[i], 0.5)
+            return (math.inf if median is None else median, i)
+
+        return sorted(range(len(keys)), key=sort_key)
+
+    def clear(self):
+        """
+        Remove all samples.
+        """
+        with self._lock:
+            self._samples.clear()
+
+
+_executor: T.Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=16,
+                    thread_name_prefix="config_patterns_hedge",
+                )
+    return _executor
+
+
+def hedged_call(
+    calls: T.Sequence[T.Tuple[T.Hashable, T.Callable[[], T.Any]]],
+    tracker: LatencyTracker,
+    percentile: float = 0.95,
+    default_delay: float = 0.1,
+    min_samples: int = 5,
+    executor: T.Optional[Executor] = None,
+) -> T.Any:
+    """
+    Call the replicas with hedged requests, and return the first successful
+    result.
+
+    The replicas are called in the order of :meth:`LatencyTracker.order`.
+    If the last started call has not answered within the ``percentile``
+    latency of its replica, the next replica is called without cancelling
+    the previous ones. If a call fails, the next replica is called
+    immediately. Once one call succeeds, the calls not started yet are
+    cancelled, the running ones are left to finish in the background, their
+    latency is still recorded.
+
+    :param calls: a list of ``(replica key, function)``, the function takes
+        no argument.
+    :param tracker: the :class:`LatencyTracker` to read and record the latency.
+    :param percentile: the latency percentile to wait before sending the
+        hedged request.
+    :param default_delay: the seconds to wait before sending the hedged
+        request, when the replica has less than ``min_samples`` samples.
+    :param min_samples: see ``default_delay``.
+    :param executor: the ``concurrent.futures.Executor`` to run the calls,
+        if None, use a module-level thread pool.
+
+    :return: the result of the first successful call. If all calls fail,
+        raise the error of the first replica in the order.
+    """
+    if len(calls) == 0:
+        raise ValueError("calls cannot be empty!")
+    if executor is None:
+        executor = _get_executor()
+    calls = [calls[i] for i in tracker.order([key for key, _ in calls])]
+
+    pending: T.Dict[Future, int] = dict()
+    errors: T.Dict[int, BaseException] = dict()
+    n_started = 0
+
+    def start():
+        nonlocal n_started
+        key, func = calls[n_started]
+        start_time = time.perf_counter()
+
+        def on_done(future: Future):
+            if future.cancelled():
+                return
+            if future.exception() is None:
+                tracker.record(key, time.perf_counter() - start_time)
+            else:
+                tracker.record_failure(key)
+
+        future = executor.submit(func)
+        future.add_done_callback(on_done)
+        pending[future] = n_started
+        n_started += 1
+
+    def get_delay() -> float:
+        key = calls[n_started - 1][0]
+        delay = None
+        if tracker.count(key) >= min_samples:
+            delay = tracker.percentile(key, percentile)
+        if (delay is None) or math.isinf(delay):
+            return default_delay
+        return delay
+
+    start()
+    try:
+        while pending:
+            timeout = get_delay() if n_started < len(calls) else None
+            done, _ = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+            # the current call is too slow, send the hedged request
+            if len(done) == 0:
+                start()
+                continue
+            for future in done:
+                i = pending.pop(future)
+                if future.exception() is None:
+                    return future.result()
+                errors[i] = future.exception()
+            if n_started < len(calls):
+                start()
+    finally:
+        for future in pending:
+            future.cancel()
+    raise errors[min(errors)]
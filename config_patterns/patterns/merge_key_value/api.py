@@ -1,5 +1,6 @@
 # -*- coding: utf-8 -*-
 
 from .impl import (
+    copy_tree,
     merge_key_value,
 )
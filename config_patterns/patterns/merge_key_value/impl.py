@@ -5,11 +5,70 @@ In configuration management, it is common practice to divide the configuration
 into multiple files. From a machine's perspective, merging multiple dictionary data
 into one can be more convenient to process it later. This module is designed to
 recursively merge two dictionaries or a list of dictionaries.
+
+The merge is implemented with an explicit stack instead of recursion, so there
+is no limit on how deep the documents can be nested.
 """
 
 import typing as T
 import copy
 
+_ATOMIC_TYPES = (str, int, float, bool, type(None))
+
+
+def copy_tree(data: T.Any) -> T.Any:
+    """
+    Deep copy a JSON-like tree made of dict and list. It walks the tree with
+    an explicit stack, so it doesn't hit the recursion limit like
+    ``copy.deepcopy`` does on deeply nested data. Immutable scalar values are
+    shared, any other object is copied by ``copy.deepcopy``.
+    """
+    if isinstance(data, dict):
+        root = dict()
+    elif isinstance(data, list):
+        root = list()
+    elif isinstance(data, _ATOMIC_TYPES):
+        return data
+    else:
+        return copy.deepcopy(data)
+
+    stack = [(data, root)]
+    while stack:
+        src, dst = stack.pop()
+        if isinstance(src, dict):
+            items = src.items()
+        else:
+            items = enumerate(src)
+        is_dict = isinstance(dst, dict)
+        for key, value in items:
+            if isinstance(value, dict):
+                new_value = dict()
+                stack.append((value, new_value))
+            elif isinstance(value, list):
+                new_value = list()
+                stack.append((value, new_value))
+            elif isinstance(value, _ATOMIC_TYPES):
+                new_value = value
+            else:
+                new_value = copy.deepcopy(value)
+            if is_dict:
+                dst[key] = new_value
+            else:
+                dst.append(new_value)
+    return root
+
+
+def _to_fullpath(root: str, node: T.Optional[tuple]) -> str:
+    """
+    Convert the linked path node ``(parent_node, key)`` to dot notation
+    full path string like ``.key1.key2``. It is only used to build error message.
+    """
+    keys = list()
+    while node is not None:
+        node, key = node
+        keys.append(key)
+    return root + "".join(f".{key}" for key in reversed(keys))
+
 
 def merge_key_value(
     data1: dict,
@@ -56,41 +115,47 @@ def merge_key_value(
             ],
         }
     """
-    data1 = copy.deepcopy(data1)
-    data2 = copy.deepcopy(data2)
     if _fullpath is None:
         _fullpath = ""
 
-    difference = data2.keys() - data1.keys()  # extra keys
-    intersection = data1.keys() & data2.keys()  # common keys
-
-    # for extra keys, just add them to data1
-    for key in difference:
-        data1[key] = data2[key]
-
-    for key in intersection:
-        value1, value2 = data1[key], data2[key]
-        # if both values are dict, merge them recursively
-        if isinstance(value1, dict) and isinstance(value2, dict):
-            data1[key] = merge_key_value(value1, value2, f"{_fullpath}.{key}")
-        # if both values are list of dict, and has the same size, merge them recursively
-        elif isinstance(value1, list) and isinstance(value2, list):
-            if len(value1) != len(value2):
-                raise ValueError(f"list length mismatch: path = '{_fullpath}.{key}'")
-            value = list()
-            for item1, item2 in zip(value1, value2):
-                if isinstance(item1, dict) and isinstance(item2, dict):
-                    value.append(merge_key_value(item1, item2, f"{_fullpath}.{key}"))
-                else:
-                    raise TypeError(
-                        f"items in '{_fullpath}.{key}' are not dict, so you cannot merge them!"
+    merged = copy_tree(data1)
+    # each item is (target dict in the merged data, source dict from data2, path node)
+    # the path node is a ``(parent_node, key)`` linked list, the full path string
+    # is only built when we need to raise an error.
+    stack = [(merged, data2, None)]
+    while stack:
+        target, source, node = stack.pop()
+        for key, value2 in source.items():
+            if key not in target:
+                # for extra keys, just add them to data1
+                target[key] = copy_tree(value2)
+                continue
+
+            value1 = target[key]
+            # if both values are dict, merge them recursively
+            if isinstance(value1, dict) and isinstance(value2, dict):
+                stack.append((value1, value2, (node, key)))
+            # if both values are list of dict, and has the same size, merge them recursively
+            elif isinstance(value1, list) and isinstance(value2, list):
+                if len(value1) != len(value2):
+                    raise ValueError(
+                        f"list length mismatch: "
+                        f"path = '{_to_fullpath(_fullpath, (node, key))}'"
                     )
-            data1[key] = value
-        else:
-            raise TypeError(
-                f"type of value at '{_fullpath}.{key}' in data1 and data2 "
-                f"has to be both dict or list of dict to merge! "
-                f"they are {type(value1)} and {type(value2)}."
-            )
+                for item1, item2 in zip(value1, value2):
+                    if isinstance(item1, dict) and isinstance(item2, dict):
+                        stack.append((item1, item2, (node, key)))
+                    else:
+                        raise TypeError(
+                            f"items in '{_to_fullpath(_fullpath, (node, key))}' "
+                            f"are not dict, so you cannot merge them!"
+                        )
+            else:
+                raise TypeError(
+                    f"type of value at '{_to_fullpath(_fullpath, (node, key))}' "
+                    f"in data1 and data2 "
+                    f"has to be both dict or list of dict to merge! "
+                    f"they are {type(value1)} and {type(value2)}."
+                )
 
-    return data1
+    return merged
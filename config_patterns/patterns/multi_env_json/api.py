@@ -2,9 +2,21 @@
 
 from .impl import (
     ALL,
+    apply_merge_memo,
+    remote_read_cache,
+    pinned_read_cache,
+    replica_latency,
     BaseEnvEnum,
+    EnvRegistry,
+    BaseEnvMixin,
     BaseEnv,
+    BaseSlotsEnv,
     BaseConfig,
     normalize_parameter_name,
     ConfigDeployment,
 )
+from ...disk_cache import DiskConfigCache
+from .handle import (
+    ConfigSnapshot,
+    ConfigHandle,
+)
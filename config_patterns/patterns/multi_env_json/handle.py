@@ -0,0 +1,167 @@
+# -*- coding: utf-8 -*-
+
+"""
+Atomic config handle for long-running services.
+
+A :class:`ConfigHandle` holds the current :class:`ConfigSnapshot`, which is
+an immutable pair of one :class:`~config_patterns.patterns.multi_env_json.impl.BaseConfig`
+object and its prebuilt env objects. A refresher builds a new snapshot
+completely aside and installs it with a single reference assignment
+(read-copy-update), so the readers never take a lock and never see a half
+updated config.
+
+Example::
+
+    handle = ConfigHandle(Config.read(...))
+
+    # reader, in any thread or asyncio task
+    snapshot = handle.snapshot # use the same snapshot for the whole request
+    env = snapshot.get_env("prod")
+
+    # refresher, in a background thread
+    handle.refresh(lambda: Config.read(...))
+"""
+
+import typing as T
+import time
+import threading
+import dataclasses
+
+from .impl import BaseEnvEnum, BaseConfig, T_BASE_ENV
+
+T_BASE_CONFIG = T.TypeVar("T_BASE_CONFIG", bound=BaseConfig)
+
+
+@dataclasses.dataclass(frozen=True)
+class ConfigSnapshot(T.Generic[T_BASE_CONFIG]):
+    """
+    One consistent version of the config. It is never modified after it is
+    installed into a :class:`ConfigHandle`.
+
+    :param config: the config object.
+    :param envs: the prebuilt env objects, a dict mapping env name to env object.
+    :param generation: the sequence number of this snapshot in the handle,
+        starting from 1.
+    :param loaded_at: the epoch timestamp when this snapshot is created.
+    """
+
+    config: T_BASE_CONFIG = dataclasses.field()
+    envs: T.Dict[str, T_BASE_ENV] = dataclasses.field()
+    generation: int = dataclasses.field()
+    loaded_at: float = dataclasses.field()
+
+    @property
+    def version(self) -> str:
+        return self.config.version
+
+    def get_env(self, env_name: T.Union[str, BaseEnvEnum]) -> T_BASE_ENV:
+        """
+        Get the env object of this snapshot. It is a plain dict lookup for
+        the prebuilt env objects.
+        """
+        try:
+            return self.envs[env_name]
+        except KeyError:
+            return self.config.get_env(env_name)
+
+
+class ConfigHandle(T.Generic[T_BASE_CONFIG]):
+    """
+    A thread-safe holder of the current :class:`ConfigSnapshot`.
+
+    The read path (:attr:`snapshot`, :attr:`config`, :meth:`get_env`) is a
+    single attribute read, it doesn't take any lock. The write path
+    (:meth:`swap`, :meth:`refresh`) is serialized by a lock, the new snapshot
+    is fully built before it is installed.
+
+    :param config: the initial config object.
+    :param build_envs: if True (default), build the env objects of all
+        environments when a snapshot is created, so the readers never build
+        them. Set it to False if you have many environments but only use
+        a few of them, the env objects are then built on demand by
+        :meth:`BaseConfig.get_env`.
+    """
+
+    def __init__(
+        self,
+        config: T_BASE_CONFIG,
+        build_envs: bool = True,
+    ):
+        self.build_envs = build_envs
+        self._write_lock = threading.Lock()
+        self._snapshot: ConfigSnapshot[T_BASE_CONFIG] = self._new_snapshot(
+            config, generation=1
+        )
+
+    def _new_snapshot(
+        self,
+        config: T_BASE_CONFIG,
+        generation: int,
+    ) -> ConfigSnapshot[T_BASE_CONFIG]:
+        if self.build_envs:
+            envs = config.get_all_envs()
+        else:
+            envs = dict()
+        return ConfigSnapshot(
+            config=config,
+            envs=envs,
+            generation=generation,
+            loaded_at=time.time(),
+        )
+
+    @property
+    def snapshot(self) -> ConfigSnapshot[T_BASE_CONFIG]:
+        """
+        The current snapshot. If you need more than one value for one request,
+        get the snapshot once and read all values from it.
+        """
+        return self._snapshot
+
+    @property
+    def config(self) -> T_BASE_CONFIG:
+        """
+        The config object of the current snapshot.
+        """
+        return self._snapshot.config
+
+    def get_env(self, env_name: T.Union[str, BaseEnvEnum]) -> T_BASE_ENV:
+        """
+        Get the env object from the current snapshot.
+        """
+        return self._snapshot.get_env(env_name)
+
+    def swap(self, config: T_BASE_CONFIG) -> ConfigSnapshot[T_BASE_CONFIG]:
+        """
+        Install a new config object atomically.
+
+        :return: the previous snapshot.
+        """
+        with self._write_lock:
+            old_snapshot = self._snapshot
+            self._snapshot = self._new_snapshot(
+                config, generation=old_snapshot.generation + 1
+            )
+            return old_snapshot
+
+    def refresh(
+        self,
+        loader: T.Callable[[], T_BASE_CONFIG],
+    ) -> ConfigSnapshot[T_BASE_CONFIG]:
+        """
+        Load a new config object by calling the ``loader`` and install it
+        atomically. The readers keep using the current snapshot while it is
+        loading. Concurrent refreshes are serialized. If the loader raises,
+        the current snapshot is kept.
+
+        :param loader: a function that takes no argument and returns a new
+            config object, usually ``lambda: Config.read(...)``.
+
+        :return: the new snapshot.
+        """
+        with self._write_lock:
+            config = loader()
+            snapshot = self._new_snapshot(
+                config, generation=self._snapshot.generation + 1
+            )
+            self._snapshot = snapshot
+            return snapshot
@@ -1,15 +1,27 @@
 # -*- coding: utf-8 -*-
 
 import typing as T
-import copy
+import enum
+import heapq
+import bisect
 import string
+import zlib
+import marshal
+import threading
 import dataclasses
 from pathlib import Path
+from concurrent.futures import Executor
 
 # import optional dependencies
 try:
     import boto3
     import boto_session_manager
+    from botocore.exceptions import (
+        ClientError,
+        EndpointConnectionError,
+        ConnectTimeoutError,
+        ReadTimeoutError,
+    )
 except ImportError:  # pragma: no cover
     pass
 
@@ -17,10 +29,17 @@ try:
     import pysecret
     from s3pathlib import S3Path
 
-    from ...aws.ssm import deploy_parameter, delete_parameter
+    from ...aws.ssm import (
+        deploy_parameter,
+        delete_parameter,
+        read_parameter,
+        read_parameters,
+        read_parameters_by_path,
+    )
     from ...aws.s3 import (
         get_bucket_version_status,
         read_config,
+        read_config_version,
         deploy_config,
         delete_config,
         S3Object,
@@ -31,16 +50,116 @@ except ImportError:  # pragma: no cover
 from ... import exc
 from ...logger import logger
 from ...jsonutils import json_loads
-from ...compat import cached_property
+from ...aio import get_client, run_in_executor, gather_with_concurrency
+from ...cache import LRUCache, TTLCache, cached_property
+from ...disk_cache import DiskConfigCache
+from ...hedge import LatencyTracker, hedged_call
+from ...dataclass_utils import compile_from_dict, add_slots
+from ...frozen import FrozenDict, freeze, thaw, dedup, deep_sizeof, DedupStats
 from ...utils import sha256_of_config_data
 from ...vendor.strutils import slugify
 from ...vendor.better_enum import BetterStrEnum
-from ..hierarchy.api import apply_shared_value
-from ..merge_key_value.api import merge_key_value
+from ..hierarchy.api import SHARED, apply_shared_value
+from ..merge_key_value.api import copy_tree, merge_key_value
 
 
 ALL = "all"
 
+#: Process-wide memo of the ``_apply_shared`` result, keyed by the config class,
+#: its ``freeze_merged`` and ``dedup_merged`` options, and the sha256 digest
+#: of ``data`` and ``secret_data``. The value is a tuple of
+#: ``(applied_data, applied_secret_data, merged)`` frozen trees, each
+#: :class:`BaseConfig` object built from the same content gets its own copy.
+#: It is only used when :attr:`BaseConfig.use_apply_merge_memo` is True.
+apply_merge_memo = LRUCache(maxsize=32)
+
+#: Process-wide cache of the config objects read from the remote configuration
+#: store (AWS Parameter Store or S3). It is only used when ``cache_ttl`` is
+#: given to :meth:`BaseConfig.read`. The least recently used ones are evicted
+#: when it is full, use ``remote_read_cache.resize(...)`` to change the size.
+#: Use ``remote_read_cache.stats()`` to see the statistics, and
+#: ``remote_read_cache.clear()`` to drop everything.
+remote_read_cache = TTLCache(maxsize=128)
+
+#: Process-wide cache of the config objects of explicit versions read by
+#: :meth:`BaseConfig.read_version`. A written version never changes, so there
+#: is no TTL or revalidation, the least recently used ones are evicted when
+#: it is full, use ``pinned_read_cache.resize(...)`` to change the size.
+pinned_read_cache = LRUCache(maxsize=256)
+
+#: Process-wide recent latency of each ``(region, profile, location)`` replica
+#: given to :meth:`BaseConfig.read`, it decides the replica order and when to
+#: send the hedged request.
+replica_latency = LatencyTracker()
+
+T_REPLICA = T.Tuple["boto_session_manager.BotoSesManager", T.Optional[str]]
+
+_NOTHING = object()
+
+#: The AWS error codes of the throttled requests.
+_THROTTLING_ERROR_CODES = {
+    "Throttling",
+    "ThrottlingException",
+    "ThrottledException",
+    "RequestThrottled",
+    "RequestThrottledException",
+    "RequestLimitExceeded",
+    "TooManyRequestsException",
+    "ProvisionedThroughputExceededException",
+    "SlowDown",
+}
+
+
+def _is_remote_unavailable_error(e: BaseException) -> bool:
+    """
+    Is the error raised because the remote configuration store is throttled
+    or unreachable? Only these errors fall back to the last-known-good copy,
+    see the ``disk_cache`` argument of :meth:`BaseConfig.read`.
+    """
+    if isinstance(e, ConnectionError):
+        return True
+    if isinstance(e, (EndpointConnectionError, ConnectTimeoutError, ReadTimeoutError)):
+        return True
+    if isinstance(e, ClientError):
+        if e.response.get("Error", {}).get("Code") in _THROTTLING_ERROR_CODES:
+            return True
+        status_code = e.response.get("ResponseMetadata", {}).get("HTTPStatusCode")
+        return (status_code is not None) and (status_code >= 500)
+    return False
+
+
+def _get_bsm_identity(
+    bsm: "boto_session_manager.BotoSesManager",
+) -> T.Tuple[str, T.Optional[str], T.Optional[str]]:
+    """
+    Get the ``(aws region, aws profile name, aws access key id)`` of the boto
+    session manager. It is used in the process-wide cache keys instead of the
+    object itself, so the equivalent session managers share the cache entries,
+    and the cache doesn't keep the sessions alive.
+
+    It doesn't call any AWS API (the account id needs a STS call), so the
+    cache lookup never waits for the network.
+    """
+    credentials = bsm.boto_ses.get_credentials()
+    access_key = None if credentials is None else credentials.access_key
+    aws_region, profile_name, _ = _get_replica_key(bsm, None)
+    return (aws_region, profile_name, access_key)
+
+
+def _get_replica_key(
+    bsm: "boto_session_manager.BotoSesManager",
+    location: T.Optional[str],
+) -> T.Tuple[str, T.Optional[str], T.Optional[str]]:
+    """
+    Get the ``(aws region, aws profile name, location)`` key of a replica in
+    :data:`replica_latency`. It doesn't touch the network or the credentials,
+    so a slow or unreachable region never blocks the other replicas.
+    """
+    profile_name = bsm.profile_name
+    if not isinstance(profile_name, str):  # not given
+        profile_name = None
+    return (bsm.aws_region, profile_name, location)
+
 
 def validate_project_name(project_name: str):
     if project_name[0] not in string.ascii_lowercase:
@@ -69,6 +188,207 @@ class BaseEnvEnum(BetterStrEnum):
     """
 
 
+T_SHARED_ITEM = T.Tuple[int, str, T.Any]  # (position, path, value)
+T_SHARED_PARTITION = T.Tuple[T.List[T_SHARED_ITEM], T.Dict[str, T.List[T_SHARED_ITEM]]]
+
+
+def partition_shared(shared: dict) -> T_SHARED_PARTITION:
+    """
+    Bucket the items in the ``_shared`` section by the environment prefix
+    in one pass.
+
+    :return: a tuple of two items. The first item is the list of the shared
+        values for all environments (``*.xyz``), the second item is a dict
+        mapping env name to the list of its shared values (``${env_name}.xyz``).
+        Each shared value is a ``(position, path, value)`` tuple, the position
+        is used to keep the original order.
+    """
+    common: T.List[T_SHARED_ITEM] = list()
+    buckets: T.Dict[str, T.List[T_SHARED_ITEM]] = dict()
+    for position, (path, value) in enumerate(shared.items()):
+        if path.startswith("*"):
+            common.append((position, path, value))
+        else:
+            env_name, sep, _ = path.partition(".")
+            if sep:
+                try:
+                    buckets[env_name].append((position, path, value))
+                except KeyError:
+                    buckets[env_name] = [(position, path, value)]
+    return common, buckets
+
+
+def extract_env_data(
+    data: dict,
+    env_name: str,
+    partition: T.Optional[T_SHARED_PARTITION] = None,
+) -> dict:
+    """
+    Extract the data of one environment from the all environments data.
+    Only the shared values for all environments (``*.xyz``) and this environment
+    (``${env_name}.xyz``) are kept in the ``_shared`` section, in the
+    original order.
+
+    Example::
+
+        >>> extract_env_data(
+        ...     {
+        ...         "_shared": {"*.key1": "value1", "dev.key2": "value2", "prod.key2": "value2"},
+        ...         "dev": {"key3": "value3"},
+        ...         "prod": {"key3": "value3"},
+        ...     },
+        ...     "dev",
+        ... )
+        {"_shared": {"*.key1": "value1", "dev.key2": "value2"}, "dev": {"key3": "value3"}}
+
+    :param data: the all environments data.
+    :param env_name: the environment name.
+    :param partition: the :func:`partition_shared` result of ``data["_shared"]``,
+        if you extract many environments from the same data, you should
+        partition it once and pass it in.
+    """
+    if partition is None:
+        partition = partition_shared(data.get(SHARED, {}))
+    common, buckets = partition
+    env_items = buckets.get(env_name)
+    if env_items:
+        items = heapq.merge(common, env_items)
+    else:
+        items = common
+    return {
+        SHARED: {path: value for _, path, value in items},
+        env_name: data[env_name],
+    }
+
+
+T_PATH_INDEX = T.Tuple[T.Dict[str, T.Any], T.List[str]]  # (path to value, leaf paths)
+
+
+def build_path_index(data: T.Mapping[str, T.Any]) -> T_PATH_INDEX:
+    """
+    Flatten the nested config data into a dot-separated key path index in
+    one pass. Both the container nodes and the leaf values are indexed.
+    The list items are indexed by the position.
+
+    Example::
+
+        >>> values, leaf_paths = build_path_index(
+        ...     {"db": {"host": "db.com", "ports": [5432, 5433]}}
+        ... )
+        >>> values
+        {
+            "db": {"host": "db.com", "ports": [5432, 5433]},
+            "db.host": "db.com",
+            "db.ports": [5432, 5433],
+            "db.ports.0": 5432,
+            "db.ports.1": 5433,
+        }
+        >>> leaf_paths
+        ["db.host", "db.ports.0", "db.ports.1"]
+
+    :return: a tuple of two items. The first item is a dict mapping the key
+        path to the value. The second item is the sorted list of the leaf
+        value key paths, it is used for the prefix scan.
+    """
+    values: T.Dict[str, T.Any] = dict()
+    leaf_paths: T.List[str] = list()
+    stack: T.List[T.Tuple[str, T.Any]] = [("", data)]
+    while stack:
+        prefix, node = stack.pop()
+        if isinstance(node, T.Mapping):
+            items = node.items()
+        else:
+            items = enumerate(node)
+        for key, value in items:
+            path = f"{prefix}{key}"
+            values[path] = value
+            if isinstance(value, (T.Mapping, list, tuple)):
+                stack.append((f"{path}.", value))
+            else:
+                leaf_paths.append(path)
+    leaf_paths.sort()
+    return values, leaf_paths
+
+
+class EnvRegistry:
+    """
+    A registry-backed alternative to :class:`BaseEnvEnum`, for projects that
+    can not hard code the environment names. For example, one ephemeral
+    environment per pull request. Lookup and validation are O(1) dict
+    operations.
+
+    It has the same interface :class:`BaseConfig` uses from the enum class,
+    so you can pass it anywhere the ``EnvEnum`` is expected.
+
+    Example::
+
+        >>> env_registry = EnvRegistry(["dev", "pr123", "pr124"])
+        >>> env_registry.ensure_str("pr123")
+        'pr123'
+        >>> list(env_registry)
+        ['dev', 'pr123', 'pr124']
+        >>> config = Config.read(
+        ...     env_class=Env,
+        ...     env_enum_class=env_registry,
+        ...     ...
+        ... )
+
+    :param env_names: the environment names.
+    """
+
+    def __init__(self, env_names: T.Iterable[str] = ()):
+        self._env_names: T.Dict[str, str] = dict()
+        for env_name in env_names:
+            self.register(env_name)
+
+    @classmethod
+    def from_config_data(cls, data: dict) -> "EnvRegistry":
+        """
+        Create a registry from the environment names in the config data.
+        """
+        return cls(env_name for env_name in data if env_name != SHARED)
+
+    def register(self, env_name: str):
+        validate_env_name(env_name)
+        self._env_names[env_name] = env_name
+
+    def unregister(self, env_name: str):
+        self._env_names.pop(env_name, None)
+
+    def is_valid_value(self, value: T.Any) -> bool:
+        try:
+            return value in self._env_names
+        except TypeError:  # unhashable
+            return False
+
+    def ensure_str(self, value: T.Union[str, BaseEnvEnum]) -> str:
+        """
+        Ensure the value is a registered env name and return it as a string.
+        It also accepts the member of any str enum.
+        """
+        if isinstance(value, enum.Enum):
+            value = value.value
+        try:
+            return self._env_names[value]
+        except (KeyError, TypeError):
+            raise ValueError(f"Invalid {self.__class__.__name__}: {value!r}")
+
+    def get_values(self) -> T.List[str]:
+        return list(self._env_names)
+
+    def __iter__(self) -> T.Iterator[str]:
+        return iter(list(self._env_names))
+
+    def __len__(self) -> int:
+        return len(self._env_names)
+
+    def __contains__(self, value: T.Any) -> bool:
+        return self.is_valid_value(value)
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({list(self._env_names)!r})"
+
+
 def normalize_parameter_name(param_name: str) -> str:
     """
     AWS has limitation that the name cannot be prefixed with "aws" or "ssm",
@@ -84,36 +404,15 @@ def normalize_parameter_name(param_name: str) -> str:
         return param_name
 
 
-@dataclasses.dataclass
-class BaseEnv:
+class BaseEnvMixin:
     """
-    Per environment config data.
-
-    You should subclass this and define your own per-environment config data schema.
-
-    Example::
-
-        import typing as T
-        import dataclasses
-
-        @dataclasses.dataclass
-        class Env(BaseEnv):
-            username: T.Optional[str] = dataclasses.field(default=None)
-            password: T.Optional[str] = dataclasses.field(default=None)
-
-    :param project_name: a project name is a string that is full lowercase,
-        can include letters and digits, start with letter, _ or - delimiter only
-        cannot start or end with delimiter.
-        Valid examples are : my_project, my-project, my-1-project
-        Invalid examples are: my project, 1-my-project, -my-project, my-project-
-    :param env_name: an environment name is a string that is full lowercase,
-        can include letters and digits, start with letter, no delimiter.
-        Valid examples are: dev, test, prod, stage1, stage2
-        Invalid examples are: my_dev, 1dev
+    The common methods of :class:`BaseEnv` and :class:`BaseSlotsEnv`.
     """
 
-    project_name: T.Optional[str] = dataclasses.field(default=None)
-    env_name: T.Optional[str] = dataclasses.field(default=None)
+    __slots__ = ()
+
+    project_name: T.Optional[str]
+    env_name: T.Optional[str]
 
     def _validate(self):
         """
@@ -139,47 +438,53 @@ class BaseEnv:
         self.__user_post_init__()
 
     @classmethod
-    def from_dict(cls, data: dict):  # pragma: no cover
+    def from_dict(cls, data: dict):
         """
         Create an instance from a dict.
+
+        The default implementation is code-generated once per subclass and
+        cached, see :func:`~config_patterns.dataclass_utils.compile_from_dict`.
+        It converts the nested dataclass, and the list or dict of dataclass
+        based on the type hint, and raises ``TypeError`` if the data has any
+        unknown field. You can override it for custom logics. For example:
+
+        .. code-block:: python
+
+            @classmethod
+            def from_dict(cls, data: dict):
+                return cls(**data)
         """
-        raise NotImplementedError(
-            "Implement this method create an instance of "
-            "env config. For example:\n"
-            "@classmethod\n"
-            "def from_dict(cls, data: dict):\n"
-            "    return cls(**data)\n"
-        )
+        return compile_from_dict(cls)(data)
 
-    @cached_property
+    @property
     def project_name_slug(self) -> str:
         """
         Example: "my-project"
         """
         return slugify(self.project_name, delim="-")
 
-    @cached_property
+    @property
     def project_name_snake(self) -> str:
         """
         Example: "my_project"
         """
         return slugify(self.project_name, delim="_")
 
-    @cached_property
+    @property
     def prefix_name_slug(self) -> str:
         """
         Example: "my-project-dev"
         """
         return f"{self.project_name_slug}-{self.env_name}"
 
-    @cached_property
+    @property
     def prefix_name_snake(self) -> str:
         """
         Example: "my_project-dev"
         """
         return f"{self.project_name_snake}-{self.env_name}"
 
-    @cached_property
+    @property
     def parameter_name(self) -> str:
         """
         Return the per-environment AWS SSM Parameter name.
@@ -190,7 +495,105 @@ class BaseEnv:
         return normalize_parameter_name(self.prefix_name_snake)
 
 
-T_BASE_ENV = T.TypeVar("T_BASE_ENV", bound=BaseEnv)
+@dataclasses.dataclass
+class BaseEnv(BaseEnvMixin):
+    """
+    Per environment config data.
+
+    You should subclass this and define your own per-environment config data schema.
+
+    Example::
+
+        import typing as T
+        import dataclasses
+
+        @dataclasses.dataclass
+        class Env(BaseEnv):
+            username: T.Optional[str] = dataclasses.field(default=None)
+            password: T.Optional[str] = dataclasses.field(default=None)
+
+    :param project_name: a project name is a string that is full lowercase,
+        can include letters and digits, start with letter, _ or - delimiter only
+        cannot start or end with delimiter.
+        Valid examples are : my_project, my-project, my-1-project
+        Invalid examples are: my project, 1-my-project, -my-project, my-project-
+    :param env_name: an environment name is a string that is full lowercase,
+        can include letters and digits, start with letter, no delimiter.
+        Valid examples are: dev, test, prod, stage1, stage2
+        Invalid examples are: my_dev, 1dev
+    """
+
+    project_name: T.Optional[str] = dataclasses.field(default=None)
+    env_name: T.Optional[str] = dataclasses.field(default=None)
+
+    project_name_slug = cached_property(BaseEnvMixin.project_name_slug.fget)
+    project_name_snake = cached_property(BaseEnvMixin.project_name_snake.fget)
+    prefix_name_slug = cached_property(BaseEnvMixin.prefix_name_slug.fget)
+    prefix_name_snake = cached_property(BaseEnvMixin.prefix_name_snake.fget)
+    parameter_name = cached_property(BaseEnvMixin.parameter_name.fget)
+
+
+@add_slots
+@dataclasses.dataclass
+class BaseSlotsEnv(BaseEnvMixin):
+    """
+    The ``__slots__`` based alternative to :class:`BaseEnv`, the instance
+    doesn't have a ``__dict__``, it uses less memory and is faster to create.
+    The name properties like :attr:`~BaseEnvMixin.parameter_name` are computed
+    on every access instead of being cached.
+
+    Your subclass has to use ``__slots__`` as well:
+
+    Example::
+
+        import typing as T
+        import dataclasses
+        from config_patterns.dataclass_utils import add_slots
+
+        @add_slots # or @dataclasses.dataclass(slots=True) on Python3.10+
+        @dataclasses.dataclass
+        class Env(BaseSlotsEnv):
+            username: T.Optional[str] = dataclasses.field(default=None)
+            password: T.Optional[str] = dataclasses.field(default=None)
+
+    See :class:`BaseEnv` for the parameters.
+    """
+
+    project_name: T.Optional[str] = dataclasses.field(default=None)
+    env_name: T.Optional[str] = dataclasses.field(default=None)
+
+
+T_BASE_ENV = T.TypeVar("T_BASE_ENV", bound=BaseEnvMixin)
+
+
+class _LeanInput:
+    """
+    The ``data`` and ``secret_data`` attribute of the config class. Once the
+    inputs are released by the ``lean_memory`` mode, they are unpacked as new
+    mutable dict on every access, so the config object can still be compared
+    and converted by ``dataclasses.asdict``. Assign the attribute to change it.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __get__(self, instance: T.Any, owner: T.Optional[T.Type] = None) -> T.Any:
+        if instance is None:
+            return self
+        try:
+            return instance.__dict__[self.name]
+        except KeyError:
+            pass
+        packed = instance.__dict__.get("_packed_inputs")
+        if packed is None:
+            raise AttributeError(
+                f"{type(instance).__name__!r} object has no attribute {self.name!r}"
+            )
+        data, secret_data = marshal.loads(zlib.decompress(packed))
+        return data if self.name == "data" else secret_data
+
+    def __set__(self, instance: T.Any, value: T.Any):
+        instance.__dict__[self.name] = value
 
 
 @dataclasses.dataclass
@@ -206,7 +609,9 @@ class ConfigDeployment:
     - :meth:`~ConfigDeployment.delete_from_s3`
 
     :param parameter_name: the logic name of this deployment
-    :param parameter_data: the config data in python dict
+    :param parameter_data: the config data in python dict, it is None in the
+        results of :meth:`BaseConfig.deploy` and :meth:`BaseConfig.delete`,
+        because it is released right after the deployment
     :param project_name: project name
     :param env_name: environment name
     :param deployment: the deployment object, it can be either AWS Parameter or S3 Object
@@ -214,7 +619,7 @@ class ConfigDeployment:
     """
 
     parameter_name: str = dataclasses.field()
-    parameter_data: dict = dataclasses.field()
+    parameter_data: T.Optional[dict] = dataclasses.field()
     project_name: str = dataclasses.field()
     env_name: str = dataclasses.field()
     deployment: T.Optional[T.Union["pysecret.Parameter", S3Object]] = dataclasses.field(
@@ -395,19 +800,113 @@ class BaseConfig(T.Generic[T_BASE_ENV]):
         ...     },
         ...     ...
         ... }
+
+    Class level options, you can override them in your subclass:
+
+    - ``use_apply_merge_memo``: if True, reuse the applied and merged data
+        from the process-wide :data:`apply_merge_memo` when another config object
+        has been built from the same ``data`` and ``secret_data``. It is
+        useful when you create the config object from the same remote version
+        again and again. The memo keeps the data as immutable trees, each
+        config object still validates the input and gets its own copy.
+        Use ``apply_merge_memo.stats()`` to see the hit and miss
+        statistics, and ``apply_merge_memo.resize(...)`` to change the size.
+    - ``cache_env``: if True (default), :meth:`get_env` builds the :class:`BaseEnv`
+        object only once per environment and returns the same object afterwards.
+        Set it to False to build a new object on every call.
+    - ``lazy_merge``: if True, the shared value inheritance and the secret data
+        merging are done per environment, only when the environment is accessed
+        for the first time. Other environments are never processed. It is useful
+        when you have many environments but only use one of them at runtime.
+        The ``use_apply_merge_memo`` option is ignored in lazy mode. If the
+        ``EnvEnum`` is an :class:`EnvRegistry`, lazy mode is always used.
+    - ``freeze_merged``: if True, the merged data of each environment is stored
+        as an immutable :class:`~config_patterns.frozen.FrozenDict` tree.
+        :meth:`get_env_data` returns the same tree to every caller without
+        copying, and :meth:`get_env` builds the env object from a cached
+        fast thaw instead of ``copy.deepcopy``.
+    - ``dedup_merged``: if True, run :meth:`dedup` after the data is merged,
+        so the identical subtrees inherited from ``_shared`` are stored once.
+        It implies ``freeze_merged``, because the deduplicated trees are frozen.
+        It is not used in lazy mode, you can call :meth:`dedup` manually after
+        the environments you need are merged.
+    - ``lean_memory``: if True, the intermediate ``_applied_data`` and
+        ``_applied_secret_data`` trees are released (set to None) once the
+        merging is done. In eager mode, the original ``data`` and ``secret_data``
+        are also kept in a zlib compressed serialized form, they are
+        decompressed on every attribute access, which only happens on
+        deployment. The ``config.data`` and ``config.secret_data`` return a
+        new copy on every access in this case, assign the attribute to change
+        it. In lazy mode,
+        the original inputs are kept as it is because they are needed to
+        merge the environments on demand.
+    - ``hedge_percentile``: only used when ``replicas`` is given to :meth:`read`.
+        If the replica has not answered within this percentile (0.0 ~ 1.0) of
+        its recent latency, a hedged request is sent to the next replica.
+    - ``hedge_delay``: the seconds to wait before sending the hedged request,
+        when there are not enough latency samples of the replica yet.
     """
 
+    use_apply_merge_memo: T.ClassVar[bool] = False
+    cache_env: T.ClassVar[bool] = True
+    lazy_merge: T.ClassVar[bool] = False
+    freeze_merged: T.ClassVar[bool] = False
+    dedup_merged: T.ClassVar[bool] = False
+    lean_memory: T.ClassVar[bool] = False
+    hedge_percentile: T.ClassVar[float] = 0.95
+    hedge_delay: T.ClassVar[float] = 0.1
+
     data: dict = dataclasses.field()
     secret_data: dict = dataclasses.field()
 
     Env: T.Type[T_BASE_ENV] = dataclasses.field()
-    EnvEnum: T.Type[BaseEnvEnum] = dataclasses.field()
+    EnvEnum: T.Union[T.Type[BaseEnvEnum], EnvRegistry] = dataclasses.field()
 
     version: str = dataclasses.field()
 
-    _applied_data: dict = dataclasses.field(init=False)
-    _applied_secret_data: dict = dataclasses.field(init=False)
-    _merged: dict = dataclasses.field(init=False)
+    # the intermediate trees are derived from the inputs, they are not
+    # compared because the ``lean_memory`` mode releases them
+    _applied_data: T.Optional[dict] = dataclasses.field(init=False, compare=False)
+    _applied_secret_data: T.Optional[dict] = dataclasses.field(
+        init=False,
+        compare=False,
+    )
+    _merged: dict = dataclasses.field(init=False, compare=False)
+    _env_cache: T.Dict[str, T_BASE_ENV] = dataclasses.field(
+        init=False,
+        default_factory=dict,
+        repr=False,
+        compare=False,
+    )
+    _path_index: T.Dict[str, T_PATH_INDEX] = dataclasses.field(
+        init=False,
+        default_factory=dict,
+        repr=False,
+        compare=False,
+    )
+
+    # the locks are not dataclass fields, so the config object can still be
+    # copied, pickled and converted by ``dataclasses.asdict``
+    @cached_property
+    def _env_cache_lock(self) -> threading.Lock:
+        return threading.Lock()
+
+    @cached_property
+    def _merge_lock(self) -> threading.Lock:
+        return threading.Lock()
+
+    def __getstate__(self) -> dict:
+        # the locks are created again on demand, the env object cache and
+        # the key path index are rebuilt on the first access
+        state = self.__dict__.copy()
+        state.pop("_env_cache_lock", None)
+        state.pop("_merge_lock", None)
+        state["_env_cache"] = dict()
+        state["_path_index"] = dict()
+        return state
+
+    def __setstate__(self, state: dict):
+        self.__dict__.update(state)
 
     def _validate(self):
         """
@@ -419,11 +918,107 @@ class BaseConfig(T.Generic[T_BASE_ENV]):
                 validate_env_name(env_name)
 
     def _apply_shared(self):
-        self._applied_data = copy.deepcopy(self.data)
-        self._applied_secret_data = copy.deepcopy(self.secret_data)
+        self._applied_data = copy_tree(self.data)
+        self._applied_secret_data = copy_tree(self.secret_data)
         apply_shared_value(self._applied_data)
         apply_shared_value(self._applied_secret_data)
         self._merged = merge_key_value(self._applied_data, self._applied_secret_data)
+        if self.freeze_merged:
+            self._merged = {
+                env_name: freeze(env_data)
+                for env_name, env_data in self._merged.items()
+            }
+        if self.dedup_merged:
+            self._dedup()
+
+    def _apply_shared_for_env(self, env_name: str):
+        """
+        The lazy mode version of :meth:`_apply_shared`, it only processes
+        one environment.
+        """
+        if (env_name not in self.data) and (env_name not in self.secret_data):
+            raise KeyError(env_name)
+        applied_data = dict()
+        applied_secret_data = dict()
+        if env_name in self.data:
+            applied_data = copy_tree(
+                extract_env_data(self.data, env_name, self._data_partition)
+            )
+            apply_shared_value(applied_data)
+        if env_name in self.secret_data:
+            applied_secret_data = copy_tree(
+                extract_env_data(
+                    self.secret_data, env_name, self._secret_data_partition
+                )
+            )
+            apply_shared_value(applied_secret_data)
+        merged = merge_key_value(applied_data, applied_secret_data)
+        if self.lean_memory is False:
+            if env_name in applied_data:
+                self._applied_data[env_name] = applied_data[env_name]
+            if env_name in applied_secret_data:
+                self._applied_secret_data[env_name] = applied_secret_data[env_name]
+        if self.freeze_merged:
+            self._merged[env_name] = freeze(merged[env_name])
+        else:
+            self._merged[env_name] = merged[env_name]
+
+    def _dedup(self):
+        memo = dict()
+        # the top level dicts are written by the lazy merge,
+        # they have to stay as different objects
+        if self._applied_data is not None:
+            self._applied_data = {
+                env_name: dedup(env_data, memo)
+                for env_name, env_data in self._applied_data.items()
+            }
+        if self._applied_secret_data is not None:
+            self._applied_secret_data = {
+                env_name: dedup(env_data, memo)
+                for env_name, env_data in self._applied_secret_data.items()
+            }
+        self._merged = {
+            env_name: dedup(env_data, memo)
+            for env_name, env_data in self._merged.items()
+        }
+
+    def dedup(self) -> DedupStats:
+        """
+        Deduplicate the applied and merged data of all merged environments.
+        The identical subtrees (for example, the values inherited from
+        ``_shared``) become one shared object, and the keys and string
+        values are interned, so N environments share one copy of each common
+        value. See :func:`config_patterns.frozen.dedup`.
+
+        The applied and merged data of each environment become immutable
+        :class:`~config_patterns.frozen.FrozenDict` trees, as if
+        ``freeze_merged`` is True.
+
+        :return: the memory usage before and after, use
+            ``DedupStats.bytes_saved`` to see how many bytes are saved.
+        """
+        with self._merge_lock:
+            trees = (self._applied_data, self._applied_secret_data, self._merged)
+            bytes_before = deep_sizeof(trees)
+            self._dedup()
+            trees = (self._applied_data, self._applied_secret_data, self._merged)
+            bytes_after = deep_sizeof(trees)
+        return DedupStats(bytes_before=bytes_before, bytes_after=bytes_after)
+
+    def _get_merged(self, env_name: str) -> T.Union[dict, FrozenDict]:
+        """
+        Get the merged data of one environment. In lazy mode, process
+        the environment on the first access.
+        """
+        try:
+            return self._merged[env_name]
+        except KeyError:
+            if self._is_lazy is False:
+                raise
+        with self._merge_lock:
+            if env_name not in self._merged:
+                self._apply_shared_for_env(env_name)
+            return self._merged[env_name]
 
     def __user_post_init__(self):
         """
@@ -435,10 +1030,107 @@ class BaseConfig(T.Generic[T_BASE_ENV]):
         User should not overwrite this method. You can use __user_post_init__
         for any post init logics.
         """
-        self._validate()
-        self._apply_shared()
+        if self._is_lazy:
+            self._validate()
+            self._applied_data = dict()
+            self._applied_secret_data = dict()
+            self._merged = dict()
+        elif self.use_apply_merge_memo:
+            # the stored trees depend on the class options
+            memo_key = (
+                type(self),
+                self.freeze_merged,
+                self.dedup_merged,
+                sha256_of_config_data(
+                    {"data": self.data, "secret_data": self.secret_data}
+                ),
+            )
+            self._validate()
+            memo_value = apply_merge_memo.get(memo_key)
+            if memo_value is None:
+                self._apply_shared()
+                # the memo value is shared by all config objects built from
+                # the same content, so it is stored as immutable trees
+                apply_merge_memo.put(
+                    memo_key,
+                    (
+                        freeze(self._applied_data),
+                        freeze(self._applied_secret_data),
+                        freeze(self._merged),
+                    ),
+                )
+            else:
+                self._load_memo_value(memo_value)
+        else:
+            self._validate()
+            self._apply_shared()
+        if self.lean_memory:
+            self._release_intermediate()
         self.__user_post_init__()
 
+    def _load_memo_value(self, memo_value: T.Tuple[FrozenDict, FrozenDict, FrozenDict]):
+        """
+        Restore the applied and merged data from the :data:`apply_merge_memo`
+        value, each config object gets its own mutable copy.
+        """
+        applied_data, applied_secret_data, merged = memo_value
+        self._applied_data = applied_data.thaw()
+        self._applied_secret_data = applied_secret_data.thaw()
+        if self.freeze_merged:
+            # the per environment trees are immutable, only copy the top level
+            self._merged = dict(merged)
+        else:
+            self._merged = merged.thaw()
+        if self.dedup_merged:
+            self._dedup()
+
+    def _release_intermediate(self):
+        """
+        Release the intermediate trees for the ``lean_memory`` mode.
+        """
+        self._applied_data = None
+        self._applied_secret_data = None
+        if self._is_lazy:
+            return
+        _ = self.project_name  # cache it before releasing the inputs
+        try:
+            packed = zlib.compress(marshal.dumps((self.data, self.secret_data)))
+        except ValueError:  # not JSON-like data, keep it as it is
+            return
+        self.__dict__["_packed_inputs"] = packed
+        del self.__dict__["data"]
+        del self.__dict__["secret_data"]
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # always installed, so the ``lean_memory`` option can be turned on
+        # after the class is created
+        for name in ("data", "secret_data"):
+            if not isinstance(cls.__dict__.get(name), _LeanInput):
+                setattr(cls, name, _LeanInput(name))
+
+    def _get_inputs(self) -> T.Tuple[dict, dict]:
+        """
+        Get the mutable ``data`` and ``secret_data``, the inputs released by
+        the ``lean_memory`` mode are unpacked.
+        """
+        packed = self.__dict__.get("_packed_inputs")
+        if packed is None:
+            return self.data, self.secret_data
+        return marshal.loads(zlib.decompress(packed))
+
+    @property
+    def _is_lazy(self) -> bool:
+        return self.lazy_merge or isinstance(self.EnvEnum, EnvRegistry)
+
+    @cached_property
+    def _data_partition(self) -> T_SHARED_PARTITION:
+        return partition_shared(self.data.get(SHARED, {}))
+
+    @cached_property
+    def _secret_data_partition(self) -> T_SHARED_PARTITION:
+        return partition_shared(self.secret_data.get(SHARED, {}))
+
     @cached_property
     def project_name(self) -> str:
         return self.data["_shared"]["*.project_name"]
@@ -461,11 +1153,33 @@ class BaseConfig(T.Generic[T_BASE_ENV]):
         """
         return normalize_parameter_name(self.project_name_snake)
 
-    # don't put type hint for return value, it should return a
-    # user defined subclass, which is impossible to predict.
-    def get_env(self, env_name: T.Union[str, BaseEnvEnum]) -> T_BASE_ENV:
-        env_name = self.EnvEnum.ensure_str(env_name)
-        data = copy.deepcopy(self._merged[env_name])
+    def _iter_env_names(self) -> T.Iterable[str]:
+        """
+        Iterate all environment names defined in the ``EnvEnum``.
+        """
+        if isinstance(self.EnvEnum, EnvRegistry):
+            return iter(self.EnvEnum)
+        return self._iter_env_enum_names()
+
+    def _iter_env_enum_names(self) -> T.Iterable[str]:
+        for env_name in self.EnvEnum:
+            yield self.EnvEnum.ensure_str(env_name)
+
+    def _new_env(self, env_name: str) -> T_BASE_ENV:
+        """
+        Build a new :class:`BaseEnv` object from the merged data.
+        """
+        merged = self._get_merged(env_name)
+        if isinstance(merged, FrozenDict):
+            data = merged.thaw()
+        else:
+            data = copy_tree(merged)
+        return self._build_env(env_name, data)
+
+    def _build_env(self, env_name: str, data: dict) -> T_BASE_ENV:
+        """
+        Build a :class:`BaseEnv` object from a private copy of the merged data.
+        """
         data["env_name"] = env_name
         try:
             return self.Env.from_dict(data)
@@ -478,38 +1192,243 @@ class BaseConfig(T.Generic[T_BASE_ENV]):
             else:  # pragma: no cover
                 raise e
 
-    @classmethod
-    def get_current_env(cls) -> str:  # pragma: no cover
+    # don't put type hint for return value, it should return a
+    # user defined subclass, which is impossible to predict.
+    def get_env(
+        self,
+        env_name: T.Union[str, BaseEnvEnum],
+        private: bool = False,
+    ) -> T_BASE_ENV:
         """
-        An abstract method that can figure out what is the environment this config
-        should deal with. For example, you can define the git feature branch
-        will become the dev env; the master branch will become the int env;
-        the release branch will become prod env;
-
-        Example::
+        Get the per environment config object.
 
-            class Config(BaseConfig):
-                ...
+        By default, the env object is cached per environment, and the same object
+        is returned to all callers (and threads), so you should treat it as
+        read-only. If you need a private mutable copy, use ``private=True``.
 
-                @classmethod
-                def get_current_env(cls) -> str:
-                    if "CI" in os.environ:
-                        return EnvEnum.test.value
-                    elif "AWS_LAMBDA_FUNCTION_NAME" in os.environ:
-                        return EnvEnum.prod.value
-                    else:
-                        return EnvEnum.dev.value
+        :param env_name: the environment name or the enum member.
+        :param private: if True, always build a new env object that is not
+            shared with anyone else, and don't put it into the cache.
         """
-        raise NotImplementedError(
-            "You have to implement this method to detect what environment "
-            "you should use. It should be a class method that take no argument "
-            "and returns a string. Usually you could use environment variable to detect "
-            "whether you are on your local laptop, CI runtime, remote machine. "
-            "Also you can use subprocess to call git CLI to check your current branch."
-        )
+        # fast path, the cache only has validated env name
+        if type(env_name) is str:
+            env = self._env_cache.get(env_name)
+            if (env is not None) and (private is False):
+                return env
+        env_name = self.EnvEnum.ensure_str(env_name)
+        if private or (self.cache_env is False):
+            return self._new_env(env_name)
+        with self._env_cache_lock:
+            env = self._env_cache.get(env_name)
+            if env is None:
+                env = self._new_env(env_name)
+                self._env_cache[env_name] = env
+            return env
+
+    def get_all_envs(self, private: bool = False) -> T.Dict[str, T_BASE_ENV]:
+        """
+        Get the env objects of all environments defined in the ``EnvEnum``.
+        It is much faster than calling :meth:`get_env` in a loop, because
+        the merged data of all environments is copied in one pass, and the
+        common values derived from ``_shared`` (e.g. same strings) are shared
+        by all env objects.
 
-    # don't put type hint for return value, it should return a
-    # user defined subclass, which is impossible to predict.
+        :param private: if True, always build new env objects that are not
+            shared with anyone else, and don't put them into the cache.
+
+        :return: a dict mapping env name to the env object.
+        """
+        env_names = list(self._iter_env_names())
+        use_cache = (private is False) and self.cache_env
+        if use_cache:
+            envs = {
+                env_name: self._env_cache[env_name]
+                for env_name in env_names
+                if env_name in self._env_cache
+            }
+            missing = [env_name for env_name in env_names if env_name not in envs]
+        else:
+            envs = dict()
+            missing = env_names
+        if len(missing) == 0:
+            return envs
+
+        data_mapping = dict()
+        merged = dict()
+        for env_name in missing:
+            env_data = self._get_merged(env_name)
+            if isinstance(env_data, FrozenDict):
+                data_mapping[env_name] = env_data.thaw()
+            else:
+                merged[env_name] = env_data
+        if len(merged):
+            # marshal round trip is a fast one pass deep copy for JSON data,
+            # it also shares the identical strings
+            try:
+                data_mapping.update(marshal.loads(marshal.dumps(merged)))
+            except ValueError:  # pragma: no cover
+                data_mapping.update(copy_tree(merged))
+
+        if use_cache:
+            with self._env_cache_lock:
+                for env_name, data in data_mapping.items():
+                    env = self._env_cache.get(env_name)
+                    if env is None:
+                        env = self._build_env(env_name, data)
+                        self._env_cache[env_name] = env
+                    envs[env_name] = env
+        else:
+            for env_name, data in data_mapping.items():
+                envs[env_name] = self._build_env(env_name, data)
+        return {env_name: envs[env_name] for env_name in env_names}
+
+    def get_env_data(self, env_name: T.Union[str, BaseEnvEnum]) -> FrozenDict:
+        """
+        Get the merged config data of one environment as an immutable
+        :class:`~config_patterns.frozen.FrozenDict` tree. Use
+        :func:`config_patterns.frozen.thaw` or ``FrozenDict.thaw()`` to get
+        a mutable copy.
+
+        If ``freeze_merged`` is True, it returns the same tree to every caller
+        without any copy. Otherwise, it freezes the merged data on every call.
+        """
+        env_name = self.EnvEnum.ensure_str(env_name)
+        return freeze(self._get_merged(env_name))
+
+    def _get_path_index(self, env_name: T.Union[str, BaseEnvEnum]) -> T_PATH_INDEX:
+        """
+        Get the key path index of one environment, build it on the first access.
+        """
+        # fast path, the index only has validated env name
+        if type(env_name) is str:
+            path_index = self._path_index.get(env_name)
+            if path_index is not None:
+                return path_index
+        env_name = self.EnvEnum.ensure_str(env_name)
+        with self._env_cache_lock:
+            path_index = self._path_index.get(env_name)
+            if path_index is None:
+                env_data = dict(self._get_merged(env_name))
+                env_data["env_name"] = env_name
+                path_index = build_path_index(env_data)
+                self._path_index[env_name] = path_index
+            return path_index
+
+    def get_value(
+        self,
+        env_name: T.Union[str, BaseEnvEnum],
+        path: str,
+        default: T.Any = _NOTHING,
+    ) -> T.Any:
+        """
+        Get one value from the merged config data of one environment by the
+        dot-separated key path, without building the env object. The list
+        item is accessed by the position. For example ``"databases.0.host"``.
+
+        The key path index of the environment is built on the first call,
+        then each lookup is a single dict lookup.
+
+        Example::
+
+            >>> config.get_value("dev", "servers.blue.domain")
+            "blue.dev.my-project.com"
+
+        :param env_name: the environment name or the enum member.
+        :param path: the dot-separated key path.
+        :param default: the value to return if the key path doesn't exist.
+            If not given, raise ``KeyError``.
+
+        :return: the value. If the value is a dict or list, a new mutable copy
+            is returned.
+        """
+        values, _ = self._get_path_index(env_name)
+        try:
+            value = values[path]
+        except KeyError:
+            if default is _NOTHING:
+                raise KeyError(path)
+            return default
+        if isinstance(value, (dict, list)):
+            return copy_tree(value)
+        if isinstance(value, (FrozenDict, tuple)):
+            return thaw(value)
+        return value
+
+    def iter_values(
+        self,
+        env_name: T.Union[str, BaseEnvEnum],
+        prefix: str = "",
+    ) -> T.Iterable[T.Tuple[str, T.Any]]:
+        """
+        Iterate the ``(key path, value)`` pairs of all the leaf values whose
+        key path starts with the prefix, in the key path order.
+        It uses the same key path index as :meth:`get_value`.
+
+        Example::
+
+            >>> list(config.iter_values("dev", "servers.blue."))
+            [("servers.blue.domain", "blue.dev.my-project.com"), ...]
+
+        :param env_name: the environment name or the enum member.
+        :param prefix: the key path prefix, for example ``"servers."``.
+            If empty, iterate all leaf values.
+        """
+        values, leaf_paths = self._get_path_index(env_name)
+        for ith in range(bisect.bisect_left(leaf_paths, prefix), len(leaf_paths)):
+            path = leaf_paths[ith]
+            if not path.startswith(prefix):
+                break
+            yield path, values[path]
+
+    def clear_env_cache(self, env_name: T.Optional[T.Union[str, BaseEnvEnum]] = None):
+        """
+        Invalidate the env object cache used by :meth:`get_env`, and
+        the key path index used by :meth:`get_value`.
+
+        :param env_name: only invalidate this environment, if None,
+            invalidate all environments.
+        """
+        with self._env_cache_lock:
+            if env_name is None:
+                self._env_cache.clear()
+                self._path_index.clear()
+            else:
+                env_name = self.EnvEnum.ensure_str(env_name)
+                self._env_cache.pop(env_name, None)
+                self._path_index.pop(env_name, None)
+
+    @classmethod
+    def get_current_env(cls) -> str:  # pragma: no cover
+        """
+        An abstract method that can figure out what is the environment this config
+        should deal with. For example, you can define the git feature branch
+        will become the dev env; the master branch will become the int env;
+        the release branch will become prod env;
+
+        Example::
+
+            class Config(BaseConfig):
+                ...
+
+                @classmethod
+                def get_current_env(cls) -> str:
+                    if "CI" in os.environ:
+                        return EnvEnum.test.value
+                    elif "AWS_LAMBDA_FUNCTION_NAME" in os.environ:
+                        return EnvEnum.prod.value
+                    else:
+                        return EnvEnum.dev.value
+        """
+        raise NotImplementedError(
+            "You have to implement this method to detect what environment "
+            "you should use. It should be a class method that take no argument "
+            "and returns a string. Usually you could use environment variable to detect "
+            "whether you are on your local laptop, CI runtime, remote machine. "
+            "Also you can use subprocess to call git CLI to check your current branch."
+        )
+
+    # don't put type hint for return value, it should return a
+    # user defined subclass, which is impossible to predict.
     @cached_property
     def env(self) -> T_BASE_ENV:  # pragma: no cover
         """
@@ -517,17 +1436,47 @@ class BaseConfig(T.Generic[T_BASE_ENV]):
         """
         return self.get_env(env_name=self.get_current_env())
 
+    @classmethod
+    def _new(
+        cls,
+        data: dict,
+        secret_data: dict,
+        env_class: T.Type[T_BASE_ENV],
+        env_enum_class: T.Optional[T.Union[T.Type[BaseEnvEnum], EnvRegistry]],
+        version: str,
+    ):
+        """
+        Create the config object, if ``env_enum_class`` is None, create
+        a :class:`EnvRegistry` from the environment names in the data.
+        """
+        if env_enum_class is None:
+            env_enum_class = EnvRegistry.from_config_data(data)
+        return cls(
+            data=data,
+            secret_data=secret_data,
+            Env=env_class,
+            EnvEnum=env_enum_class,
+            version=version,
+        )
+
     @classmethod
     def read(
         cls,
-        env_class: T.Type[BaseEnv],
-        env_enum_class: T.Type[BaseEnvEnum],
+        env_class: T.Type[T_BASE_ENV],
+        env_enum_class: T.Optional[
+            T.Union[T.Type[BaseEnvEnum], EnvRegistry]
+        ] = None,
         path_config: T.Optional[str] = None,
         path_secret_config: T.Optional[str] = None,
         bsm: T.Optional["boto_session_manager.BotoSesManager"] = None,
         parameter_name: T.Optional[str] = None,
         parameter_with_encryption: T.Optional[bool] = None,
         s3folder_config: T.Optional[str] = None,
+        cache_ttl: T.Optional[float] = None,
+        cache_max_staleness: T.Optional[float] = None,
+        disk_cache: T.Optional[DiskConfigCache] = None,
+        env_name: T.Optional[T.Union[str, BaseEnvEnum]] = None,
+        replicas: T.Optional[T.Sequence[T_REPLICA]] = None,
     ):
         """
         Create and initialize the config object from configuration store.
@@ -538,60 +1487,187 @@ class BaseConfig(T.Generic[T_BASE_ENV]):
         3. read from AWS S3.
 
         :param env_class: the per environment config dataclass object.
-        :param env_enum_class: the environment enumeration class.
+        :param env_enum_class: the environment enumeration class, or an
+            :class:`EnvRegistry` object. If None, create a :class:`EnvRegistry`
+            from the environment names in the config data.
         :param path_config: local file path to the non-sensitive config file.
         :param path_secret_config: local file path to the sensitive config file.
         :param parameter_name: the AWS Parameter name.
         :param parameter_with_encryption: is AWS Parameter turned on encryption?
         :param s3folder_config: the s3 folder uri where you store the config file.
+        :param cache_ttl: only for reading from AWS Parameter Store or S3.
+            If given, the config object is cached in the process-wide
+            :data:`remote_read_cache` for this many seconds, the same object
+            is returned to all callers with the same arguments, so you should
+            treat it as read-only.
+        :param cache_max_staleness: only used with ``cache_ttl``. When the
+            cached config object is older than ``cache_ttl`` but younger than
+            this, it is returned immediately and a new one is read in
+            background (stale-while-revalidate). The config object older than
+            this is never returned. If None, no stale config object is returned.
+        :param disk_cache: only for reading from AWS Parameter Store or S3.
+            If given, every successful read is saved to this
+            :class:`~config_patterns.disk_cache.DiskConfigCache` as the
+            last-known-good copy. When AWS Parameter Store or S3 is throttled
+            (a throttling or 5xx error) or unreachable (a connection or
+            timeout error), the last-known-good copy is returned instead of
+            raising the error, other errors are raised as usual. With
+            ``cache_ttl``, a new process also starts from the disk copy
+            immediately, it is treated as loaded when it was saved, so it is
+            revalidated in background if it is younger than
+            ``cache_max_staleness``. The copy without its secret data is never
+            used for the cold start, and it is only used as the fallback if
+            the cache is created with ``allow_secret_omitted=True``.
+        :param env_name: if given, only read this environment. For AWS
+            Parameter Store or S3, it reads the per environment parameter
+            ``${parameter_name}-${env_name}`` created by :meth:`deploy`
+            instead of the all-environment one, so only the data of this
+            environment is transferred, decrypted and parsed. The returned
+            config object only has this environment, :meth:`get_env` works
+            as usual for it.
+        :param replicas: only for reading from AWS Parameter Store or S3
+            replicated to several regions, an ordered list of
+            ``(bsm, location)``, use it instead of ``bsm`` and
+            ``s3folder_config``. For AWS Parameter Store, the location is
+            the parameter name in that region, None means ``parameter_name``.
+            For S3, the location is the ``s3folder_config`` of the replica
+            bucket. The replicas are read with hedged requests, see
+            :func:`config_patterns.hedge.hedged_call`, the recent latency
+            of each replica is kept in :data:`replica_latency` to adjust
+            the order. See the ``hedge_percentile`` and ``hedge_delay``
+            class options.
 
         :return:
         """
-        if (path_config is not None) and (path_secret_config is not None):
-            data = json_loads(Path(path_config).read_text())
-            secret_data = json_loads(Path(path_secret_config).read_text())
-            return cls(
+        if replicas is not None:
+            replicas = tuple(replicas)
+            if len(replicas) == 0:
+                raise ValueError("replicas cannot be empty!")
+            if (bsm is not None) or (s3folder_config is not None):
+                raise ValueError(
+                    "You cannot set ``bsm`` or ``s3folder_config`` "
+                    "together with ``replicas``!"
+                )
+        if env_name is not None:
+            if env_enum_class is not None:
+                env_name = env_enum_class.ensure_str(env_name)
+            elif isinstance(env_name, BaseEnvEnum):
+                env_name = env_name.value
+            validate_env_name(env_name)
+            config_env_enum_class = EnvRegistry([env_name])
+        else:
+            config_env_enum_class = env_enum_class
+
+        def new(data: dict, secret_data: dict, version: str):
+            if env_name is not None:
+                if env_name not in data:
+                    raise ValueError(f"env {env_name!r} is not in the config data!")
+                data = extract_env_data(data, env_name)
+                if env_name not in secret_data:
+                    secret_data = dict(secret_data)
+                    secret_data[env_name] = {}
+                secret_data = extract_env_data(secret_data, env_name)
+            return cls._new(
                 data=data,
                 secret_data=secret_data,
-                Env=env_class,
-                EnvEnum=env_enum_class,
-                version="local",
+                env_class=env_class,
+                env_enum_class=config_env_enum_class,
+                version=version,
             )
+
+        if (path_config is not None) and (path_secret_config is not None):
+            data = json_loads(Path(path_config).read_text())
+            secret_data = json_loads(Path(path_secret_config).read_text())
+            return new(data, secret_data, version="local")
         elif (parameter_name is not None) and (
-            parameter_with_encryption is not None
-        ):  # pragma: no cover
-            parameter = pysecret.Parameter.load(
-                ssm_client=bsm.ssm_client,
-                name=parameter_name,
-                with_decryption=parameter_with_encryption,
-            )
-            if parameter is None:
-                raise exc.ParameterNotExists(
-                    f"SSM Parameter {parameter_name!r} not exist!"
+            (parameter_with_encryption is not None)
+            or (s3folder_config is not None)
+            or (replicas is not None)
+        ):
+            if env_name is not None:
+                parameter_name = f"{parameter_name}-{env_name}"
+
+            if parameter_with_encryption is not None:
+                disk_cache_key = f"ssm:{parameter_name}"
+            elif replicas is not None:
+                disk_cache_key = f"s3:{replicas[0][1]}:{parameter_name}"
+            else:
+                disk_cache_key = f"s3:{s3folder_config}:{parameter_name}"
+
+            def loader():
+                if replicas is None:
+                    data, secret_data, version = cls._read_remote(
+                        bsm=bsm,
+                        parameter_name=parameter_name,
+                        parameter_with_encryption=parameter_with_encryption,
+                        s3folder_config=s3folder_config,
+                    )
+                else:
+                    data, secret_data, version = cls._read_replicas(
+                        replicas=replicas,
+                        parameter_name=parameter_name,
+                        parameter_with_encryption=parameter_with_encryption,
+                    )
+                if disk_cache is not None:
+                    try:
+                        disk_cache.save(disk_cache_key, data, secret_data, version)
+                    except OSError as e:  # pragma: no cover
+                        logger.info(f"failed to save config to disk cache: {e!r}")
+                return new(data, secret_data, version)
+
+            try:
+                if cache_ttl is None:
+                    return loader()
+                cache_key = (
+                    cls,
+                    env_class,
+                    env_enum_class,
+                    (
+                        _get_bsm_identity(bsm)
+                        if replicas is None
+                        else tuple(
+                            (_get_bsm_identity(bsm), location)
+                            for bsm, location in replicas
+                        )
+                    ),
+                    parameter_name,
+                    parameter_with_encryption,
+                    s3folder_config,
                 )
-            parameter_data = parameter.json_dict
-            return cls(
-                data=parameter_data["data"],
-                secret_data=parameter_data["secret_data"],
-                Env=env_class,
-                EnvEnum=env_enum_class,
-                version=str(parameter.Version),
-            )
-        elif (parameter_name is not None) and (
-            s3folder_config is not None
-        ):  # pragma: no cover
-            config_data, config_version = read_config(
-                bsm=bsm,
-                s3folder_config=s3folder_config,
-                parameter_name=parameter_name,
-            )
-            return cls(
-                data=config_data["data"],
-                secret_data=config_data["secret_data"],
-                Env=env_class,
-                EnvEnum=env_enum_class,
-                version=config_version,
-            )
+                # cold start, seed the in-memory cache with the disk copy
+                if (disk_cache is not None) and (cache_key not in remote_read_cache):
+                    entry = disk_cache.load(disk_cache_key)
+                    if (entry is not None) and (entry.secret_omitted is False):
+                        remote_read_cache.put(
+                            cache_key,
+                            new(entry.data, entry.secret_data, entry.version),
+                            age=entry.age,
+                        )
+                return remote_read_cache.get(
+                    cache_key,
+                    loader,
+                    ttl=cache_ttl,
+                    max_staleness=cache_max_staleness,
+                )
+            except Exception as e:
+                if (disk_cache is None) or (_is_remote_unavailable_error(e) is False):
+                    raise
+                entry = disk_cache.load(disk_cache_key)
+                if entry is None:
+                    raise
+                if entry.secret_omitted and (disk_cache.allow_secret_omitted is False):
+                    logger.info(
+                        f"failed to read config {parameter_name!r}: {e!r}, "
+                        f"the last-known-good copy has no secret data, "
+                        f"it is not used."
+                    )
+                    raise
+                logger.info(
+                    f"failed to read config {parameter_name!r}: {e!r}, "
+                    f"use the last-known-good copy of version {entry.version!r} "
+                    f"saved {entry.age:.0f} seconds ago."
+                )
+                return new(entry.data, entry.secret_data, entry.version)
         else:
             raise ValueError(
                 "The arguments has to meet one of these criteria:\n"
@@ -604,61 +1680,415 @@ class BaseConfig(T.Generic[T_BASE_ENV]):
                 "to indicate that you want to read from AWS S3.\n"
             )
 
-    def prepare_deploy(self) -> T.List[ConfigDeployment]:
+    @classmethod
+    def read_version(
+        cls,
+        env_class: T.Type[T_BASE_ENV],
+        version: T.Union[int, str],
+        bsm: "boto_session_manager.BotoSesManager",
+        parameter_name: str,
+        env_enum_class: T.Optional[
+            T.Union[T.Type[BaseEnvEnum], EnvRegistry]
+        ] = None,
+        parameter_with_encryption: T.Optional[bool] = None,
+        s3folder_config: T.Optional[str] = None,
+        disk_cache: T.Optional[DiskConfigCache] = None,
+    ):
         """
-        split the consolidated config into per environment config.
+        Read the config object of an explicit version from AWS Parameter Store
+        or S3. A written version never changes, so the result is cached in
+        the process-wide :data:`pinned_read_cache` without TTL or revalidation,
+        the same object is returned to all callers, so you should treat it as
+        read-only. It is useful for canary and rollback tooling that reads
+        the same historical versions again and again.
+
+        :param env_class: see :meth:`read`.
+        :param version: the AWS Parameter version, or the S3 config version.
+            For versioning disabled bucket, it is 1, 2, 3, ...
+            For versioning enabled bucket, it is the version id of the S3 object.
+        :param bsm: the ``boto_session_manager.BotoSesManager`` object.
+        :param parameter_name: the AWS Parameter name.
+        :param env_enum_class: see :meth:`read`.
+        :param parameter_with_encryption: set it to read from AWS Parameter Store,
+            is AWS Parameter turned on encryption?
+        :param s3folder_config: set it to read from AWS S3,
+            the s3 folder uri where you store the config file.
+        :param disk_cache: if given, the config data is also saved to this
+            :class:`~config_patterns.disk_cache.DiskConfigCache`, and the next
+            process reads it from the disk without any API call, not even the
+            STS call of a new ``bsm``. The copy without its secret data is
+            not used.
+        """
+        version = str(version)
+        if parameter_with_encryption is not None:
+            disk_cache_key = f"ssm:{parameter_name}:{version}"
+        elif s3folder_config is not None:
+            disk_cache_key = f"s3:{s3folder_config}:{parameter_name}:{version}"
+        else:
+            raise ValueError(
+                "You have to set one of "
+                "``parameter_with_encryption`` and ``s3folder_config``!"
+            )
+        cache_key = (
+            cls,
+            env_class,
+            env_enum_class,
+            _get_bsm_identity(bsm),
+            disk_cache_key,
+        )
+        config = pinned_read_cache.get(cache_key)
+        if config is not None:
+            return config
+
+        entry = None
+        if disk_cache is not None:
+            entry = disk_cache.load(disk_cache_key)
+        if (entry is not None) and (entry.secret_omitted is False):
+            data, secret_data = entry.data, entry.secret_data
+        else:
+            data, secret_data, _ = cls._read_remote(
+                bsm=bsm,
+                parameter_name=parameter_name,
+                parameter_with_encryption=parameter_with_encryption,
+                s3folder_config=s3folder_config,
+                version=version,
+            )
+            if disk_cache is not None:
+                try:
+                    disk_cache.save(disk_cache_key, data, secret_data, version)
+                except OSError as e:  # pragma: no cover
+                    logger.info(f"failed to save config to disk cache: {e!r}")
+        config = cls._new(
+            data=data,
+            secret_data=secret_data,
+            env_class=env_class,
+            env_enum_class=env_enum_class,
+            version=version,
+        )
+        pinned_read_cache.put(cache_key, config)
+        return config
 
-        :return a list of deployment.
+    @classmethod
+    async def aread(
+        cls,
+        env_class: T.Type[T_BASE_ENV],
+        env_enum_class: T.Optional[
+            T.Union[T.Type[BaseEnvEnum], EnvRegistry]
+        ] = None,
+        path_config: T.Optional[str] = None,
+        path_secret_config: T.Optional[str] = None,
+        bsm: T.Optional["boto_session_manager.BotoSesManager"] = None,
+        parameter_name: T.Optional[str] = None,
+        parameter_with_encryption: T.Optional[bool] = None,
+        s3folder_config: T.Optional[str] = None,
+        cache_ttl: T.Optional[float] = None,
+        cache_max_staleness: T.Optional[float] = None,
+        disk_cache: T.Optional[DiskConfigCache] = None,
+        env_name: T.Optional[T.Union[str, BaseEnvEnum]] = None,
+        replicas: T.Optional[T.Sequence[T_REPLICA]] = None,
+        executor: T.Optional[Executor] = None,
+    ):
         """
-        deployment_list: T.List[ConfigDeployment] = list()
+        The async version of :meth:`read`, the arguments are the same. The
+        blocking file IO and AWS API calls run in the ``executor``, so it
+        doesn't block the event loop.
 
-        # manually add all env parameter, the name is project_name only
-        # without env_name
-        parameter_name = self.parameter_name
-        parameter_data = {"data": self.data, "secret_data": self.secret_data}
-        deployment_list.append(
-            ConfigDeployment(
+        :param executor: the ``concurrent.futures.Executor`` to run the blocking
+            calls, if None, use the default executor of the event loop.
+        """
+
+        def read():
+            if bsm is not None:
+                if parameter_with_encryption is not None:
+                    get_client(bsm, "ssm")
+                elif s3folder_config is not None:
+                    get_client(bsm, "s3")
+            return cls.read(
+                env_class=env_class,
+                env_enum_class=env_enum_class,
+                path_config=path_config,
+                path_secret_config=path_secret_config,
+                bsm=bsm,
                 parameter_name=parameter_name,
-                parameter_data=parameter_data,
-                project_name=self.project_name,
-                env_name=ALL,
+                parameter_with_encryption=parameter_with_encryption,
+                s3folder_config=s3folder_config,
+                cache_ttl=cache_ttl,
+                cache_max_staleness=cache_max_staleness,
+                disk_cache=disk_cache,
+                env_name=env_name,
+                replicas=replicas,
             )
+
+        return await run_in_executor(read, executor=executor)
+
+    @classmethod
+    async def aread_many(
+        cls,
+        kwargs_list: T.Iterable[T.Dict[str, T.Any]],
+        max_concurrency: int = 8,
+        executor: T.Optional[Executor] = None,
+    ) -> list:
+        """
+        Read many config objects concurrently, for example, the configs of
+        many projects.
+
+        Example::
+
+            configs = await Config.aread_many(
+                [
+                    dict(
+                        env_class=Env,
+                        bsm=bsm,
+                        parameter_name=project_name,
+                        parameter_with_encryption=True,
+                    )
+                    for project_name in project_names
+                ],
+                max_concurrency=8,
+            )
+
+        :param kwargs_list: the keyword arguments of :meth:`aread` for each config.
+        :param max_concurrency: at most this many configs are read at the
+            same time, to avoid the AWS API throttling.
+        :param executor: see :meth:`aread`.
+
+        :return: the list of config objects, in the same order as ``kwargs_list``.
+        """
+        return await gather_with_concurrency(
+            [cls.aread(executor=executor, **kwargs) for kwargs in kwargs_list],
+            max_concurrency=max_concurrency,
         )
 
-        # add per env parameter
-        for env_name in self.EnvEnum:
-            env_name = self.EnvEnum.ensure_str(env_name)
-            env = self.get_env(env_name)
-            parameter_name = env.parameter_name
+    @classmethod
+    def read_many(
+        cls,
+        env_class: T.Type[T_BASE_ENV],
+        bsm: "boto_session_manager.BotoSesManager",
+        env_enum_class: T.Optional[
+            T.Union[T.Type[BaseEnvEnum], EnvRegistry]
+        ] = None,
+        parameter_names: T.Optional[T.Iterable[str]] = None,
+        parameter_path: T.Optional[str] = None,
+        parameter_with_encryption: bool = True,
+        ignore_missing: bool = False,
+    ) -> T.Dict[str, "BaseConfig"]:
+        """
+        Read many config objects from AWS Parameter Store in bulk, for example,
+        the configs of many projects, or the per environment parameters
+        of one project. Either give the parameter names, they are read with
+        one ``GetParameters`` API call per 10 names, or give the hierarchy
+        path, all parameters under it are read with paginated
+        ``GetParametersByPath`` API calls.
+
+        Example::
+
+            configs = Config.read_many(
+                env_class=Env,
+                bsm=bsm,
+                parameter_names=["project1", "project2", "project3"],
+            )
+            configs["project1"].get_env("prod")
+
+        :param env_class: see :meth:`read`.
+        :param bsm: the ``boto_session_manager.BotoSesManager`` object.
+        :param env_enum_class: see :meth:`read`. If you read the configs of
+            different projects, leave it None, so each config object gets
+            the environment names from its own config data.
+        :param parameter_names: the AWS Parameter names.
+        :param parameter_path: the AWS Parameter hierarchy path, for example,
+            ``/my-company/``.
+        :param parameter_with_encryption: is AWS Parameter turned on encryption?
+        :param ignore_missing: if False (default), raise
+            :class:`~config_patterns.exc.ParameterNotExists` when any of
+            ``parameter_names`` does not exist, otherwise skip it.
+
+        :return: a dict mapping parameter name to config object.
+        """
+        if (parameter_names is None) == (parameter_path is None):
+            raise ValueError(
+                "You have to set exactly one of "
+                "``parameter_names`` and ``parameter_path``!"
+            )
+        if parameter_names is not None:
+            parameter_names = list(parameter_names)
+            results = read_parameters(
+                bsm=bsm,
+                parameter_names=parameter_names,
+                parameter_with_encryption=parameter_with_encryption,
+            )
+            missing = [name for name in parameter_names if name not in results]
+            if missing and (ignore_missing is False):
+                raise exc.ParameterNotExists(f"SSM Parameter {missing!r} not exist!")
+        else:
+            results = read_parameters_by_path(
+                bsm=bsm,
+                path=parameter_path,
+                parameter_with_encryption=parameter_with_encryption,
+            )
+        return {
+            name: cls._new(
+                data=parameter_data["data"],
+                secret_data=parameter_data["secret_data"],
+                env_class=env_class,
+                env_enum_class=env_enum_class,
+                version=parameter_version,
+            )
+            for name, (parameter_data, parameter_version) in results.items()
+        }
+
+    @classmethod
+    def _read_replicas(
+        cls,
+        replicas: T.Sequence[T_REPLICA],
+        parameter_name: str,
+        parameter_with_encryption: T.Optional[bool],
+    ) -> T.Tuple[dict, dict, str]:
+        """
+        Read the config data from the replicas with hedged requests,
+        see :meth:`read`.
+
+        :return: the data, secret data and version.
+        """
+
+        def new_call(bsm, location: T.Optional[str]):
+            def call():
+                if parameter_with_encryption is not None:
+                    get_client(bsm, "ssm")
+                    return cls._read_remote(
+                        bsm=bsm,
+                        parameter_name=location or parameter_name,
+                        parameter_with_encryption=parameter_with_encryption,
+                        s3folder_config=None,
+                    )
+                else:
+                    get_client(bsm, "s3")
+                    return cls._read_remote(
+                        bsm=bsm,
+                        parameter_name=parameter_name,
+                        parameter_with_encryption=None,
+                        s3folder_config=location,
+                    )
+
+            return call
+
+        return hedged_call(
+            [
+                (_get_replica_key(bsm, location), new_call(bsm, location))
+                for bsm, location in replicas
+            ],
+            tracker=replica_latency,
+            percentile=cls.hedge_percentile,
+            default_delay=cls.hedge_delay,
+        )
+
+    @classmethod
+    def _read_remote(
+        cls,
+        bsm: "boto_session_manager.BotoSesManager",
+        parameter_name: str,
+        parameter_with_encryption: T.Optional[bool],
+        s3folder_config: T.Optional[str],
+        version: T.Optional[str] = None,
+    ) -> T.Tuple[dict, dict, str]:
+        """
+        Read the config data from AWS Parameter Store or S3, see :meth:`read`.
+
+        :param version: if given, read this version instead of the latest.
+
+        :return: the data, secret data and version.
+        """
+        if parameter_with_encryption is not None:  # pragma: no cover
+            parameter_data, parameter_version = read_parameter(
+                bsm=bsm,
+                parameter_name=parameter_name,
+                parameter_with_encryption=parameter_with_encryption,
+                version=version,
+            )
+            return (
+                parameter_data["data"],
+                parameter_data["secret_data"],
+                parameter_version,
+            )
+        elif version is None:  # pragma: no cover
+            config_data, config_version = read_config(
+                bsm=bsm,
+                s3folder_config=s3folder_config,
+                parameter_name=parameter_name,
+            )
+            return (
+                config_data["data"],
+                config_data["secret_data"],
+                config_version,
+            )
+        else:  # pragma: no cover
+            config_data = read_config_version(
+                bsm=bsm,
+                s3folder_config=s3folder_config,
+                parameter_name=parameter_name,
+                config_version=version,
+            )
+            return (
+                config_data["data"],
+                config_data["secret_data"],
+                version,
+            )
 
+    def iter_prepare_deploy(self) -> T.Iterator[ConfigDeployment]:
+        """
+        Lazily split the consolidated config into per environment config.
+        The per environment parameter data is only created when the deployment
+        is yielded, so it doesn't hold all of them in memory at the same time.
+
+        :return: an iterator of deployment.
+        """
+        # access the inputs only once, they may be unpacked on every access
+        # in the ``lean_memory`` mode
+        data, secret_data = self._get_inputs()
+        if "_packed_inputs" in self.__dict__:
+            data_partition = partition_shared(data.get(SHARED, {}))
+            secret_data_partition = partition_shared(secret_data.get(SHARED, {}))
+        else:
+            data_partition = self._data_partition
+            secret_data_partition = self._secret_data_partition
+
+        # manually add all env parameter, the name is project_name only
+        # without env_name
+        yield ConfigDeployment(
+            parameter_name=self.parameter_name,
+            parameter_data={"data": data, "secret_data": secret_data},
+            project_name=self.project_name,
+            env_name=ALL,
+        )
+
+        # add per env parameter, the ``_shared`` section is bucketed by
+        # env name once, instead of being scanned for every env
+        for env_name in self._iter_env_names():
+            parameter_name = normalize_parameter_name(
+                f"{self.project_name_snake}-{env_name}"
+            )
             parameter_data = {
-                "data": {
-                    "_shared": {
-                        k: v
-                        for k, v in self.data.get("_shared", {}).items()
-                        if k.startswith("*") or k.startswith(f"{env.env_name}.")
-                    },
-                    env.env_name: self.data[env.env_name],
-                },
-                "secret_data": {
-                    "_shared": {
-                        k: v
-                        for k, v in self.secret_data.get("_shared", {}).items()
-                        if k.startswith("*") or k.startswith(f"{env.env_name}.")
-                    },
-                    env.env_name: self.secret_data[env.env_name],
-                },
+                "data": extract_env_data(data, env_name, data_partition),
+                "secret_data": extract_env_data(
+                    secret_data, env_name, secret_data_partition
+                ),
             }
-            deployment_list.append(
-                ConfigDeployment(
-                    parameter_name=parameter_name,
-                    parameter_data=parameter_data,
-                    project_name=env.project_name,
-                    env_name=env.env_name,
-                )
+            yield ConfigDeployment(
+                parameter_name=parameter_name,
+                parameter_data=parameter_data,
+                project_name=self.project_name,
+                env_name=env_name,
             )
 
-        return deployment_list
+    def prepare_deploy(self) -> T.List[ConfigDeployment]:
+        """
+        split the consolidated config into per environment config.
+
+        It holds the config data of all environments in memory at the same
+        time, use :meth:`iter_prepare_deploy` if you have many environments.
+
+        :return a list of deployment.
+        """
+        return list(self.iter_prepare_deploy())
 
     def _get_specific_bsm(
         self,
@@ -765,7 +2195,52 @@ class BaseConfig(T.Generic[T_BASE_ENV]):
             or S3 object.
         :param verbose: whether to print out the log.
 
-        :return: a list of :class:`ConfigDeployment`.
+        :return: a list of :class:`ConfigDeployment`, the ``parameter_data``
+            is released (set to None), use :meth:`iter_deploy` if you need it.
+        """
+        return self._collect(
+            self.iter_deploy(
+                bsm=bsm,
+                parameter_with_encryption=parameter_with_encryption,
+                s3folder_config=s3folder_config,
+                tags=tags,
+                verbose=verbose,
+            )
+        )
+
+    # fmt: off
+    def iter_deploy(
+        self,
+        bsm: T.Union[
+            "boto_session_manager.BotoSesManager",
+            T.Dict[str, "boto_session_manager.BotoSesManager"],
+        ],
+        parameter_with_encryption: T.Optional[bool] = None,
+        s3folder_config: T.Optional[
+            T.Union[
+                str,
+                T.Dict[str, str],
+            ]
+        ] = None,
+        tags: T.Optional[T.Dict[str, str]] = None,
+        verbose: bool = True,
+    ) -> T.Iterator[ConfigDeployment]:
+    # fmt: on
+        """
+        The streaming version of :meth:`deploy`. The per environment config
+        is prepared right before it is deployed, and each deployment is yielded
+        right after it is deployed, so the peak memory doesn't grow with the
+        number of environments as long as you don't keep the yielded objects.
+
+        The arguments are validated immediately, the deployment happens when
+        you iterate the returned iterator.
+
+        Example::
+
+            for deployment in config.iter_deploy(bsm=bsm, s3folder_config=...):
+                print(deployment.parameter_name, deployment.deployment)
+
+        See :meth:`deploy` for the arguments.
         """
         if parameter_with_encryption is not None:
             # validate arguments
@@ -774,8 +2249,8 @@ class BaseConfig(T.Generic[T_BASE_ENV]):
                 or (parameter_with_encryption is False)
             ):
                 raise ValueError("parameter_with_encryption has to be True or False!")
-            deployment_list = self.prepare_deploy()
-            for deployment in deployment_list:
+
+            def deploy_one(deployment: ConfigDeployment):
                 specific_bsm = self._get_specific_bsm(bsm=bsm, deployment=deployment)
                 deployment.deploy_to_ssm_parameter(
                     bsm=specific_bsm,
@@ -783,10 +2258,10 @@ class BaseConfig(T.Generic[T_BASE_ENV]):
                     tags=tags,
                     verbose=verbose,
                 )
-            return deployment_list
+
         elif s3folder_config is not None:
-            deployment_list = self.prepare_deploy()
-            for deployment in deployment_list:
+
+            def deploy_one(deployment: ConfigDeployment):
                 specific_bsm = self._get_specific_bsm(
                     bsm=bsm,
                     deployment=deployment,
@@ -801,7 +2276,7 @@ class BaseConfig(T.Generic[T_BASE_ENV]):
                     tags=tags,
                     verbose=verbose,
                 )
-            return deployment_list
+
         else:
             raise ValueError(
                 "The arguments has to meet one of these criteria:\n"
@@ -810,6 +2285,33 @@ class BaseConfig(T.Generic[T_BASE_ENV]):
                 "2. set ``s3folder_config`` similar to s3://my-bucket/my-project/ "
                 "to indicate that you want to deploy to S3."
             )
+        return self._iter_apply(deploy_one)
+
+    def _iter_apply(
+        self,
+        func: T.Callable[[ConfigDeployment], T.Any],
+    ) -> T.Iterator[ConfigDeployment]:
+        """
+        Apply the deploy or delete function to each deployment, one at a time.
+        """
+        for deployment in self.iter_prepare_deploy():
+            func(deployment)
+            yield deployment
+
+    @staticmethod
+    def _collect(
+        deployments: T.Iterable[ConfigDeployment],
+    ) -> T.List[ConfigDeployment]:
+        """
+        Collect the deployments into a list. The per environment config data
+        is released once it is deployed, so the list doesn't hold the config
+        data of all environments at the same time.
+        """
+        deployment_list = list()
+        for deployment in deployments:
+            deployment.parameter_data = None
+            deployment_list.append(deployment)
+        return deployment_list
 
     # fmt: off
     def delete(
@@ -827,7 +2329,7 @@ class BaseConfig(T.Generic[T_BASE_ENV]):
         ] = None,
         include_history: bool = False,
         verbose: bool = True,
-    ):
+    ) -> T.List[ConfigDeployment]:
     # fmt: on
         """
         Delete the all project config of all environments from configuration store.
@@ -851,19 +2353,59 @@ class BaseConfig(T.Generic[T_BASE_ENV]):
         :param include_history: if False, only delete the latest version,
             if True, delete all historical versions.
         :param verbose: whether to print out the log.
+
+        :return: a list of :class:`ConfigDeployment`, the ``parameter_data``
+            is released (set to None), use :meth:`iter_delete` if you need it.
+        """
+        return self._collect(
+            self.iter_delete(
+                bsm=bsm,
+                use_parameter_store=use_parameter_store,
+                s3folder_config=s3folder_config,
+                include_history=include_history,
+                verbose=verbose,
+            )
+        )
+
+    # fmt: off
+    def iter_delete(
+        self,
+        bsm: T.Union[
+            "boto_session_manager.BotoSesManager",
+            T.Dict[str, "boto_session_manager.BotoSesManager"],
+        ],
+        use_parameter_store: T.Optional[bool] = None,
+        s3folder_config: T.Optional[
+            T.Union[
+                str,
+                T.Dict[str, str],
+            ]
+        ] = None,
+        include_history: bool = False,
+        verbose: bool = True,
+    ) -> T.Iterator[ConfigDeployment]:
+    # fmt: on
+        """
+        The streaming version of :meth:`delete`, each deployment is yielded
+        right after it is deleted.
+
+        The arguments are validated immediately, the deletion happens when
+        you iterate the returned iterator.
+
+        See :meth:`delete` for the arguments.
         """
         if (bsm is not None) and (use_parameter_store is True):
-            deployment_list = self.prepare_deploy()
-            for deployment in deployment_list:
+
+            def delete_one(deployment: ConfigDeployment):
                 specific_bsm = self._get_specific_bsm(bsm=bsm, deployment=deployment)
                 deployment.delete_from_ssm_parameter(
                     bsm=specific_bsm,
                     verbose=verbose,
                 )
-            return deployment_list
+
         elif (bsm is not None) and (s3folder_config is not None):
-            deployment_list = self.prepare_deploy()
-            for deployment in deployment_list:
+
+            def delete_one(deployment: ConfigDeployment):
                 specific_bsm = self._get_specific_bsm(
                     bsm=bsm,
                     deployment=deployment,
@@ -878,7 +2420,7 @@ class BaseConfig(T.Generic[T_BASE_ENV]):
                     include_history=include_history,
                     verbose=verbose,
                 )
-            return deployment_list
+
         else:
             raise ValueError(
                 "The arguments has to meet one of these criteria:\n"
@@ -887,3 +2429,4 @@ class BaseConfig(T.Generic[T_BASE_ENV]):
                 "2. set ``s3folder_config`` similar to s3://my-bucket/my-project/ "
                 "to indicate that you want to delete config file from S3."
             )
+        return self._iter_apply(delete_one)
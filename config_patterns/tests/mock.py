@@ -46,6 +46,8 @@ class BaseMockTest:
     @classmethod
     def setup_moto(cls):
         if cls.use_mock:
+            # each test class has its own list, don't append to the base class one
+            cls._mock_list = list()
             for mock_abc in cls.mock_list:
                 mocker = mock_abc()
                 mocker.start()
@@ -0,0 +1,255 @@
+# -*- coding: utf-8 -*-
+
+import typing as T
+
+import moto
+import pytest
+
+from config_patterns import exc
+from config_patterns.aws.s3 import (
+    latest_read_cache,
+    bucket_version_status_cache,
+    get_cached_bucket_version_status,
+    invalidate_bucket_version_status,
+    S3Parameter,
+    deploy_config,
+    delete_config,
+)
+from config_patterns.tests.mock import BaseMockTest
+
+
+class S3ApiRecorder:
+    """
+    Record the S3 API calls and the HTTP status codes of a boto3 client.
+    """
+
+    def __init__(self, s3_client):
+        self.calls: T.List[T.Tuple[str, int]] = list()
+        s3_client.meta.events.register("after-call.s3.*", self._after_call)
+
+    def _after_call(self, http_response, model, **kwargs):
+        self.calls.append((model.name, http_response.status_code))
+
+    def clear(self):
+        self.calls.clear()
+
+
+class TestS3Parameter(BaseMockTest):
+    mock_list = [
+        moto.mock_s3,
+        moto.mock_sts,
+    ]
+
+    @classmethod
+    def setup_class_post_hook(cls):
+        cls.bsm.s3_client.create_bucket(Bucket="my-bucket")
+        cls.bsm.s3_client.create_bucket(Bucket="my-versioned-bucket")
+        cls.bsm.s3_client.put_bucket_versioning(
+            Bucket="my-versioned-bucket",
+            VersioningConfiguration={"Status": "Enabled"},
+        )
+        cls.recorder = S3ApiRecorder(cls.bsm.s3_client)
+        invalidate_bucket_version_status()
+
+    def _test_read_latest_revalidation(self, s3folder_config: str):
+        parameter_name = "my_project"
+        s3parameter = S3Parameter.new(
+            bsm=self.bsm,
+            s3folder_config=s3folder_config,
+            parameter_name=parameter_name,
+        )
+        latest_read_cache.clear()
+        with pytest.raises(exc.S3ObjectNotExist):
+            s3parameter.read_latest(bsm=self.bsm)
+
+        config_data_v1 = {"data": {"key": "v1"}, "secret_data": {}}
+        deploy_config(
+            bsm=self.bsm,
+            s3folder_config=s3folder_config,
+            parameter_name=parameter_name,
+            config_data=config_data_v1,
+        )
+
+        # the first read downloads the body
+        latest_read_cache.clear()
+        self.recorder.clear()
+        config_data, version_v1 = s3parameter.read_latest(bsm=self.bsm)
+        assert config_data == config_data_v1
+        assert self.recorder.calls == [("GetObject", 200)]
+
+        # the second read is a conditional GET, returns 304
+        self.recorder.clear()
+        config_data, version = s3parameter.read_latest(bsm=self.bsm)
+        assert config_data == config_data_v1
+        assert version == version_v1
+        assert self.recorder.calls == [("GetObject", 304)]
+        # each caller gets its own copy
+        config_data["data"]["key"] = "changed"
+        assert s3parameter.read_latest(bsm=self.bsm)[0] == config_data_v1
+
+        # the changed object is downloaded again
+        config_data_v2 = {"data": {"key": "v2"}, "secret_data": {}}
+        deploy_config(
+            bsm=self.bsm,
+            s3folder_config=s3folder_config,
+            parameter_name=parameter_name,
+            config_data=config_data_v2,
+        )
+        latest_read_cache.clear()
+        self.recorder.clear()
+        config_data, version_v2 = s3parameter.read_latest(bsm=self.bsm)
+        assert config_data == config_data_v2
+        assert version_v2 != version_v1
+        assert self.recorder.calls == [("GetObject", 200)]
+
+        delete_config(
+            bsm=self.bsm,
+            s3folder_config=s3folder_config,
+            parameter_name=parameter_name,
+            include_history=True,
+        )
+        with pytest.raises(exc.S3ObjectNotExist):
+            s3parameter.read_latest(bsm=self.bsm)
+        assert s3parameter.s3path_latest.uri not in latest_read_cache
+
+    def test_read_latest_revalidation(self):
+        self._test_read_latest_revalidation("s3://my-bucket/my-project/")
+        self._test_read_latest_revalidation("s3://my-versioned-bucket/my-project/")
+
+    def _test_api_calls(self, s3folder_config: str, version_enabled: bool):
+        parameter_name = "my_project-dev"
+        invalidate_bucket_version_status()
+        latest_read_cache.clear()
+
+        def get_calls() -> T.List[T.Tuple[str, int]]:
+            calls = list(self.recorder.calls)
+            self.recorder.clear()
+            return calls
+
+        def deploy(config_data: dict):
+            deploy_config(
+                bsm=self.bsm,
+                s3folder_config=s3folder_config,
+                parameter_name=parameter_name,
+                config_data=config_data,
+            )
+
+        self.recorder.clear()
+        # first deployment
+        deploy({"data": {"key": "v1"}, "secret_data": {}})
+        calls = get_calls()
+        if version_enabled:
+            assert calls == [
+                ("GetBucketVersioning", 200),
+                ("GetObject", 404),
+                ("PutObject", 200),
+            ]
+        else:
+            assert calls == [
+                ("GetBucketVersioning", 200),
+                ("GetObject", 404),
+                ("ListObjectsV2", 200),
+                ("PutObject", 200),
+                ("CopyObject", 200),
+            ]
+
+        # deploy a new version, the deployed object is already in the cache
+        deploy({"data": {"key": "v2"}, "secret_data": {}})
+        calls = get_calls()
+        if version_enabled:
+            assert calls == [("GetObject", 304), ("PutObject", 200)]
+        else:
+            assert calls == [
+                ("GetObject", 304),
+                ("PutObject", 200),
+                ("CopyObject", 200),
+            ]
+
+        # deploy the same data, do nothing
+        deploy({"data": {"key": "v2"}, "secret_data": {}})
+        assert get_calls() == [("GetObject", 304)]
+
+        # read with a cold cache, one request for body, version and sha256
+        latest_read_cache.clear()
+        s3parameter = S3Parameter.new(
+            bsm=self.bsm,
+            s3folder_config=s3folder_config,
+            parameter_name=parameter_name,
+        )
+        latest_config = s3parameter.get_latest(bsm=self.bsm)
+        assert get_calls() == [("GetObject", 200)]
+        assert latest_config.config_data == {"data": {"key": "v2"}, "secret_data": {}}
+        assert latest_config.config_sha256 is not None
+        if version_enabled is False:
+            assert latest_config.config_version == "2"
+            assert (
+                s3parameter.get_latest_config_version_when_version_not_enabled(
+                    bsm=self.bsm
+                )
+                == 2
+            )
+            assert get_calls() == [("GetObject", 304)]
+
+        delete_config(
+            bsm=self.bsm,
+            s3folder_config=s3folder_config,
+            parameter_name=parameter_name,
+            include_history=True,
+        )
+
+    def test_api_calls(self):
+        self._test_api_calls("s3://my-bucket/my-project-2/", version_enabled=False)
+        self._test_api_calls(
+            "s3://my-versioned-bucket/my-project-2/", version_enabled=True
+        )
+
+    def test_bucket_version_status_cache(self):
+        invalidate_bucket_version_status()
+        self.recorder.clear()
+        s3folder_config = "s3://my-bucket/my-project-1/"
+        for parameter_name in ["my_project", "my_project-dev", "my_project-prod"]:
+            deploy_config(
+                bsm=self.bsm,
+                s3folder_config=s3folder_config,
+                parameter_name=parameter_name,
+                config_data={"data": {}, "secret_data": {}},
+            )
+            delete_config(
+                bsm=self.bsm,
+                s3folder_config=s3folder_config,
+                parameter_name=parameter_name,
+                include_history=True,
+            )
+        calls = [name for name, _ in self.recorder.calls]
+        assert calls.count("GetBucketVersioning") == 1
+
+        status = get_cached_bucket_version_status(bsm=self.bsm, bucket="my-bucket")
+        assert status.is_not_enabled()
+        self.bsm.s3_client.create_bucket(Bucket="my-new-bucket")
+        self.bsm.s3_client.put_bucket_versioning(
+            Bucket="my-new-bucket",
+            VersioningConfiguration={"Status": "Enabled"},
+        )
+        assert get_cached_bucket_version_status(
+            bsm=self.bsm, bucket="my-new-bucket"
+        ).is_enabled()
+        # the cached status is used until invalidated
+        self.bsm.s3_client.put_bucket_versioning(
+            Bucket="my-new-bucket",
+            VersioningConfiguration={"Status": "Suspended"},
+        )
+        assert get_cached_bucket_version_status(
+            bsm=self.bsm, bucket="my-new-bucket"
+        ).is_enabled()
+        assert get_cached_bucket_version_status(
+            bsm=self.bsm, bucket="my-new-bucket", ttl=0
+        ).is_suspended()
+        invalidate_bucket_version_status("my-new-bucket")
+        assert "my-new-bucket" not in bucket_version_status_cache
+        assert "my-bucket" in bucket_version_status_cache
+
+
+if __name__ == "__main__":
+    from config_patterns.tests import run_cov_test
+
+    run_cov_test(__file__, "config_patterns.aws.s3", preview=False)
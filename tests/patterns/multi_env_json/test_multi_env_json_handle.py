@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from config_patterns.patterns.multi_env_json.handle import (
+    ConfigSnapshot,
+    ConfigHandle,
+)
+from test_multi_env_json_impl import EnvEnum, Env, Config
+
+
+def new_config(version: int) -> Config:
+    return Config(
+        data={
+            "_shared": {"*.project_name": "my_project"},
+            "dev": {"username": f"dev.user.{version}"},
+            "prod": {"username": f"prod.user.{version}"},
+        },
+        secret_data={
+            "_shared": {},
+            "dev": {"password": f"dev.password.{version}"},
+            "prod": {"password": f"prod.password.{version}"},
+        },
+        Env=Env,
+        EnvEnum=EnvEnum,
+        version=str(version),
+    )
+
+
+class TestConfigHandle:
+    def test(self):
+        config = new_config(1)
+        handle = ConfigHandle(config)
+        snapshot = handle.snapshot
+        assert isinstance(snapshot, ConfigSnapshot)
+        assert snapshot.generation == 1
+        assert snapshot.version == "1"
+        assert handle.config is config
+        assert list(snapshot.envs) == ["dev", "prod"]
+        assert handle.get_env("dev") is snapshot.envs["dev"]
+        assert handle.get_env(EnvEnum.prod).username == "prod.user.1"
+        with pytest.raises(Exception):
+            snapshot.generation = 2
+
+        old_snapshot = handle.swap(new_config(2))
+        assert old_snapshot is snapshot
+        assert handle.snapshot.generation == 2
+        assert handle.get_env("dev").username == "dev.user.2"
+        # the old snapshot is not changed
+        assert snapshot.get_env("dev").username == "dev.user.1"
+
+        new_snapshot = handle.refresh(lambda: new_config(3))
+        assert new_snapshot is handle.snapshot
+        assert new_snapshot.generation == 3
+
+        def loader():
+            raise ConnectionError
+
+        with pytest.raises(ConnectionError):
+            handle.refresh(loader)
+        assert handle.snapshot is new_snapshot
+
+        # envs are built on demand
+        handle = ConfigHandle(new_config(1), build_envs=False)
+        assert handle.snapshot.envs == {}
+        assert handle.get_env("dev").username == "dev.user.1"
+        with pytest.raises(ValueError):
+            handle.get_env("test")
+
+    def test_concurrent_refresh(self):
+        handle = ConfigHandle(new_config(0))
+        n_version = 50
+        done = threading.Event()
+
+        def refresher():
+            for version in range(1, n_version + 1):
+                handle.refresh(lambda: new_config(version))
+            done.set()
+
+        def reader(_) -> int:
+            n_read = 0
+            while (not done.is_set()) or (n_read == 0):
+                snapshot = handle.snapshot
+                version = snapshot.version
+                # all values in one snapshot are from the same version
+                assert snapshot.get_env("dev").username == f"dev.user.{version}"
+                assert snapshot.get_env("prod").password == f"prod.password.{version}"
+                assert snapshot.generation == int(version) + 1
+                n_read += 1
+            return n_read
+
+        with ThreadPoolExecutor(max_workers=9) as executor:
+            futures = [executor.submit(reader, ith) for ith in range(8)]
+            executor.submit(refresher).result()
+            assert all(future.result() > 0 for future in futures)
+        assert handle.snapshot.version == str(n_version)
+        assert handle.snapshot.generation == n_version + 1
+
+
+if __name__ == "__main__":
+    from config_patterns.tests import run_cov_test
+
+    run_cov_test(
+        __file__, "config_patterns.patterns.multi_env_json.handle", preview=False
+    )
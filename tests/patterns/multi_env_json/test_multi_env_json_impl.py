@@ -2,25 +2,52 @@
 
 import typing as T
 import pytest
+import copy
+import pickle
 import json
+import time
+import asyncio
+import base64
+import tracemalloc
 import dataclasses
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from unittest import mock
 
 import moto
+from botocore.exceptions import ClientError
 from boto_session_manager import BotoSesManager
 from s3pathlib import S3Path, context
 
 from config_patterns import exc
 from config_patterns.compat import cached_property
-from config_patterns.aws.s3 import KEY_CONFIG_VERSION
+from config_patterns.frozen import FrozenDict, freeze, thaw
+from config_patterns.dataclass_utils import add_slots
+from config_patterns.disk_cache import DiskConfigCache
+from config_patterns.aws.s3 import (
+    KEY_CONFIG_VERSION,
+    invalidate_bucket_version_status,
+    aread_config,
+)
+from config_patterns.aws.ssm import aread_parameter
 from config_patterns.patterns.multi_env_json.impl import (
     ALL,
+    apply_merge_memo,
+    remote_read_cache,
+    pinned_read_cache,
+    replica_latency,
     validate_project_name,
     validate_env_name,
     normalize_parameter_name,
     BaseEnvEnum,
+    EnvRegistry,
     BaseEnv,
+    BaseSlotsEnv,
     BaseConfig,
+    partition_shared,
+    extract_env_data,
+    build_path_index,
+    _get_replica_key,
 )
 from config_patterns.logger import logger
 from config_patterns.tests.mock import BaseMockTest
@@ -76,6 +103,13 @@ class Env(BaseEnv):
         return cls(**data)
 
 
+@add_slots
+@dataclasses.dataclass
+class SlotsEnv(BaseSlotsEnv):
+    username: T.Optional[str] = dataclasses.field(default=None)
+    password: T.Optional[str] = dataclasses.field(default=None)
+
+
 @dataclasses.dataclass
 class Config(BaseConfig[Env]):
     @classmethod
@@ -102,6 +136,34 @@ class TestBaseEnvEnum:
         assert EnvEnum.ensure_str(EnvEnum.dev) == "dev"
 
 
+class TestEnvRegistry:
+    def test(self):
+        env_registry = EnvRegistry(["dev", "pr1"])
+        env_registry.register("pr2")
+        assert list(env_registry) == ["dev", "pr1", "pr2"]
+        assert env_registry.get_values() == ["dev", "pr1", "pr2"]
+        assert len(env_registry) == 3
+        assert "pr1" in env_registry
+        assert "pr3" not in env_registry
+        assert [] not in env_registry
+        assert env_registry.ensure_str("pr1") == "pr1"
+        assert env_registry.ensure_str(EnvEnum.dev) == "dev"
+        with pytest.raises(ValueError):
+            env_registry.ensure_str("pr3")
+        with pytest.raises(ValueError):
+            env_registry.ensure_str([])
+        with pytest.raises(ValueError):
+            env_registry.register("my_pr")
+        env_registry.unregister("pr1")
+        assert list(env_registry) == ["dev", "pr2"]
+        assert "EnvRegistry" in repr(env_registry)
+
+        env_registry = EnvRegistry.from_config_data(
+            {"_shared": {}, "dev": {}, "prod": {}}
+        )
+        assert list(env_registry) == ["dev", "prod"]
+
+
 def test_validate_project_name():
     good_cases = [
         "my_project",
@@ -152,9 +214,72 @@ def test_normalize_parameter_name():
     assert normalize_parameter_name("ssm-project") == "p-ssm-project"
 
 
+def test_extract_env_data():
+    data = {
+        "_shared": {
+            "*.key1": "value1",
+            "dev.key2": "value2",
+            "devops.key2": "value2",
+            "prod.key2": "value2",
+        },
+        "dev": {"key3": "value3"},
+        "prod": {"key3": "value3"},
+    }
+    assert extract_env_data(data, "dev") == {
+        "_shared": {"*.key1": "value1", "dev.key2": "value2"},
+        "dev": {"key3": "value3"},
+    }
+
+
+def test_partition_shared():
+    shared = {
+        "dev.key1": 1,
+        "*.key2": 2,
+        "prod.key3": 3,
+        "dev.key4": 4,
+        "*.key5": 5,
+        "key6": 6,
+    }
+    common, buckets = partition_shared(shared)
+    assert [path for _, path, _ in common] == ["*.key2", "*.key5"]
+    assert set(buckets) == {"dev", "prod"}
+    assert [path for _, path, _ in buckets["dev"]] == ["dev.key1", "dev.key4"]
+
+    # the original order is preserved
+    data = {"_shared": shared, "dev": {}, "prod": {}}
+    partition = (common, buckets)
+    assert list(extract_env_data(data, "dev", partition)["_shared"]) == [
+        "dev.key1",
+        "*.key2",
+        "dev.key4",
+        "*.key5",
+    ]
+    assert list(extract_env_data(data, "prod", partition)["_shared"]) == [
+        "*.key2",
+        "prod.key3",
+        "*.key5",
+    ]
+
+
 dir_here = Path(__file__).absolute().parent
 
 
+def test_build_path_index():
+    values, leaf_paths = build_path_index(
+        {"db": {"host": "db.com", "ports": [5432, 5433]}, "tags": {}, "name": "a"}
+    )
+    assert values == {
+        "db": {"host": "db.com", "ports": [5432, 5433]},
+        "db.host": "db.com",
+        "db.ports": [5432, 5433],
+        "db.ports.0": 5432,
+        "db.ports.1": 5433,
+        "tags": {},
+        "name": "a",
+    }
+    assert leaf_paths == ["db.host", "db.ports.0", "db.ports.1", "name"]
+
+
 @dataclasses.dataclass
 class ConfigTestCase:
     version: str
@@ -253,6 +378,553 @@ class TestConfig:
             ).get_env(EnvEnum.dev.value)
             assert "please compare your config json file" in str(e)
 
+    def test_env_cache(self):
+        config = ConfigTestCase(version="v1").config
+        config.clear_env_cache()
+        dev = config.get_env(EnvEnum.dev)
+        assert config.get_env("dev") is dev
+        assert config.get_env(EnvEnum.dev) is dev
+
+        # private copy is not shared and is not cached
+        private_dev = config.get_env("dev", private=True)
+        assert private_dev is not dev
+        assert private_dev == dev
+        private_dev.username = "changed"
+        assert config.get_env("dev").username != "changed"
+
+        # invalidation
+        prod = config.get_env("prod")
+        config.clear_env_cache(EnvEnum.dev)
+        assert config.get_env("dev") is not dev
+        assert config.get_env("prod") is prod
+        config.clear_env_cache()
+        assert config.get_env("prod") is not prod
+
+        # all threads get the same object
+        config.clear_env_cache()
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            env_list = list(executor.map(config.get_env, ["dev"] * 100))
+        assert len({id(env) for env in env_list}) == 1
+
+        # opt-out
+        @dataclasses.dataclass
+        class NoCacheConfig(Config):
+            cache_env = False
+
+        config_test_case = ConfigTestCase(version="v1")
+        config = NoCacheConfig.read(
+            env_class=Env,
+            env_enum_class=EnvEnum,
+            path_config=config_test_case.path_config,
+            path_secret_config=config_test_case.path_secret_config,
+        )
+        assert config.get_env("dev") is not config.get_env("dev")
+
+    def test_cached_property_thread_safe(self):
+        config = ConfigTestCase(version="v1").config
+        env = config.get_env("dev", private=True)
+
+        def read(_) -> tuple:
+            return (
+                config.parameter_name,
+                config.project_name_slug,
+                env.parameter_name,
+                env.prefix_name_slug,
+                id(config.env),
+            )
+
+        with ThreadPoolExecutor(max_workers=16) as executor:
+            results = set(executor.map(read, range(256)))
+        assert len(results) == 1
+        assert config.__dict__["parameter_name"] == "my_project"
+
+    def test_copy_and_pickle(self):
+        config_test_case = ConfigTestCase(version="v1")
+        config = config_test_case.config
+        _ = config.get_env("dev")
+        _ = config.get_value("dev", "username")
+        _ = config.parameter_name
+
+        for new_config in [
+            copy.deepcopy(config),
+            pickle.loads(pickle.dumps(config)),
+        ]:
+            assert new_config == config
+            assert new_config._merged == config_test_case.merged_data
+            assert new_config._env_cache == {}
+            assert new_config._path_index == {}
+            assert new_config.dev == config.dev
+            assert new_config._env_cache_lock is not config._env_cache_lock
+            assert new_config.get_value("dev", "username") == config.dev.username
+
+        data = dataclasses.asdict(config)
+        assert data["data"] == config.data
+        assert data["version"] == config.version
+
+        # the env objects don't carry any config object state
+        for env in [
+            config.dev,
+            SlotsEnv(project_name="my_project", env_name="dev", username="alice"),
+        ]:
+            for new_env in [copy.deepcopy(env), pickle.loads(pickle.dumps(env))]:
+                assert new_env == env
+                assert type(new_env) is type(env)
+                assert not hasattr(new_env, "_env_cache")
+                assert not hasattr(new_env, "_path_index")
+
+    def test_get_all_envs(self):
+        config = ConfigTestCase(version="v1").config
+        config.clear_env_cache()
+        dev = config.get_env("dev")
+        envs = config.get_all_envs()
+        assert list(envs) == ["dev", "prod"]
+        assert envs["dev"] is dev
+        assert envs["prod"] is config.get_env("prod")
+        assert config.get_all_envs()["prod"] is envs["prod"]
+
+        private_envs = config.get_all_envs(private=True)
+        assert private_envs["dev"] is not dev
+        assert private_envs == envs
+
+        @dataclasses.dataclass
+        class FrozenConfig(Config):
+            freeze_merged = True
+
+        config_test_case = ConfigTestCase(version="v1")
+        config = FrozenConfig.read(
+            env_class=Env,
+            env_enum_class=EnvEnum,
+            path_config=config_test_case.path_config,
+            path_secret_config=config_test_case.path_secret_config,
+        )
+        assert config.get_all_envs() == envs
+
+    def test_prepare_deploy(self):
+        config = ConfigTestCase(version="v1").config
+        deployment_list = config.prepare_deploy()
+        assert [deployment.parameter_name for deployment in deployment_list] == [
+            "my_project",
+            "my_project-dev",
+            "my_project-prod",
+        ]
+        assert [deployment.env_name for deployment in deployment_list] == [
+            ALL,
+            "dev",
+            "prod",
+        ]
+        deployment = deployment_list[2]
+        assert deployment.project_name == "my_project"
+        assert deployment.parameter_data["data"] == {
+            "_shared": {
+                "*.project_name": "my_project",
+                "*.tags.project_name": "my_project_v1",
+                "prod.databases.port": 5432,
+                "*.servers.*.domain": "www.example.com",
+                "*.servers.*.cpu": 1,
+            },
+            "prod": config.data["prod"],
+        }
+        assert list(deployment.parameter_data["data"]["_shared"]) == [
+            "*.project_name",
+            "*.tags.project_name",
+            "prod.databases.port",
+            "*.servers.*.domain",
+            "*.servers.*.cpu",
+        ]
+        assert deployment.parameter_data["secret_data"] == {
+            "_shared": {},
+            "prod": config.secret_data["prod"],
+        }
+
+    def test_lazy_merge(self):
+        @dataclasses.dataclass
+        class LazyConfig(Config):
+            lazy_merge = True
+
+        config_test_case = ConfigTestCase(version="v1")
+        config = LazyConfig.read(
+            env_class=Env,
+            env_enum_class=EnvEnum,
+            path_config=config_test_case.path_config,
+            path_secret_config=config_test_case.path_secret_config,
+        )
+        assert config._merged == {}
+
+        # only the accessed environment is processed
+        dev = config.dev
+        assert list(config._merged) == ["dev"]
+        assert config._merged["dev"] == config_test_case.merged_data["dev"]
+        assert config._applied_data["dev"] == config_test_case.applied_data["dev"]
+        assert (
+            config._applied_secret_data["dev"]
+            == config_test_case.applied_secret_data["dev"]
+        )
+        assert dev == config_test_case.config.dev
+
+        assert config.prod == config_test_case.config.prod
+        assert config._merged == config_test_case.merged_data
+
+        with pytest.raises(KeyError):
+            config._get_merged("test")
+
+    def test_freeze_merged(self):
+        @dataclasses.dataclass
+        class FrozenConfig(Config):
+            freeze_merged = True
+
+        @dataclasses.dataclass
+        class LazyFrozenConfig(Config):
+            freeze_merged = True
+            lazy_merge = True
+
+        config_test_case = ConfigTestCase(version="v1")
+        for config_class in [FrozenConfig, LazyFrozenConfig]:
+            config = config_class.read(
+                env_class=Env,
+                env_enum_class=EnvEnum,
+                path_config=config_test_case.path_config,
+                path_secret_config=config_test_case.path_secret_config,
+            )
+            env_data = config.get_env_data("dev")
+            assert isinstance(env_data, FrozenDict)
+            assert config.get_env_data(EnvEnum.dev) is env_data
+            assert env_data.thaw() == config_test_case.merged_data["dev"]
+            assert config.dev == config_test_case.config.dev
+            assert config.prod == config_test_case.config.prod
+
+        # not frozen mode
+        env_data = config_test_case.config.get_env_data("dev")
+        assert isinstance(env_data, FrozenDict)
+        assert env_data.thaw() == config_test_case.merged_data["dev"]
+
+    def test_env_registry(self):
+        config_test_case = ConfigTestCase(version="v1")
+        config = Config.read(
+            env_class=Env,
+            path_config=config_test_case.path_config,
+            path_secret_config=config_test_case.path_secret_config,
+        )
+        assert isinstance(config.EnvEnum, EnvRegistry)
+        assert list(config.EnvEnum) == ["dev", "prod"]
+        # env is materialized lazily
+        assert config._merged == {}
+        assert config.get_env("dev") == config_test_case.config.dev
+        assert config.get_env(EnvEnum.dev) is config.get_env("dev")
+        assert list(config._merged) == ["dev"]
+        with pytest.raises(ValueError):
+            config.get_env("test")
+
+        assert config.prepare_deploy() == config_test_case.config.prepare_deploy()
+        assert config.get_all_envs() == config_test_case.config.get_all_envs()
+
+    def test_apply_merge_memo(self):
+        n_validate = 0
+
+        @dataclasses.dataclass
+        class MemoConfig(Config):
+            use_apply_merge_memo = True
+
+            def _validate(self):
+                nonlocal n_validate
+                n_validate += 1
+                super()._validate()
+
+        config_test_case = ConfigTestCase(version="v1")
+        apply_merge_memo.clear()
+        config1 = MemoConfig.read(
+            env_class=Env,
+            env_enum_class=EnvEnum,
+            path_config=config_test_case.path_config,
+            path_secret_config=config_test_case.path_secret_config,
+        )
+        config2 = MemoConfig.read(
+            env_class=Env,
+            env_enum_class=EnvEnum,
+            path_config=config_test_case.path_config,
+            path_secret_config=config_test_case.path_secret_config,
+        )
+        stats = apply_merge_memo.stats()
+        assert (stats.hits, stats.misses, stats.currsize) == (1, 1, 1)
+        # the input is validated on the memo hit as well
+        assert n_validate == 2
+        # each config object has its own copy of the memo value
+        assert config2._merged is not config1._merged
+        assert config2._merged == config_test_case.merged_data
+        assert config1.dev is not config2.dev
+        assert config1.dev == config2.dev
+        config1._merged["dev"]["username"] = "bob"
+        config1._applied_data["dev"]["username"] = "bob"
+        assert config2._merged == config_test_case.merged_data
+        assert config2._applied_data == config_test_case.applied_data
+
+        # different content is a different memo key
+        config_test_case = ConfigTestCase(version="v2")
+        config3 = MemoConfig.read(
+            env_class=Env,
+            env_enum_class=EnvEnum,
+            path_config=config_test_case.path_config,
+            path_secret_config=config_test_case.path_secret_config,
+        )
+        assert config3._merged is not config1._merged
+        assert apply_merge_memo.stats().misses == 2
+
+        # the frozen and the plain classes don't share the memo value
+        @dataclasses.dataclass
+        class FrozenMemoConfig(MemoConfig):
+            freeze_merged = True
+
+        configs = [
+            config_class.read(
+                env_class=Env,
+                env_enum_class=EnvEnum,
+                path_config=config_test_case.path_config,
+                path_secret_config=config_test_case.path_secret_config,
+            )
+            for config_class in [FrozenMemoConfig, MemoConfig, FrozenMemoConfig]
+        ]
+        frozen_config, plain_config, _ = configs
+        assert apply_merge_memo.stats().misses == 3
+        assert isinstance(frozen_config._merged["dev"], FrozenDict)
+        assert type(plain_config._merged["dev"]) is dict
+        assert plain_config.get_all_envs() == frozen_config.get_all_envs()
+        assert type(frozen_config.get_value("dev", "tags")) is dict
+        assert frozen_config.get_value("dev", "tags") == plain_config.get_value(
+            "dev", "tags"
+        )
+        apply_merge_memo.clear()
+
+    def test_get_value(self):
+        config_test_case = ConfigTestCase(version="v1")
+        config = config_test_case.config
+        config.clear_env_cache()
+        dev = config.dev
+        assert config.get_value("dev", "username") == dev.username
+        assert config.get_value(EnvEnum.dev, "env_name") == "dev"
+        assert config.get_value("dev", "servers.blue.domain") == "www.blue.com"
+        assert config.get_value("dev", "databases.0.port") == 3306
+        assert config.get_value("dev", "project_name") == "my_project"
+
+        # container value is a copy
+        tags = config.get_value("dev", "tags")
+        assert tags == {"env_name": "dev", "project_name": "my_project_v1"}
+        tags["env_name"] = "prod"
+        assert config.get_value("dev", "tags.env_name") == "dev"
+
+        with pytest.raises(KeyError):
+            config.get_value("dev", "servers.black")
+        assert config.get_value("dev", "servers.black", None) is None
+        with pytest.raises(ValueError):
+            config.get_value("test", "username")
+
+        assert list(config.iter_values("dev", "servers.blue.")) == [
+            ("servers.blue.cpu", 2),
+            ("servers.blue.domain", "www.blue.com"),
+            ("servers.blue.ip", "111.111.111.111"),
+            ("servers.blue.memory", 4),
+        ]
+        assert list(config.iter_values("dev", "servers.black.")) == []
+        assert dict(config.iter_values("dev"))["password"] == "dev.password"
+        assert list(config._path_index) == ["dev"]
+
+        config.clear_env_cache("dev")
+        assert config._path_index == {}
+
+    def test_dedup(self):
+        @dataclasses.dataclass
+        class DedupConfig(Config):
+            dedup_merged = True
+
+        config_test_case = ConfigTestCase(version="v1")
+        config = DedupConfig.read(
+            env_class=Env,
+            env_enum_class=EnvEnum,
+            path_config=config_test_case.path_config,
+            path_secret_config=config_test_case.path_secret_config,
+        )
+        assert thaw(freeze(config._merged)) == config_test_case.merged_data
+        assert config.dev == config_test_case.config.dev
+        assert config.get_all_envs() == config_test_case.config.get_all_envs()
+        assert config._merged["dev"]["tags"]["project_name"] is (
+            config._merged["prod"]["tags"]["project_name"]
+        )
+        # the shared subtrees are immutable
+        assert isinstance(config._merged["dev"]["tags"], FrozenDict)
+        assert type(config.get_value("dev", "tags")) is dict
+
+        config = ConfigTestCase(version="v1").config
+        stats = config.dedup()
+        assert stats.bytes_saved > 0
+        assert stats.bytes_after < stats.bytes_before
+        assert thaw(freeze(config._merged)) == config_test_case.merged_data
+        assert thaw(freeze(config._applied_data)) == config_test_case.applied_data
+
+    def test_lean_memory(self):
+        @dataclasses.dataclass
+        class LeanConfig(Config):
+            lean_memory = True
+
+        config_test_case = ConfigTestCase(version="v1")
+        config = LeanConfig.read(
+            env_class=Env,
+            env_enum_class=EnvEnum,
+            path_config=config_test_case.path_config,
+            path_secret_config=config_test_case.path_secret_config,
+        )
+        assert config._applied_data is None
+        assert config._applied_secret_data is None
+        assert "data" not in config.__dict__
+        assert config._merged == config_test_case.merged_data
+        assert config.dev == config_test_case.config.dev
+        assert config.data == config_test_case.config.data
+        assert config.secret_data == config_test_case.config.secret_data
+        # the released inputs are unpacked as a new copy on every access
+        assert type(config.data) is dict
+        config.data["dev"] = {}
+        assert config.data == config_test_case.config.data
+        assert config.prepare_deploy() == config_test_case.config.prepare_deploy()
+        assert config.project_name == "my_project"
+        with pytest.raises(AttributeError):
+            _ = config.not_exists
+        assert type(config_test_case.config.data) is dict
+
+        # the option can be turned on after the class is created, and the
+        # lean config is equal to the regular one
+        @dataclasses.dataclass
+        class LateLeanConfig(Config):
+            pass
+
+        kwargs = dict(
+            env_class=Env,
+            env_enum_class=EnvEnum,
+            path_config=config_test_case.path_config,
+            path_secret_config=config_test_case.path_secret_config,
+        )
+        regular_config = LateLeanConfig.read(**kwargs)
+        LateLeanConfig.lean_memory = True
+        lean_config = LateLeanConfig.read(**kwargs)
+        assert "data" not in lean_config.__dict__
+        assert lean_config.data == config_test_case.config.data
+        assert lean_config == regular_config
+        lean_dict = dataclasses.asdict(lean_config)
+        regular_dict = dataclasses.asdict(regular_config)
+        assert type(lean_dict["data"]) is dict
+        assert lean_dict["data"] == regular_dict["data"]
+        assert lean_dict["secret_data"] == regular_dict["secret_data"]
+
+        # the attribute error raised in the property is not masked
+        @dataclasses.dataclass
+        class PropertyConfig(Config):
+            @property
+            def broken(self):
+                return self.not_exists
+
+        config = PropertyConfig.read(
+            env_class=Env,
+            env_enum_class=EnvEnum,
+            path_config=config_test_case.path_config,
+            path_secret_config=config_test_case.path_secret_config,
+        )
+        with pytest.raises(AttributeError) as e:
+            _ = config.broken
+        assert "not_exists" in str(e.value)
+
+        # the footprint of the config object, the input is only held by the config
+        data = {
+            "_shared": {"*.project_name": "my_project", "*.tags.owner": "alice"},
+            "dev": {},
+            "prod": {},
+        }
+        secret_data = {"_shared": {}, "dev": {}, "prod": {}}
+        for env_name in ["dev", "prod"]:
+            data[env_name]["tags"] = {
+                f"key{ith}": f"{env_name}.value{ith}" for ith in range(1000)
+            }
+            secret_data[env_name]["password"] = f"{env_name}.password"
+        data_json = json.dumps(data)
+        secret_data_json = json.dumps(secret_data)
+
+        def measure(config_class) -> int:
+            tracemalloc.start()
+            config = config_class(
+                data=json.loads(data_json),
+                secret_data=json.loads(secret_data_json),
+                Env=Env,
+                EnvEnum=EnvEnum,
+                version="local",
+            )
+            size, _ = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            assert config.prod.tags["owner"] == "alice"
+            return size
+
+        # the string values are shared by all trees, only the containers are saved
+        assert measure(LeanConfig) < measure(Config) * 0.8
+
+        @dataclasses.dataclass
+        class LeanLazyConfig(LeanConfig):
+            lazy_merge = True
+
+        config = LeanLazyConfig.read(
+            env_class=Env,
+            env_enum_class=EnvEnum,
+            path_config=config_test_case.path_config,
+            path_secret_config=config_test_case.path_secret_config,
+        )
+        assert config.dev == config_test_case.config.dev
+        assert config._applied_data is None
+        assert config.data == config_test_case.config.data
+
+    def test_default_from_dict(self):
+        @dataclasses.dataclass
+        class DefaultEnv(BaseEnv):
+            username: T.Optional[str] = dataclasses.field(default=None)
+            password: T.Optional[str] = dataclasses.field(default=None)
+            tags: T.Dict[str, str] = dataclasses.field(default_factory=dict)
+            servers: T.Optional[Servers] = dataclasses.field(default=None)
+            databases: T.List[Database] = dataclasses.field(default_factory=list)
+
+        @add_slots
+        @dataclasses.dataclass
+        class SlotsEnv(BaseSlotsEnv):
+            username: T.Optional[str] = dataclasses.field(default=None)
+            password: T.Optional[str] = dataclasses.field(default=None)
+            tags: T.Dict[str, str] = dataclasses.field(default_factory=dict)
+            servers: T.Optional[Servers] = dataclasses.field(default=None)
+            databases: T.List[Database] = dataclasses.field(default_factory=list)
+
+        config_test_case = ConfigTestCase(version="v1")
+        expected = config_test_case.config.dev
+        for env_class in [DefaultEnv, SlotsEnv]:
+            config = Config.read(
+                env_class=env_class,
+                env_enum_class=EnvEnum,
+                path_config=config_test_case.path_config,
+                path_secret_config=config_test_case.path_secret_config,
+            )
+            dev = config.dev
+            assert isinstance(dev, env_class)
+            assert dev.servers == expected.servers
+            assert isinstance(dev.servers.blue, Server)
+            assert dev.databases == expected.databases
+            assert isinstance(dev.databases[0], Database)
+            assert dev.parameter_name == "my_project-dev"
+            assert dev.prefix_name_slug == "my-project-dev"
+
+        assert not hasattr(SlotsEnv(project_name="my_project"), "__dict__")
+        with pytest.raises(ValueError):
+            SlotsEnv(project_name="1-my-project")
+
+        with pytest.raises(TypeError):
+            DefaultEnv.from_dict({"username": "alice", "unknown": 1})
+
+
+class XorEncryptor:
+    def encrypt(self, data: bytes) -> bytes:
+        return base64.b64encode(bytes(b ^ 7 for b in data))
+
+    def decrypt(self, data: bytes) -> bytes:
+        return bytes(b ^ 7 for b in base64.b64decode(data))
+
 
 class TestDeployment(BaseMockTest):
     use_mock: bool = True
@@ -272,6 +944,7 @@ class TestDeployment(BaseMockTest):
             VersioningConfiguration={"Status": "Enabled"},
         )
         context.attach_boto_session(cls.bsm.boto_ses)
+        invalidate_bucket_version_status()
 
     @property
     def bsm_collection(self) -> T.Dict[str, BotoSesManager]:
@@ -728,12 +1401,648 @@ class TestDeployment(BaseMockTest):
                 s3folder_config=s3folder_config,
             )
 
-    def test(self):
+    def _test_iter_deploy(self):
+        s3folder_config = "s3://my-bucket/my-project-2/"
+        s3dir_config = S3Path(s3folder_config)
+        config_v1 = ConfigTestCase(version="v1").config
+
+        # arguments are validated before iteration
+        with pytest.raises(ValueError):
+            config_v1.iter_deploy(bsm=self.bsm)
+        with pytest.raises(ValueError):
+            config_v1.iter_delete(bsm=self.bsm)
+
+        # nothing is deployed until the iterator is consumed
+        iterator = config_v1.iter_deploy(bsm=self.bsm, s3folder_config=s3folder_config)
+        assert len(s3dir_config.iter_objects().all()) == 0
+        deployment = next(iterator)
+        assert deployment.env_name == ALL
+        assert deployment.deployment is not None
+        assert deployment.parameter_data["data"] == config_v1.data
+        assert len(s3dir_config.iter_objects().all()) == 2
+        assert [deployment.env_name for deployment in iterator] == ["dev", "prod"]
+        assert len(s3dir_config.iter_objects().all()) == 6
+
+        deployment_list = list(
+            config_v1.iter_delete(
+                bsm=self.bsm,
+                s3folder_config=s3folder_config,
+                include_history=True,
+            )
+        )
+        assert len(deployment_list) == 3
+        assert all(deployment.deletion for deployment in deployment_list)
+        assert len(s3dir_config.iter_objects().all()) == 0
+
+    def _test_env_registry(self):
+        s3folder_config = "s3://my-bucket/my-project-3/"
+        s3dir_config = S3Path(s3folder_config)
+        config_test_case = ConfigTestCase(version="v1")
+        config = Config.read(
+            env_class=Env,
+            env_enum_class=EnvRegistry(["dev", "prod"]),
+            path_config=config_test_case.path_config,
+            path_secret_config=config_test_case.path_secret_config,
+        )
+        deployment_list = config.deploy(bsm=self.bsm, s3folder_config=s3folder_config)
+        assert len(s3dir_config.iter_objects().all()) == 6
+        # the config data is released after the deployment
+        assert [deployment.parameter_data for deployment in deployment_list] == [
+            None
+        ] * 3
+        config.delete(
+            bsm=self.bsm, s3folder_config=s3folder_config, include_history=True
+        )
+        assert len(s3dir_config.iter_objects().all()) == 0
+
+    def _test_remote_read_cache(self):
+        s3folder_config = "s3://my-bucket/my-project-4/"
+        ConfigTestCase(version="v1").config.deploy(
+            bsm=self.bsm, s3folder_config=s3folder_config
+        )
+        remote_read_cache.clear()
+
+        def read(bsm: T.Optional[BotoSesManager] = None):
+            return Config.read(
+                env_class=Env,
+                env_enum_class=EnvEnum,
+                bsm=self.bsm if bsm is None else bsm,
+                parameter_name="my_project",
+                s3folder_config=s3folder_config,
+                cache_ttl=3600,
+            )
+
+        config = read()
+        assert config.version == "1"
+        assert read() is config
+        stats = remote_read_cache.stats()
+        assert (stats.hits, stats.misses) == (1, 1)
+        # the equivalent boto session manager shares the cache entry,
+        # and the cache key doesn't need any API call
+        bsm = BotoSesManager(region_name=self.region_name)
+        api_calls = list()
+        bsm.boto_ses.events.register(
+            "after-call", lambda model, **kwargs: api_calls.append(model.name)
+        )
+        assert read(bsm) is config
+        assert remote_read_cache.stats().currsize == 1
+        assert api_calls == []
+
+        # served from memory within the TTL
+        ConfigTestCase(version="v2").config.deploy(
+            bsm=self.bsm, s3folder_config=s3folder_config
+        )
+        assert read().version == "1"
+        remote_read_cache.clear()
+        assert read().version == "2"
+
+        ConfigTestCase(version="v2").config.delete(
+            bsm=self.bsm, s3folder_config=s3folder_config, include_history=True
+        )
+        remote_read_cache.clear()
+
+    def _test_disk_cache(self, tmp_path: Path):
+        s3folder_config = "s3://my-bucket/my-project-5/"
+        ConfigTestCase(version="v1").config.deploy(
+            bsm=self.bsm, s3folder_config=s3folder_config
+        )
+        remote_read_cache.clear()
+        disk_cache = DiskConfigCache(tmp_path, encryptor=XorEncryptor())
+
+        def read(**kwargs):
+            kwargs.setdefault("disk_cache", disk_cache)
+            kwargs.setdefault("bsm", self.bsm)
+            return Config.read(
+                env_class=Env,
+                env_enum_class=EnvEnum,
+                parameter_name="my_project",
+                s3folder_config=s3folder_config,
+                **kwargs,
+            )
+
+        config = read()
+        assert config.version == "1"
+        entry = disk_cache.load(f"s3:{s3folder_config}:my_project")
+        assert entry.version == "1"
+        assert entry.secret_omitted is False
+
+        # fall back to the last-known-good copy when S3 is unreachable
+        def unreachable(*args, **kwargs):
+            raise ConnectionError
+
+        with mock.patch.object(Config, "_read_remote", unreachable):
+            config = read()
+            assert config.version == "1"
+            assert (
+                config.get_env(EnvEnum.prod).password
+                == ConfigTestCase(version="v1").config.get_env(EnvEnum.prod).password
+            )
+            with pytest.raises(ConnectionError):
+                read(disk_cache=None)
+            with pytest.raises(ConnectionError):
+                read(disk_cache=DiskConfigCache(tmp_path.joinpath("empty")))
+
+        # throttling and server errors fall back as well
+        for code, status_code in [("SlowDown", 503), ("InternalError", 500)]:
+            error = ClientError(
+                {
+                    "Error": {"Code": code, "Message": ""},
+                    "ResponseMetadata": {"HTTPStatusCode": status_code},
+                },
+                "GetObject",
+            )
+            with mock.patch.object(
+                Config, "_read_remote", mock.Mock(side_effect=error)
+            ):
+                assert read().version == "1"
+
+        # the missing config and the other errors are not served from the disk
+        for error in [
+            exc.S3ObjectNotExist(),
+            ClientError(
+                {
+                    "Error": {"Code": "AccessDenied", "Message": ""},
+                    "ResponseMetadata": {"HTTPStatusCode": 403},
+                },
+                "GetObject",
+            ),
+            ValueError("bad config"),
+        ]:
+            with mock.patch.object(
+                Config, "_read_remote", mock.Mock(side_effect=error)
+            ):
+                with pytest.raises(type(error)):
+                    read()
+
+        # cold start from the disk, then revalidate in background
+        ConfigTestCase(version="v2").config.deploy(
+            bsm=self.bsm, s3folder_config=s3folder_config
+        )
+        # a new session starts from the disk without any API call
+        bsm = BotoSesManager(region_name=self.region_name)
+        api_calls = list()
+        bsm.boto_ses.events.register(
+            "after-call", lambda model, **kwargs: api_calls.append(model.name)
+        )
+        assert read(cache_ttl=3600, bsm=bsm).version == "1"
+        assert remote_read_cache.stats().misses == 0
+        assert api_calls == []
+        remote_read_cache.clear()
+        assert read(cache_ttl=0.001, cache_max_staleness=3600).version == "1"
+        assert remote_read_cache.stats().stale_hits == 1
+        start = time.time()
+        while read(cache_ttl=3600).version != "2":
+            assert time.time() - start < 5
+            time.sleep(0.001)
+        assert disk_cache.load(f"s3:{s3folder_config}:my_project").version == "2"
+
+        # the copy without secret data is not used for cold start
+        remote_read_cache.clear()
+        disk_cache = DiskConfigCache(tmp_path.joinpath("no-secret"))
+        read()
+        assert read(cache_ttl=3600).version == "2"
+        assert remote_read_cache.stats().misses == 1
+
+        # it is only used as the fallback if it is allowed explicitly
+        with mock.patch.object(Config, "_read_remote", unreachable):
+            with pytest.raises(ConnectionError):
+                read()
+            config = read(
+                disk_cache=DiskConfigCache(
+                    tmp_path.joinpath("no-secret"),
+                    allow_secret_omitted=True,
+                )
+            )
+            assert config.version == "2"
+            assert config.get_env(EnvEnum.prod).password is None
+
+        ConfigTestCase(version="v2").config.delete(
+            bsm=self.bsm, s3folder_config=s3folder_config, include_history=True
+        )
+        remote_read_cache.clear()
+
+    def _test_aread(self):
+        s3folder_config = "s3://my-bucket/my-project-6/"
+        config_v1 = ConfigTestCase(version="v1").config
+        config_v1.deploy(bsm=self.bsm, s3folder_config=s3folder_config)
+        config_v1.deploy(bsm=self.bsm, parameter_with_encryption=True)
+
+        async def main():
+            s3_config = await Config.aread(
+                env_class=Env,
+                env_enum_class=EnvEnum,
+                bsm=self.bsm,
+                parameter_name=config_v1.parameter_name,
+                s3folder_config=s3folder_config,
+            )
+            configs = await Config.aread_many(
+                [
+                    dict(
+                        env_class=Env,
+                        env_enum_class=EnvEnum,
+                        bsm=self.bsm,
+                        parameter_name=config_v1.parameter_name,
+                        parameter_with_encryption=True,
+                    ),
+                    dict(
+                        env_class=Env,
+                        env_enum_class=EnvEnum,
+                        path_config=ConfigTestCase(version="v2").path_config,
+                        path_secret_config=ConfigTestCase(version="v2").path_secret_config,
+                    ),
+                ],
+                max_concurrency=2,
+            )
+            config_data, config_version = await aread_config(
+                bsm=self.bsm,
+                s3folder_config=s3folder_config,
+                parameter_name=config_v1.parameter_name,
+            )
+            parameter_data, parameter_version = await aread_parameter(
+                bsm=self.bsm,
+                parameter_name=config_v1.parameter_name,
+                parameter_with_encryption=True,
+            )
+            with pytest.raises(exc.ParameterNotExists):
+                await aread_parameter(
+                    bsm=self.bsm,
+                    parameter_name="not-exists",
+                    parameter_with_encryption=True,
+                )
+            return s3_config, configs, config_data, parameter_data
+
+        s3_config, configs, config_data, parameter_data = asyncio.run(main())
+        assert s3_config.version == "1"
+        assert s3_config.data == config_v1.data
+        assert configs[0].version == "1"
+        assert configs[0].secret_data == config_v1.secret_data
+        assert configs[1].version == "local"
+        assert config_data["data"] == config_v1.data
+        assert parameter_data["secret_data"] == config_v1.secret_data
+
+        config_v1.delete(
+            bsm=self.bsm, s3folder_config=s3folder_config, include_history=True
+        )
+        config_v1.delete(bsm=self.bsm, use_parameter_store=True)
+
+    def _test_read_many(self):
+        config_v1 = ConfigTestCase(version="v1").config
+        config_v1.deploy(bsm=self.bsm, parameter_with_encryption=True)
+        parameter_value = json.dumps(
+            {"data": config_v1.data, "secret_data": config_v1.secret_data}
+        )
+        names = [f"/my-company/project{i}" for i in range(12)]
+        for name in names:
+            self.bsm.ssm_client.put_parameter(
+                Name=name, Value=parameter_value, Type="SecureString"
+            )
+
+        api_calls = list()
+
+        def record(model, **kwargs):
+            api_calls.append(model.name)
+
+        self.bsm.ssm_client.meta.events.register("after-call.ssm.*", record)
+        try:
+            configs = Config.read_many(
+                env_class=Env,
+                env_enum_class=EnvEnum,
+                bsm=self.bsm,
+                parameter_names=names + names[:2],
+            )
+            assert api_calls == ["GetParameters", "GetParameters"]
+            assert list(configs) == names
+            assert configs[names[0]].version == "1"
+            assert configs[names[0]].prod.password == config_v1.prod.password
+
+            api_calls.clear()
+            configs = Config.read_many(
+                env_class=Env,
+                env_enum_class=EnvEnum,
+                bsm=self.bsm,
+                parameter_path="/my-company",
+            )
+            assert set(api_calls) == {"GetParametersByPath"}
+            assert set(configs) == set(names)
+        finally:
+            self.bsm.ssm_client.meta.events.unregister("after-call.ssm.*", record)
+
+        # the per environment parameters of one project
+        per_env_names = [
+            deployment.parameter_name for deployment in config_v1.prepare_deploy()
+        ]
+        configs = Config.read_many(
+            env_class=Env,
+            bsm=self.bsm,
+            parameter_names=per_env_names,
+        )
+        assert configs[config_v1.prod.parameter_name].prod.password == (
+            config_v1.prod.password
+        )
+
+        with pytest.raises(exc.ParameterNotExists):
+            Config.read_many(
+                env_class=Env,
+                bsm=self.bsm,
+                parameter_names=["not-exists", names[0]],
+            )
+        configs = Config.read_many(
+            env_class=Env,
+            bsm=self.bsm,
+            parameter_names=["not-exists", names[0]],
+            ignore_missing=True,
+        )
+        assert list(configs) == [names[0]]
+        with pytest.raises(ValueError):
+            Config.read_many(env_class=Env, bsm=self.bsm)
+
+        self.bsm.ssm_client.delete_parameters(Names=names[:10])
+        self.bsm.ssm_client.delete_parameters(Names=names[10:])
+        config_v1.delete(bsm=self.bsm, use_parameter_store=True)
+
+    def _test_single_env_read(self):
+        s3folder_config = "s3://my-bucket/my-project-7/"
+        config_v1 = ConfigTestCase(version="v1").config
+        config_v1.deploy(bsm=self.bsm, s3folder_config=s3folder_config)
+        config_v1.deploy(bsm=self.bsm, parameter_with_encryption=True)
+
+        api_calls = list()
+
+        def record(params, **kwargs):
+            api_calls.append(params.get("Name", params.get("Key")))
+
+        events = [
+            (self.bsm.ssm_client, "provide-client-params.ssm"),
+            (self.bsm.s3_client, "provide-client-params.s3"),
+        ]
+        for client, event in events:
+            client.meta.events.register(event, record)
+
+        try:
+            for kwargs in [
+                dict(parameter_with_encryption=True),
+                dict(s3folder_config=s3folder_config),
+            ]:
+                api_calls.clear()
+                config = Config.read(
+                    env_class=Env,
+                    env_enum_class=EnvEnum,
+                    bsm=self.bsm,
+                    parameter_name=config_v1.parameter_name,
+                    env_name=EnvEnum.prod,
+                    **kwargs,
+                )
+                # only the per environment parameter is read
+                names = [name for name in api_calls if name is not None]
+                assert names
+                assert all("my_project-prod" in name for name in names)
+
+                assert list(config.EnvEnum) == ["prod"]
+                assert set(config.data) == {"_shared", "prod"}
+                assert config.prod.username == config_v1.prod.username
+                assert config.prod.password == config_v1.prod.password
+                assert config.get_env("prod") is config.prod
+                assert config.get_all_envs() == {"prod": config.prod}
+                with pytest.raises(ValueError):
+                    config.get_env(EnvEnum.dev)
+        finally:
+            for client, event in events:
+                client.meta.events.unregister(event, record)
+
+        # local files
+        config = Config.read(
+            env_class=Env,
+            path_config=ConfigTestCase(version="v1").path_config,
+            path_secret_config=ConfigTestCase(version="v1").path_secret_config,
+            env_name="dev",
+        )
+        assert set(config.data) == {"_shared", "dev"}
+        assert config.dev == config_v1.dev
+        with pytest.raises(ValueError):
+            Config.read(
+                env_class=Env,
+                env_enum_class=EnvEnum,
+                path_config=ConfigTestCase(version="v1").path_config,
+                path_secret_config=ConfigTestCase(version="v1").path_secret_config,
+                env_name="test",
+            )
+
+        config_v1.delete(
+            bsm=self.bsm, s3folder_config=s3folder_config, include_history=True
+        )
+        config_v1.delete(bsm=self.bsm, use_parameter_store=True)
+
+    def _test_read_version(self, tmp_path: Path):
+        s3folder_config = "s3://my-bucket/my-project-8/"
+        s3folder_config_versioned = "s3://my-versioned-bucket/my-project-8/"
+        config_v1 = ConfigTestCase(version="v1").config
+        config_v2 = ConfigTestCase(version="v2").config
+        version_ids = list()
+        for config in [config_v1, config_v2]:
+            config.deploy(bsm=self.bsm, s3folder_config=s3folder_config)
+            config.deploy(bsm=self.bsm, parameter_with_encryption=True)
+            deployments = config.deploy(
+                bsm=self.bsm, s3folder_config=s3folder_config_versioned
+            )
+            version_ids.append(deployments[0].deployment.version_id)
+        pinned_read_cache.clear()
+        disk_cache = DiskConfigCache(tmp_path, encryptor=XorEncryptor())
+
+        api_calls = list()
+
+        def record(model, **kwargs):
+            api_calls.append(model.name)
+
+        for client in [self.bsm.ssm_client, self.bsm.s3_client]:
+            client.meta.events.register("after-call", record)
+
+        cases = [
+            (dict(parameter_with_encryption=True), ["1", "2"]),
+            (dict(s3folder_config=s3folder_config), ["1", "2"]),
+            (dict(s3folder_config=s3folder_config_versioned), version_ids),
+        ]
+        try:
+            for kwargs, versions in cases:
+                for version, config in zip(versions, [config_v1, config_v2]):
+
+                    def read_version(bsm: T.Optional[BotoSesManager] = None):
+                        return Config.read_version(
+                            env_class=Env,
+                            env_enum_class=EnvEnum,
+                            version=version,
+                            bsm=self.bsm if bsm is None else bsm,
+                            parameter_name=config.parameter_name,
+                            disk_cache=disk_cache,
+                            **kwargs,
+                        )
+
+                    api_calls.clear()
+                    pinned = read_version()
+                    assert api_calls
+                    assert pinned.version == version
+                    assert pinned.data == config.data
+                    assert pinned.prod.password == config.prod.password
+
+                    # never fetched again
+                    api_calls.clear()
+                    assert read_version() is pinned
+                    assert api_calls == []
+
+                    # a new process reads it from the disk, even the new
+                    # session doesn't call any API
+                    pinned_read_cache.clear()
+                    bsm = BotoSesManager(region_name=self.region_name)
+                    bsm.boto_ses.events.register("after-call", record)
+                    assert read_version(bsm).data == config.data
+                    assert api_calls == []
+
+            with pytest.raises(exc.ParameterNotExists):
+                Config.read_version(
+                    env_class=Env,
+                    version=3,
+                    bsm=self.bsm,
+                    parameter_name=config_v1.parameter_name,
+                    parameter_with_encryption=True,
+                )
+            with pytest.raises(exc.S3ObjectNotExist):
+                Config.read_version(
+                    env_class=Env,
+                    version=3,
+                    bsm=self.bsm,
+                    parameter_name=config_v1.parameter_name,
+                    s3folder_config=s3folder_config,
+                )
+            with pytest.raises(ValueError):
+                Config.read_version(
+                    env_class=Env,
+                    version=1,
+                    bsm=self.bsm,
+                    parameter_name=config_v1.parameter_name,
+                )
+        finally:
+            for client in [self.bsm.ssm_client, self.bsm.s3_client]:
+                client.meta.events.unregister("after-call", record)
+
+        pinned_read_cache.clear()
+        for s3folder in [s3folder_config, s3folder_config_versioned]:
+            config_v2.delete(
+                bsm=self.bsm, s3folder_config=s3folder, include_history=True
+            )
+        config_v2.delete(bsm=self.bsm, use_parameter_store=True)
+
+    def _test_replicas(self):
+        bsm_replica = BotoSesManager(region_name="us-west-2")
+        bsm_replica.s3_client.create_bucket(
+            Bucket="my-replica-bucket",
+            CreateBucketConfiguration={"LocationConstraint": "us-west-2"},
+        )
+        s3folder_config = "s3://my-bucket/my-project-9/"
+        s3folder_config_replica = "s3://my-replica-bucket/my-project-9/"
+        config_v1 = ConfigTestCase(version="v1").config
+        config_v1.deploy(bsm=bsm_replica, s3folder_config=s3folder_config_replica)
+        config_v1.deploy(bsm=bsm_replica, parameter_with_encryption=True)
+        replica_latency.clear()
+        # a new session to read, record its API calls
+        bsm_replica = BotoSesManager(region_name="us-west-2")
+        api_calls = list()
+        bsm_replica.boto_ses.events.register(
+            "after-call", lambda model, **kwargs: api_calls.append(model.name)
+        )
+
+        # the first replica doesn't have the config, the second one serves
+        for kwargs, replicas in [
+            (
+                dict(parameter_with_encryption=True),
+                [(self.bsm, None), (bsm_replica, None)],
+            ),
+            (
+                dict(),
+                [
+                    (self.bsm, s3folder_config),
+                    (bsm_replica, s3folder_config_replica),
+                ],
+            ),
+        ]:
+            config = Config.read(
+                env_class=Env,
+                env_enum_class=EnvEnum,
+                parameter_name=config_v1.parameter_name,
+                replicas=replicas,
+                **kwargs,
+            )
+            assert config.version == "1"
+            assert config.prod.password == config_v1.prod.password
+            keys = [_get_replica_key(bsm, location) for bsm, location in replicas]
+            start = time.time()
+            while replica_latency.percentile(keys[0], 0.5) is None:
+                assert time.time() - start < 5
+                time.sleep(0.001)
+            assert replica_latency.percentile(keys[0], 0.5) == float("inf")
+            assert replica_latency.count(keys[1]) == 1
+
+            # the failed replica is tried last
+            config = Config.read(
+                env_class=Env,
+                env_enum_class=EnvEnum,
+                parameter_name=config_v1.parameter_name,
+                replicas=replicas,
+                cache_ttl=3600,
+                **kwargs,
+            )
+            assert config.version == "1"
+            assert replica_latency.count(keys[1]) == 2
+            assert replica_latency.count(keys[0]) == 1
+            remote_read_cache.clear()
+
+        # the replica keys don't need the STS call of a new session
+        assert "GetCallerIdentity" not in api_calls
+
+        with pytest.raises(exc.ParameterNotExists):
+            Config.read(
+                env_class=Env,
+                parameter_name="not-exists",
+                parameter_with_encryption=True,
+                replicas=[(self.bsm, None), (bsm_replica, None)],
+            )
+        with pytest.raises(ValueError):
+            Config.read(
+                env_class=Env,
+                parameter_name=config_v1.parameter_name,
+                bsm=self.bsm,
+                parameter_with_encryption=True,
+                replicas=[(bsm_replica, None)],
+            )
+        with pytest.raises(ValueError):
+            Config.read(
+                env_class=Env,
+                parameter_name=config_v1.parameter_name,
+                parameter_with_encryption=True,
+                replicas=[],
+            )
+
+        config_v1.delete(
+            bsm=bsm_replica,
+            s3folder_config=s3folder_config_replica,
+            include_history=True,
+        )
+        config_v1.delete(bsm=bsm_replica, use_parameter_store=True)
+        replica_latency.clear()
+
+    def test(self, tmp_path):
         print("")
         with logger.disabled(
             disable=True,
             # disable=False,
         ):
+            self._test_iter_deploy()
+            self._test_env_registry()
+            self._test_remote_read_cache()
+            self._test_disk_cache(tmp_path)
+            self._test_aread()
+            self._test_read_many()
+            self._test_single_env_read()
+            self._test_read_version(tmp_path)
+            self._test_replicas()
             self._test_ssm_backend()
             self._test_s3_backend_version_not_enabled()
             self._test_s3_backend_version_not_enabled_use_different_s3folder()
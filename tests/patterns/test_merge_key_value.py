@@ -1,7 +1,10 @@
 # -*- coding: utf-8 -*-
 
 import pytest
-from config_patterns.patterns.merge_key_value.api import merge_key_value
+from config_patterns.patterns.merge_key_value.api import (
+    copy_tree,
+    merge_key_value,
+)
 
 
 def test_merge_key_value():
@@ -71,6 +74,69 @@ def test_merge_key_value():
         merge_key_value({"value": 1}, {"value": 2})
 
 
+def make_deep_data(depth: int, key: str, value: str) -> dict:
+    data = {key: value}
+    for _ in range(depth):
+        data = {"node": data}
+    return data
+
+
+def test_merge_key_value_error_path():
+    with pytest.raises(ValueError) as e:
+        merge_key_value(
+            {"a": {"b": {"tags": [{}]}}},
+            {"a": {"b": {"tags": [{}, {}]}}},
+        )
+    assert "path = '.a.b.tags'" in str(e.value)
+
+    with pytest.raises(TypeError) as e:
+        merge_key_value({"a": {"values": [1, 2]}}, {"a": {"values": [2, 3]}})
+    assert "items in '.a.values' are not dict" in str(e.value)
+
+    with pytest.raises(TypeError) as e:
+        merge_key_value({"a": {"b": 1}}, {"a": {"b": 2}})
+    assert "type of value at '.a.b'" in str(e.value)
+
+
+def test_merge_key_value_not_modify_input():
+    data1 = {"a": {"b": 1}, "l": [{"x": 1}]}
+    data2 = {"a": {"c": 2}, "l": [{"y": 2}], "d": {"e": [1]}}
+    data = merge_key_value(data1, data2)
+    assert data == {"a": {"b": 1, "c": 2}, "l": [{"x": 1, "y": 2}], "d": {"e": [1]}}
+    assert data1 == {"a": {"b": 1}, "l": [{"x": 1}]}
+    assert data2 == {"a": {"c": 2}, "l": [{"y": 2}], "d": {"e": [1]}}
+    data["d"]["e"].append(2)
+    assert data2["d"]["e"] == [1]
+
+
+def test_merge_key_value_deep_nested():
+    # deeper than the default recursion limit
+    depth = 5000
+    data = merge_key_value(
+        make_deep_data(depth, "username", "alice"),
+        make_deep_data(depth, "password", "alice.pwd"),
+    )
+    for _ in range(depth):
+        data = data["node"]
+    assert data == {"username": "alice", "password": "alice.pwd"}
+
+
+def test_copy_tree():
+    data = {"a": [{"b": 1}, [2, 3]], "c": "d"}
+    new_data = copy_tree(data)
+    assert new_data == data
+    assert new_data is not data
+    assert new_data["a"] is not data["a"]
+    assert new_data["a"][0] is not data["a"][0]
+    assert new_data["a"][1] is not data["a"][1]
+    assert copy_tree(1) == 1
+
+    new_data = copy_tree(make_deep_data(5000, "key", "value"))
+    for _ in range(5000):
+        new_data = new_data["node"]
+    assert new_data == {"key": "value"}
+
+
 if __name__ == "__main__":
     from config_patterns.tests import run_cov_test
 
@@ -0,0 +1,43 @@
+# -*- coding: utf-8 -*-
+
+import time
+import asyncio
+import threading
+
+import pytest
+
+from config_patterns.aio import run_in_executor, gather_with_concurrency
+
+
+def test_gather_with_concurrency():
+    lock = threading.Lock()
+    running = 0
+    max_running = 0
+
+    def work(i: int) -> int:
+        nonlocal running, max_running
+        with lock:
+            running += 1
+            max_running = max(max_running, running)
+        time.sleep(0.01)
+        with lock:
+            running -= 1
+        return i * i
+
+    async def main():
+        return await gather_with_concurrency(
+            [run_in_executor(work, i) for i in range(12)],
+            max_concurrency=3,
+        )
+
+    assert asyncio.run(main()) == [i * i for i in range(12)]
+    assert 1 <= max_running <= 3
+
+    with pytest.raises(ValueError):
+        asyncio.run(gather_with_concurrency([], max_concurrency=0))
+
+
+if __name__ == "__main__":
+    from config_patterns.tests import run_cov_test
+
+    run_cov_test(__file__, "config_patterns.aio", preview=False)
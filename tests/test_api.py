@@ -13,11 +13,21 @@ def test():
 
     _ = api.multi_env_json
     _ = api.multi_env_json.ALL
+    _ = api.multi_env_json.apply_merge_memo
+    _ = api.multi_env_json.remote_read_cache
+    _ = api.multi_env_json.pinned_read_cache
+    _ = api.multi_env_json.replica_latency
     _ = api.multi_env_json.BaseEnvEnum
+    _ = api.multi_env_json.EnvRegistry
+    _ = api.multi_env_json.BaseEnvMixin
     _ = api.multi_env_json.BaseEnv
+    _ = api.multi_env_json.BaseSlotsEnv
     _ = api.multi_env_json.BaseConfig
     _ = api.multi_env_json.normalize_parameter_name
     _ = api.multi_env_json.ConfigDeployment
+    _ = api.multi_env_json.ConfigSnapshot
+    _ = api.multi_env_json.ConfigHandle
+    _ = api.multi_env_json.DiskConfigCache
 
 
 if __name__ == "__main__":
@@ -0,0 +1,254 @@
+# -*- coding: utf-8 -*-
+
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from config_patterns.cache import LRUCache, TTLCache, cached_property
+
+
+class TestLRUCache:
+    def test(self):
+        cache = LRUCache(maxsize=2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        assert cache.get("a") == 1
+        cache.put("c", 3)  # "b" is the least recently used
+        assert "b" not in cache
+        assert cache.get("b") is None
+        assert cache.get("b", 0) == 0
+        assert cache.get("c") == 3
+        assert len(cache) == 2
+
+        stats = cache.stats()
+        assert (stats.hits, stats.misses, stats.maxsize, stats.currsize) == (
+            2,
+            2,
+            2,
+            2,
+        )
+        assert stats.hit_rate == 0.5
+
+        cache.resize(1)
+        assert len(cache) == 1
+        assert "c" in cache
+
+        cache.clear()
+        assert len(cache) == 0
+        assert cache.stats().hit_rate == 0.0
+
+        with pytest.raises(ValueError):
+            LRUCache(maxsize=0)
+        with pytest.raises(ValueError):
+            cache.resize(0)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def wait_for(predicate, timeout: float = 5.0):
+    start = time.time()
+    while predicate() is False:
+        if time.time() - start > timeout:  # pragma: no cover
+            raise TimeoutError
+        time.sleep(0.001)
+
+
+class TestTTLCache:
+    def test(self):
+        clock = FakeClock()
+        cache = TTLCache(clock=clock)
+        versions = iter(range(1, 100))
+
+        def loader():
+            return next(versions)
+
+        assert cache.get("a", loader, ttl=10, max_staleness=60) == 1
+        clock.now = 9
+        assert cache.get("a", loader, ttl=10, max_staleness=60) == 1
+        assert "a" in cache
+        assert len(cache) == 1
+
+        # stale value is returned, then it is refreshed in background
+        clock.now = 20
+        assert cache.get("a", loader, ttl=10, max_staleness=60) == 1
+        wait_for(lambda: cache._entries["a"].value == 2)
+        assert cache.get("a", loader, ttl=10, max_staleness=60) == 2
+        stats = cache.stats()
+        assert (stats.hits, stats.stale_hits, stats.misses) == (2, 1, 1)
+
+        # too stale, wait for the loader
+        clock.now = 100
+        assert cache.get("a", loader, ttl=10, max_staleness=60) == 3
+
+        # no stale value without max_staleness
+        clock.now = 111
+        assert cache.get("a", loader, ttl=10) == 4
+
+        # refresh error keeps the stale value
+        def failed_loader():
+            raise ConnectionError
+
+        clock.now = 125
+        assert cache.get("a", failed_loader, ttl=10, max_staleness=60) == 4
+        wait_for(lambda: cache.stats().refresh_errors == 1)
+        assert cache._refreshing == set()
+        assert cache.get("a", loader, ttl=10, max_staleness=60) == 4
+
+        # error is raised to the caller who waits for the loader
+        with pytest.raises(ConnectionError):
+            cache.get("b", failed_loader, ttl=10)
+        assert "b" not in cache
+
+        # seeded value is as old as the given age
+        cache.put("c", "seed", age=30)
+        assert cache.get("c", loader, ttl=10, max_staleness=60) == "seed"
+        assert cache.stats().stale_hits == 4
+        wait_for(lambda: cache._entries["c"].value != "seed")
+
+        cache.invalidate("a")
+        assert "a" not in cache
+        with pytest.raises(ValueError):
+            cache.get("a", loader, ttl=10, max_staleness=5)
+        cache.clear()
+        assert cache.stats().misses == 0
+
+    def test_maxsize(self):
+        cache = TTLCache(maxsize=2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        # "a" becomes the most recently used one
+        assert cache.get("a", lambda: 0, ttl=60) == 1
+        cache.put("c", 3)
+        assert "b" not in cache
+        assert cache.get("d", lambda: 4, ttl=60) == 4
+        assert list(cache._entries) == ["c", "d"]
+        stats = cache.stats()
+        assert (stats.maxsize, stats.currsize) == (2, 2)
+
+        cache.resize(1)
+        assert list(cache._entries) == ["d"]
+        with pytest.raises(ValueError):
+            cache.resize(0)
+        with pytest.raises(ValueError):
+            TTLCache(maxsize=0)
+
+    def test_thread_safe(self):
+        cache = TTLCache(maxsize=8)
+
+        def work(i: int):
+            key = i % 16
+            assert cache.get(key, lambda: key, ttl=60) == key
+            if i % 7 == 0:
+                cache.invalidate(key)
+            if i % 5 == 0:
+                cache.put(key, key)
+
+        with ThreadPoolExecutor(max_workers=16) as executor:
+            list(executor.map(work, range(2000)))
+        stats = cache.stats()
+        assert stats.currsize <= 8
+        assert stats.hits + stats.misses == 2000
+
+    def test_single_flight(self):
+        cache = TTLCache()
+        n_call = 0
+        barrier = threading.Barrier(16)
+
+        def loader():
+            nonlocal n_call
+            n_call += 1
+            time.sleep(0.05)
+            return "value"
+
+        def get(_):
+            barrier.wait()
+            return cache.get("key", loader, ttl=60)
+
+        with ThreadPoolExecutor(max_workers=16) as executor:
+            assert set(executor.map(get, range(16))) == {"value"}
+        assert n_call == 1
+
+
+class Counter:
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.n_call = 0
+
+    @cached_property
+    def value(self) -> int:
+        """The value."""
+        self.n_call += 1
+        time.sleep(self.delay)
+        return self.n_call
+
+    @cached_property
+    def error(self) -> int:
+        self.n_call += 1
+        raise ValueError
+
+
+class SlotsCounter:
+    __slots__ = ("n_call",)
+
+    @cached_property
+    def value(self) -> int:
+        return 1
+
+
+class TestCachedProperty:
+    def test(self):
+        counter = Counter()
+        assert counter.value == 1
+        assert counter.value == 1
+        assert counter.__dict__["value"] == 1
+        assert counter.n_call == 1
+        assert Counter.value.__doc__ == "The value."
+        assert isinstance(Counter.value, cached_property)
+
+        # the exception is not cached
+        with pytest.raises(ValueError):
+            _ = counter.error
+        with pytest.raises(ValueError):
+            _ = counter.error
+        assert counter.n_call == 3
+        assert Counter.value._instance_locks == {}
+
+        with pytest.raises(TypeError):
+            _ = SlotsCounter().value
+
+        # Python < 3.12 wraps the __set_name__ error in RuntimeError
+        with pytest.raises((TypeError, RuntimeError)):
+
+            class Dummy:
+                a = b = cached_property(lambda self: 1)
+
+    def test_stress(self):
+        n_thread = 32
+        counters = [Counter(delay=0.01) for _ in range(8)]
+        barrier = threading.Barrier(n_thread)
+
+        def read(ith: int) -> int:
+            barrier.wait()
+            return sum(counter.value for counter in counters[ith % 2 :])
+
+        with ThreadPoolExecutor(max_workers=n_thread) as executor:
+            results = list(executor.map(read, range(n_thread)))
+        assert set(results[::2]) == {8}
+        assert set(results[1::2]) == {7}
+        # computed only once per instance
+        assert [counter.n_call for counter in counters] == [1] * 8
+        assert Counter.value._instance_locks == {}
+
+
+if __name__ == "__main__":
+    from config_patterns.tests import run_cov_test
+
+    run_cov_test(__file__, "config_patterns.cache", preview=False)
@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+
+import typing as T
+import dataclasses
+
+import pytest
+
+from config_patterns.dataclass_utils import compile_from_dict, add_slots
+
+
+@dataclasses.dataclass
+class Database:
+    host: T.Optional[str] = dataclasses.field(default=None)
+    port: T.Optional[int] = dataclasses.field(default=None)
+
+
+@dataclasses.dataclass
+class Server:
+    ip: T.Optional[str] = dataclasses.field(default=None)
+
+    @classmethod
+    def from_dict(cls, data: dict):
+        return cls(ip=data["ip"].strip())
+
+
+@dataclasses.dataclass
+class Node:
+    name: str = dataclasses.field()
+    children: T.List["Node"] = dataclasses.field(default_factory=list)
+
+
+@dataclasses.dataclass
+class Env:
+    username: T.Optional[str] = dataclasses.field(default=None)
+    tags: T.Dict[str, str] = dataclasses.field(default_factory=dict)
+    database: T.Optional[Database] = dataclasses.field(default=None)
+    databases: T.List[Database] = dataclasses.field(default_factory=list)
+    servers: T.Dict[str, Server] = dataclasses.field(default_factory=dict)
+    replicas: T.Tuple[Database, ...] = dataclasses.field(default_factory=tuple)
+    counter: int = dataclasses.field(default=0, init=False)
+
+
+def test_compile_from_dict():
+    from_dict = compile_from_dict(Env)
+    assert compile_from_dict(Env) is from_dict  # cached
+
+    data = {
+        "username": "alice",
+        "tags": {"env": "dev"},
+        "database": {"host": "db.com", "port": 5432},
+        "databases": [{"host": "db1.com"}, {"host": "db2.com"}],
+        "servers": {"blue": {"ip": " 1.1.1.1 "}},
+        "replicas": [{"host": "replica.com"}],
+    }
+    env = from_dict(data)
+    assert env.username == "alice"
+    assert env.tags == {"env": "dev"}
+    assert env.database == Database(host="db.com", port=5432)
+    assert env.databases == [Database(host="db1.com"), Database(host="db2.com")]
+    assert env.servers == {"blue": Server(ip="1.1.1.1")}
+    assert env.replicas == [Database(host="replica.com")]
+    # the input is not modified
+    assert data["database"] == {"host": "db.com", "port": 5432}
+
+    # missing and None value
+    env = from_dict({"database": None})
+    assert env.database is None
+    assert env.databases == []
+
+    # already converted value is used as it is
+    database = Database(host="db.com")
+    assert from_dict({"database": database}).database is database
+
+    with pytest.raises(TypeError) as e:
+        from_dict({"username": "alice", "counter": 1})
+    assert "unexpected keyword argument 'counter'" in str(e.value)
+
+    # recursive dataclass
+    node = compile_from_dict(Node)(
+        {"name": "root", "children": [{"name": "leaf", "children": []}]}
+    )
+    assert node.children[0] == Node(name="leaf")
+
+
+@add_slots
+@dataclasses.dataclass
+class SlotsDatabase:
+    host: T.Optional[str] = dataclasses.field(default=None)
+    port: int = dataclasses.field(default=5432)
+
+
+def test_add_slots():
+    database = SlotsDatabase(host="db.com")
+    assert database.port == 5432
+    assert database == SlotsDatabase(host="db.com", port=5432)
+    assert not hasattr(database, "__dict__")
+    with pytest.raises(AttributeError):
+        database.user = "admin"
+    assert compile_from_dict(SlotsDatabase)({"host": "db.com"}) == database
+
+
+if __name__ == "__main__":
+    from config_patterns.tests import run_cov_test
+
+    run_cov_test(__file__, "config_patterns.dataclass_utils", preview=False)
@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+
+import json
+import time
+import base64
+
+from config_patterns.disk_cache import DiskConfigCache
+
+
+class XorEncryptor:
+    def __init__(self, key: int):
+        self.key = key
+
+    def encrypt(self, data: bytes) -> bytes:
+        return base64.b64encode(bytes(b ^ self.key for b in data))
+
+    def decrypt(self, data: bytes) -> bytes:
+        return bytes(b ^ self.key for b in base64.b64decode(data))
+
+
+data = {"_shared": {"*.project_name": "my_project"}, "dev": {"username": "alice"}}
+secret_data = {"_shared": {}, "dev": {"password": "dev.password"}}
+
+
+class TestDiskConfigCache:
+    def test_encrypted(self, tmp_path):
+        dir_cache = tmp_path.joinpath("disk_cache")
+        disk_cache = DiskConfigCache(dir_cache, encryptor=XorEncryptor(7))
+        assert disk_cache.load("ssm:my_project") is None
+
+        assert disk_cache.save("ssm:my_project", data, secret_data, "1") is True
+        # the same config is not written again
+        assert disk_cache.save("ssm:my_project", data, secret_data, "1") is False
+        path = disk_cache.get_path("ssm:my_project")
+        assert "dev.password" not in path.read_text()
+        assert [p.name for p in dir_cache.iterdir()] == [path.name]
+
+        entry = DiskConfigCache(dir_cache, encryptor=XorEncryptor(7)).load(
+            "ssm:my_project"
+        )
+        assert entry.data == data
+        assert entry.secret_data == secret_data
+        assert entry.version == "1"
+        assert entry.secret_omitted is False
+        assert 0 <= entry.age < 60
+        assert entry.saved_at <= time.time()
+
+        # cannot decrypt
+        assert DiskConfigCache(dir_cache).load("ssm:my_project") is None
+        assert (
+            DiskConfigCache(dir_cache, encryptor=XorEncryptor(8)).load(
+                "ssm:my_project"
+            )
+            is None
+        )
+
+        disk_cache.delete("ssm:my_project")
+        disk_cache.delete("ssm:my_project")
+        assert disk_cache.load("ssm:my_project") is None
+
+    def test_secret_omitted(self, tmp_path):
+        dir_cache = tmp_path.joinpath("disk_cache")
+        disk_cache = DiskConfigCache(dir_cache)
+        disk_cache.save("ssm:my_project", data, secret_data, "1")
+        assert "dev.password" not in disk_cache.get_path("ssm:my_project").read_text()
+        entry = disk_cache.load("ssm:my_project")
+        assert entry.data == data
+        assert entry.secret_data == {"_shared": {}, "dev": {}}
+        assert entry.secret_omitted is True
+
+        disk_cache.save("ssm:my_project", data, {"_shared": {}, "dev": {}}, "2")
+        entry = disk_cache.load("ssm:my_project")
+        assert entry.version == "2"
+        assert entry.secret_omitted is False
+
+    def test_corrupted(self, tmp_path):
+        dir_cache = tmp_path.joinpath("disk_cache")
+        disk_cache = DiskConfigCache(dir_cache)
+        disk_cache.save("ssm:my_project", data, secret_data, "1")
+        path = disk_cache.get_path("ssm:my_project")
+
+        content = json.loads(path.read_text())
+        content["body"] = content["body"].replace("alice", "bob")
+        path.write_text(json.dumps(content))
+        assert disk_cache.load("ssm:my_project") is None
+
+        path.write_text(path.read_text()[:10])
+        assert disk_cache.load("ssm:my_project") is None
+
+
+if __name__ == "__main__":
+    from config_patterns.tests import run_cov_test
+
+    run_cov_test(__file__, "config_patterns.disk_cache", preview=False)
@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+
+import copy
+import math
+import sys
+import pickle
+
+import pytest
+
+from config_patterns.frozen import FrozenDict, freeze, thaw, dedup, deep_sizeof
+
+
+class NotJson:
+    def __init__(self, value):
+        self.value = value
+
+
+def test_freeze_and_thaw():
+    data = {
+        "username": "alice",
+        "tags": {"env": "dev"},
+        "databases": [{"host": "db1.com", "port": 5432}, {"host": "db2.com"}],
+        "ports": [1, 2],
+    }
+    frozen = freeze(data)
+    assert isinstance(frozen, FrozenDict)
+    assert isinstance(frozen["tags"], FrozenDict)
+    assert isinstance(frozen["databases"], tuple)
+    assert isinstance(frozen["databases"][0], FrozenDict)
+    assert frozen["ports"] == (1, 2)
+    assert len(frozen) == 4
+    assert "username" in frozen
+    assert list(frozen) == list(data)
+    assert freeze(frozen) is frozen
+    assert "FrozenDict" in repr(frozen)
+
+    # read-only
+    with pytest.raises(TypeError):
+        frozen["username"] = "bob"
+    with pytest.raises(AttributeError):
+        frozen.update({"username": "bob"})
+
+    # hashable, copy returns itself
+    assert hash(frozen) == hash(freeze(data))
+    assert copy.copy(frozen) is frozen
+    assert copy.deepcopy(frozen) is frozen
+    assert pickle.loads(pickle.dumps(frozen)) == frozen
+
+    # thaw always returns a new mutable tree
+    thawed1 = thaw(frozen)
+    thawed2 = frozen.thaw()
+    assert thawed1 == data
+    assert thawed2 == data
+    assert thawed1 is not thawed2
+    thawed1["databases"][0]["host"] = "changed"
+    assert frozen.thaw() == data
+    assert thaw(frozen["ports"]) == [1, 2]
+    assert thaw(1) == 1
+
+
+def test_thaw_not_json_value():
+    frozen = freeze({"obj": NotJson(1)})
+    thawed = frozen.thaw()
+    assert thawed["obj"].value == 1
+    assert frozen.thaw()["obj"] is not thawed["obj"]
+
+
+def test_dedup():
+    data = {
+        "dev": {"tags": {"a": 1}, "ports": [1, 2], "flags": [1, True, 1.0]},
+        "prod": {"tags": {"a": 1}, "ports": [1, 2], "flags": [True]},
+        "test": {"tags": {"a": True}, "ports": [2, 1]},
+    }
+    tree = dedup(data)
+    assert tree == freeze(data)
+    assert thaw(tree) == data
+    # the shared subtrees are immutable
+    assert isinstance(tree["dev"]["tags"], FrozenDict)
+    assert tree["dev"]["ports"] == (1, 2)
+    assert data["dev"]["tags"] is not data["prod"]["tags"]  # input not modified
+    assert tree["dev"]["tags"] is tree["prod"]["tags"]
+    assert tree["dev"]["ports"] is tree["prod"]["ports"]
+    # different type or order is not merged
+    assert tree["test"]["tags"] is not tree["dev"]["tags"]
+    assert tree["test"]["ports"] is not tree["dev"]["ports"]
+    assert tree["dev"]["flags"][1] is True
+    assert tree["prod"]["flags"][0] is True
+    assert type(tree["dev"]["flags"][2]) is float
+    assert deep_sizeof(tree) < deep_sizeof(freeze(data))
+
+    # frozen tree and shared memo
+    memo = dict()
+    frozen1 = dedup(freeze(data["dev"]), memo)
+    frozen2 = dedup(freeze(data["prod"]), memo)
+    assert isinstance(frozen1, FrozenDict)
+    assert frozen1["tags"] is frozen2["tags"]
+    assert frozen1["ports"] is frozen2["ports"]
+
+    # the negative zero is not merged with zero
+    tree = dedup({"a": 0.0, "b": -0.0})
+    assert math.copysign(1.0, tree["a"]) == 1.0
+    assert math.copysign(1.0, tree["b"]) == -1.0
+
+    # not hashable value is kept as it is
+    obj = NotJson(1)
+    assert dedup({"obj": obj})["obj"] is obj
+
+    # deeply nested tree doesn't hit the recursion limit
+    depth = sys.getrecursionlimit() * 10
+    data = {"leaf": 1}
+    for _ in range(depth):
+        data = {"child": [data, {"leaf": 1}]}
+    node = dedup(data)
+    leaf = node["child"][1]
+    assert leaf == FrozenDict({"leaf": 1})
+    for _ in range(depth):
+        assert node["child"][1] is leaf
+        node = node["child"][0]
+    assert node is leaf
+
+
+if __name__ == "__main__":
+    from config_patterns.tests import run_cov_test
+
+    run_cov_test(__file__, "config_patterns.frozen", preview=False)
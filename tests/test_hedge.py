@@ -0,0 +1,154 @@
+# -*- coding: utf-8 -*-
+
+import math
+import time
+
+import pytest
+
+from config_patterns.hedge import LatencyTracker, hedged_call
+
+
+def new_call(result, delay: float = 0.0, error: bool = False, calls: list = None):
+    def call():
+        if calls is not None:
+            calls.append(result)
+        time.sleep(delay)
+        if error:
+            raise ConnectionError(result)
+        return result
+
+    return call
+
+
+def wait_for(predicate, timeout: float = 5.0):
+    start = time.time()
+    while predicate() is False:
+        if time.time() - start > timeout:  # pragma: no cover
+            raise TimeoutError
+        time.sleep(0.001)
+
+
+class TestLatencyTracker:
+    def test(self):
+        tracker = LatencyTracker(window=10)
+        assert tracker.percentile("a", 0.5) is None
+        for latency in range(1, 21):
+            tracker.record("a", latency / 100)
+        assert tracker.count("a") == 10
+        assert tracker.percentile("a", 0.5) == 0.15
+        assert tracker.percentile("a", 0.95) == 0.2
+        assert tracker.percentile("a", 0.0) == 0.11
+
+        tracker.record("b", 0.01)
+        tracker.record_failure("c")
+        assert tracker.percentile("c", 0.5) == math.inf
+        assert tracker.order(["x", "a", "c", "b", "y"]) == [3, 1, 0, 2, 4]
+
+        tracker.clear()
+        assert tracker.count("a") == 0
+        with pytest.raises(ValueError):
+            LatencyTracker(window=0)
+
+
+class TestHedgedCall:
+    def test_hedge(self):
+        tracker = LatencyTracker()
+        calls = list()
+
+        # the first replica is too slow, the hedged request wins
+        start = time.time()
+        result = hedged_call(
+            [
+                ("a", new_call("a", delay=1.0, calls=calls)),
+                ("b", new_call("b", calls=calls)),
+            ],
+            tracker=tracker,
+            default_delay=0.02,
+        )
+        assert result == "b"
+        assert time.time() - start < 0.5
+        assert calls == ["a", "b"]
+        assert tracker.count("b") == 1
+        # the slow call is still recorded when it finishes
+        wait_for(lambda: tracker.count("a") == 1)
+
+        # the faster replica is called first next time
+        calls.clear()
+        result = hedged_call(
+            [
+                ("a", new_call("a", calls=calls)),
+                ("b", new_call("b", calls=calls)),
+            ],
+            tracker=tracker,
+        )
+        assert result == "b"
+        assert calls == ["b"]
+
+    def test_percentile_delay(self):
+        tracker = LatencyTracker()
+        for _ in range(10):
+            tracker.record("a", 0.2)
+        calls = list()
+        # the first replica answers within its usual latency, no hedge
+        result = hedged_call(
+            [
+                ("a", new_call("a", delay=0.05, calls=calls)),
+                ("b", new_call("b", calls=calls)),
+            ],
+            tracker=tracker,
+            default_delay=0.001,
+        )
+        assert result == "a"
+        assert calls == ["a"]
+
+    def test_failure(self):
+        tracker = LatencyTracker()
+        calls = list()
+        result = hedged_call(
+            [
+                ("a", new_call("a", error=True, calls=calls)),
+                ("b", new_call("b", calls=calls)),
+            ],
+            tracker=tracker,
+            default_delay=10,
+        )
+        assert result == "b"
+        assert calls == ["a", "b"]
+        wait_for(lambda: tracker.percentile("a", 0.5) == math.inf)
+
+        # all failed, raise the error of the first replica
+        with pytest.raises(ConnectionError) as e:
+            hedged_call(
+                [
+                    ("c", new_call("c", error=True)),
+                    ("d", new_call("d", delay=0.01, error=True)),
+                ],
+                tracker=tracker,
+                default_delay=0.001,
+            )
+        assert str(e.value) == "c"
+
+        with pytest.raises(ValueError):
+            hedged_call([], tracker=tracker)
+
+    def test_cancel(self):
+        tracker = LatencyTracker()
+        calls = list()
+        # the replicas not called yet are never called
+        result = hedged_call(
+            [
+                ("a", new_call("a")),
+                ("b", new_call("b", calls=calls)),
+                ("c", new_call("c", calls=calls)),
+            ],
+            tracker=tracker,
+            default_delay=1,
+        )
+        assert result == "a"
+        assert calls == []
+
+
+if __name__ == "__main__":
+    from config_patterns.tests import run_cov_test
+
+    run_cov_test(__file__, "config_patterns.hedge", preview=False)